@@ -1,11 +1,18 @@
 import logging
-from fastapi import APIRouter, HTTPException, Depends
+import time
+from fastapi import APIRouter, HTTPException, Depends, Request
+from fastapi.security import HTTPAuthorizationCredentials, HTTPBearer
 from pydantic import BaseModel, EmailStr, validator
-from sqlalchemy.orm import Session
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
+from app.config import settings
 from app.database import get_db
 from app.models import User
-from passlib.context import CryptContext
-from jose import jwt
+from app.hashing import hashing_executor
+from app.cache import TTLCache
+from app.ratelimit import login_rate_limiter
+from app.schemas import UserResponse
+from jose import JWTError, jwt
 from datetime import datetime, timedelta
 
 # Initialize Router
@@ -15,25 +22,32 @@ router = APIRouter()
 logger = logging.getLogger("uvicorn")
 logger.setLevel(logging.DEBUG)
 
-# Password Hashing Context
-pwd_context = CryptContext(schemes=["bcrypt"], deprecated="auto")
-
 # JWT Configuration
 SECRET_KEY = "your_secret_key"
 ALGORITHM = "HS256"
 ACCESS_TOKEN_EXPIRE_MINUTES = 30
 
+# Verified tokens and the users they resolve to, so warm tokens skip the DB
+TOKEN_CACHE_SIZE = settings.token_cache_size
+TOKEN_CACHE_TTL = settings.token_cache_ttl
+token_cache = TTLCache(maxsize=TOKEN_CACHE_SIZE, ttl=TOKEN_CACHE_TTL)  # token -> email
+user_cache = TTLCache(maxsize=TOKEN_CACHE_SIZE, ttl=TOKEN_CACHE_TTL)  # email -> UserResponse
+
+bearer_scheme = HTTPBearer(auto_error=False)
+
 # Utility Functions
-def hash_password(password: str) -> str:
-    """Hashes a password using bcrypt."""
-    return pwd_context.hash(password)
+async def hash_password(password: str) -> str:
+    """Hashes a password using bcrypt in the hashing process pool."""
+    return await hashing_executor.hash(password)
 
-def verify_password(plain_password: str, hashed_password: str) -> bool:
+async def verify_password(plain_password: str, hashed_password: str) -> bool:
     """Verifies a plain password against a hashed password."""
     try:
-        result = pwd_context.verify(plain_password, hashed_password)
+        result = await hashing_executor.verify(plain_password, hashed_password)
         logger.debug(f"Password verification result: {result}")
         return result
+    except HTTPException:
+        raise
     except Exception as e:
         logger.error(f"Error verifying password: {e}")
         raise HTTPException(status_code=500, detail="Error verifying password hash")
@@ -45,6 +59,54 @@ def create_access_token(data: dict):
     to_encode.update({"exp": expire})
     return jwt.encode(to_encode, SECRET_KEY, algorithm=ALGORITHM)
 
+def invalidate_cached_user(email: str) -> None:
+    """Drops a cached user row; call after the user is updated or deleted."""
+    user_cache.delete(email)
+
+def invalidate_cached_user_id(user_id: int) -> None:
+    """Drops the cached row for a user id, whatever email it was cached under."""
+    user_cache.delete_where(lambda user: user.id == user_id)
+
+def _credentials_error() -> HTTPException:
+    return HTTPException(
+        status_code=401,
+        detail="Could not validate credentials",
+        headers={"WWW-Authenticate": "Bearer"},
+    )
+
+async def get_current_user(
+    credentials: HTTPAuthorizationCredentials = Depends(bearer_scheme),
+    db: AsyncSession = Depends(get_db),
+) -> UserResponse:
+    """Resolves the bearer token to a user, from cache when the token is warm."""
+    if credentials is None:
+        raise _credentials_error()
+    token = credentials.credentials
+
+    email = token_cache.get(token)
+    if email is None:
+        try:
+            claims = jwt.decode(token, SECRET_KEY, algorithms=[ALGORITHM])
+        except JWTError:
+            raise _credentials_error()
+        email = claims.get("sub")
+        expires = claims.get("exp")
+        # Every token we issue expires; one without exp would be valid forever
+        if not email or not isinstance(expires, (int, float)):
+            raise _credentials_error()
+        # Never keep a token cached past its own expiry
+        token_cache.set(token, email, ttl=expires - time.time())
+
+    user = user_cache.get(email)
+    if user is None:
+        db_user = await db.scalar(select(User).where(User.email == email))
+        if not db_user:
+            token_cache.delete(token)
+            raise _credentials_error()
+        user = UserResponse.model_validate(db_user, from_attributes=True)
+        user_cache.set(email, user)
+    return user
+
 # Pydantic Models
 class UserCreate(BaseModel):
     name: str
@@ -63,39 +125,44 @@ class UserLogin(BaseModel):
 
 # Routes
 @router.post("/register", response_model=dict)
-def register(user: UserCreate, db: Session = Depends(get_db)):
+async def register(user: UserCreate, db: AsyncSession = Depends(get_db)):
     """Register a new user."""
-    db_user = db.query(User).filter(User.email == user.email).first()
+    db_user = await db.scalar(select(User).where(User.email == user.email))
     if db_user:
         logger.error(f"Email already registered: {user.email}")
         raise HTTPException(status_code=400, detail="Email already registered")
     
-    hashed_password = hash_password(user.password)  # Hash password during registration
+    hashed_password = await hash_password(user.password)  # Hash password during registration
     new_user = User(name=user.name, email=user.email, password=hashed_password)
     db.add(new_user)
-    db.commit()
-    db.refresh(new_user)
+    await db.commit()
     logger.debug(f"User registered successfully: {user.email}")
     return {"message": "User registered successfully"}
 
 @router.post("/login", response_model=dict)
-def login(user: UserLogin, db: Session = Depends(get_db)):
+async def login(user: UserLogin, request: Request, db: AsyncSession = Depends(get_db)):
     """Login a user and return an access token."""
+    # Throttled attempts are rejected before any DB or bcrypt work
+    await login_rate_limiter.check(request.client.host if request.client else "unknown", user.email)
     try:
-        db_user = db.query(User).filter(User.email == user.email).first()
+        db_user = await db.scalar(select(User).where(User.email == user.email))
 
         if not db_user:
             logger.error(f"User with email {user.email} not found.")
+            await login_rate_limiter.record_failure(user.email)
             raise HTTPException(status_code=404, detail="User not found")
 
-        if not verify_password(user.password, db_user.password):
+        if not await verify_password(user.password, db_user.password):
             logger.error(f"Invalid credentials for email: {user.email}")
+            await login_rate_limiter.record_failure(user.email)
             raise HTTPException(status_code=401, detail="Invalid credentials")
 
         access_token = create_access_token(data={"sub": user.email})
         logger.debug(f"Login successful for user: {user.email}")
         return {"access_token": access_token}
 
+    except HTTPException:
+        raise
     except Exception as e:
         logger.error(f"Error during login: {e}")
         raise HTTPException(status_code=500, detail="Internal Server Error")
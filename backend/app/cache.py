@@ -0,0 +1,119 @@
+import time
+from abc import ABC, abstractmethod
+from collections import OrderedDict
+
+
+class TTLCache:
+    """A bounded in-process LRU cache whose entries also expire after a TTL.
+
+    Not shared between worker processes; callers must tolerate each worker
+    having its own copy and keep TTLs short enough to bound staleness.
+    """
+
+    def __init__(self, maxsize: int = 1024, ttl: float = 60.0):
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self._data = OrderedDict()  # key -> (expires_at, value)
+
+    def get(self, key, default=None):
+        entry = self._data.get(key)
+        if entry is None:
+            return default
+        expires_at, value = entry
+        if expires_at <= time.monotonic():
+            del self._data[key]
+            return default
+        self._data.move_to_end(key)
+        return value
+
+    def set(self, key, value, ttl: float = None) -> None:
+        ttl = self.ttl if ttl is None else min(ttl, self.ttl)
+        self._data[key] = (time.monotonic() + ttl, value)
+        self._data.move_to_end(key)
+        while len(self._data) > self.maxsize:
+            self._data.popitem(last=False)
+
+    def delete(self, key) -> None:
+        self._data.pop(key, None)
+
+    def delete_where(self, predicate) -> None:
+        """Drops every entry whose value matches; a full scan, so keep it off hot paths."""
+        for key in [key for key, (_, value) in self._data.items() if predicate(value)]:
+            del self._data[key]
+
+    def clear(self) -> None:
+        self._data.clear()
+
+    def __len__(self) -> int:
+        return len(self._data)
+
+
+class CacheBackend(ABC):
+    """Storage used by the response cache. Values are bytes; counters are ints."""
+
+    @abstractmethod
+    async def get(self, key: str):
+        ...
+
+    @abstractmethod
+    async def set(self, key: str, value: bytes, ttl: float) -> None:
+        ...
+
+    @abstractmethod
+    async def counter(self, key: str) -> int:
+        ...
+
+    @abstractmethod
+    async def incr(self, key: str) -> int:
+        ...
+
+
+class InMemoryCacheBackend(CacheBackend):
+    """Per-process LRU backend. Only coherent when the API runs as one worker."""
+
+    def __init__(self, maxsize: int = 1024, ttl: float = 60.0):
+        self._entries = TTLCache(maxsize=maxsize, ttl=ttl)
+        # One per scope, never evicted: losing one could resurrect a stale entry
+        self._counters = {}
+
+    async def get(self, key: str):
+        return self._entries.get(key)
+
+    async def set(self, key: str, value: bytes, ttl: float) -> None:
+        self._entries.set(key, value, ttl=ttl)
+
+    async def counter(self, key: str) -> int:
+        return self._counters.get(key, 0)
+
+    async def incr(self, key: str) -> int:
+        self._counters[key] = self._counters.get(key, 0) + 1
+        return self._counters[key]
+
+
+class RedisCacheBackend(CacheBackend):
+    """Shared backend over any client with redis.asyncio's get/set/incr API.
+
+    Pass a real `redis.asyncio.Redis` in production or a local fake in tests.
+    """
+
+    def __init__(self, client, prefix: str = "edu-video:"):
+        self.client = client
+        self.prefix = prefix
+
+    @classmethod
+    def from_url(cls, url: str, **kwargs):
+        import redis.asyncio  # optional dependency, only needed for this backend
+
+        return cls(redis.asyncio.Redis.from_url(url), **kwargs)
+
+    async def get(self, key: str):
+        return await self.client.get(self.prefix + key)
+
+    async def set(self, key: str, value: bytes, ttl: float) -> None:
+        await self.client.set(self.prefix + key, value, ex=max(1, int(ttl)))
+
+    async def counter(self, key: str) -> int:
+        return int(await self.client.get(self.prefix + key) or 0)
+
+    async def incr(self, key: str) -> int:
+        return await self.client.incr(self.prefix + key)
@@ -0,0 +1,165 @@
+import asyncio
+import logging
+import time
+from typing import List, Optional, Set
+from sqlalchemy import delete, func, select
+from app import database
+from app.config import settings
+from app.jobs import job_queue
+from app.models import VideoChange
+
+logger = logging.getLogger(__name__)
+
+CHANGE_FEED_POLL_INTERVAL = settings.change_feed_poll_interval
+CHANGE_FEED_QUEUE_SIZE = settings.change_feed_queue_size
+CHANGE_LOG_RETENTION_SECONDS = settings.change_log_retention_seconds
+
+# Log rows read per query, by the broadcaster and by catch-up reads
+CHANGE_BATCH_SIZE = 500
+
+CHANGE_COLUMNS = (VideoChange.seq, VideoChange.video_id, VideoChange.op, VideoChange.data)
+
+
+def format_change(change) -> str:
+    """One log row as a JSON delta; `data` is already JSON from the trigger."""
+    return (
+        f'{{"seq":{change.seq},"op":"{change.op}","video_id":{change.video_id},'
+        f'"video":{change.data or "null"}}}'
+    )
+
+
+async def read_changes(after: int, before: Optional[int] = None, limit: int = CHANGE_BATCH_SIZE) -> list:
+    """Log rows with after < seq (< before), oldest first, in a short-lived session."""
+    query = select(*CHANGE_COLUMNS).where(VideoChange.seq > after)
+    if before is not None:
+        query = query.where(VideoChange.seq < before)
+    async with database.AsyncReadSessionLocal() as session:
+        return (await session.execute(query.order_by(VideoChange.seq).limit(limit))).all()
+
+
+async def iter_changes(after: int, before: Optional[int] = None):
+    """Every log row with after < seq (< before), read a batch at a time."""
+    while True:
+        rows = await read_changes(after, before)
+        for row in rows:
+            yield row
+        if len(rows) < CHANGE_BATCH_SIZE:
+            return
+        after = rows[-1].seq
+
+
+async def log_bounds():
+    """(oldest, newest) seq still in the log; (None, None) when it is empty."""
+    async with database.AsyncReadSessionLocal() as session:
+        return (await session.execute(select(func.min(VideoChange.seq), func.max(VideoChange.seq)))).one()
+
+
+class Subscription:
+    """A subscriber's queue of log rows. `None` in the queue means it was dropped."""
+
+    __slots__ = ("queue",)
+
+    def __init__(self):
+        self.queue: asyncio.Queue = asyncio.Queue()
+
+    async def get(self, timeout: float):
+        """The next row, None if dropped, or raises asyncio.TimeoutError."""
+        return await asyncio.wait_for(self.queue.get(), timeout)
+
+
+class ChangeBroadcaster:
+    """Polls the video change log once per interval and fans it out to this process's subscribers.
+
+    A subscriber more than `queue_size` rows behind is dropped. Delivery is
+    at-least-once and may have gaps, which subscribers fill from the log.
+    """
+
+    def __init__(self, poll_interval: float = CHANGE_FEED_POLL_INTERVAL, queue_size: int = CHANGE_FEED_QUEUE_SIZE):
+        self.poll_interval = poll_interval
+        self.queue_size = queue_size
+        self.subscribers: Set[Subscription] = set()
+        self.last_seq: Optional[int] = None
+        self.polls = 0
+        self.dropped = 0
+        self._task: Optional[asyncio.Task] = None
+        self._wakeup: Optional[asyncio.Event] = None
+
+    def subscribe(self) -> Subscription:
+        subscription = Subscription()
+        self.subscribers.add(subscription)
+        if self._task is None or self._task.done():
+            self._wakeup = asyncio.Event()
+            self._task = asyncio.create_task(self._run())
+        return subscription
+
+    def unsubscribe(self, subscription: Subscription) -> None:
+        self.subscribers.discard(subscription)
+
+    def notify(self) -> None:
+        """Polls now instead of at the next interval; call after committing a videos write."""
+        if self._wakeup is not None:
+            self._wakeup.set()
+
+    async def _poll(self) -> List:
+        self.polls += 1
+        if self.last_seq is None:
+            self.last_seq = (await log_bounds())[1] or 0
+            return []
+        rows = await read_changes(self.last_seq)
+        if rows:
+            self.last_seq = rows[-1].seq
+        return rows
+
+    def _publish(self, rows) -> None:
+        for subscription in list(self.subscribers):
+            queue = subscription.queue
+            if queue.qsize() + len(rows) > self.queue_size:
+                self.subscribers.discard(subscription)
+                self.dropped += 1
+                queue.put_nowait(None)
+                continue
+            for row in rows:
+                queue.put_nowait(row)
+
+    async def _run(self) -> None:
+        while self.subscribers:
+            self._wakeup.clear()
+            try:
+                rows = await self._poll()
+            except Exception:
+                logger.exception("Change feed poll failed")
+                rows = []
+            if rows:
+                self._publish(rows)
+                if len(rows) == CHANGE_BATCH_SIZE:
+                    continue
+            try:
+                await asyncio.wait_for(self._wakeup.wait(), self.poll_interval)
+            except asyncio.TimeoutError:
+                pass
+        # Another worker may have written meanwhile; re-read the head next time
+        self.last_seq = None
+
+    async def stop(self) -> None:
+        """Ends every subscription, e.g. so open streams do not hold up shutdown."""
+        for subscription in list(self.subscribers):
+            subscription.queue.put_nowait(None)
+        self.subscribers.clear()
+        if self._task is not None:
+            self._task.cancel()
+            await asyncio.gather(self._task, return_exceptions=True)
+            self._task = None
+
+    def stats(self) -> dict:
+        return {"subscribers": len(self.subscribers), "polls": self.polls, "dropped": self.dropped}
+
+
+change_feed = ChangeBroadcaster()
+
+
+@job_queue.maintenance
+async def prune_change_log() -> None:
+    cutoff = time.time() - CHANGE_LOG_RETENTION_SECONDS
+    async with database.AsyncSessionLocal() as session:
+        await session.execute(delete(VideoChange).where(VideoChange.created_at < cutoff))
+        await session.commit()
@@ -0,0 +1,204 @@
+import os
+from dataclasses import dataclass, field
+from typing import List, Optional
+
+
+def _env_int(name: str, default: int) -> int:
+    return int(os.getenv(name, default))
+
+
+def _env_float(name: str, default: float) -> float:
+    return float(os.getenv(name, default))
+
+
+def _env_bool(name: str, default: bool) -> bool:
+    return os.getenv(name, "1" if default else "0") == "1"
+
+
+def _env_list(name: str, default: List[str], separator: str = ",") -> List[str]:
+    value = os.getenv(name)
+    if value is None:
+        return list(default)
+    return [item.strip() for item in value.split(separator) if item.strip()]
+
+
+@dataclass
+class Settings:
+    """Runtime configuration, read from environment variables by `from_env`."""
+
+    database_url: str = "sqlite:///./test.db"
+    # "tuned" enables WAL and the pragmas below; "baseline" keeps SQLite defaults
+    # apart from foreign_keys, which both turn on
+    db_profile: str = "tuned"
+    sqlite_synchronous: str = "NORMAL"
+    sqlite_mmap_size: int = 256 * 2**20
+    sqlite_cache_size_kb: int = 64 * 2**10
+    sqlite_busy_timeout_ms: int = 5000
+    db_pool_size: int = 5
+    db_max_overflow: int = 10
+    db_pool_timeout: int = 30
+    extra_sqlite_pragmas: List[str] = field(default_factory=list)
+    # GET requests read through a pool of read-only connections (app.database.get_db):
+    # the main file opened with mode=ro, or a replica file if one is set
+    db_read_routing: bool = True
+    db_read_replica_url: str = ""
+    db_read_pool_size: int = 5
+    # A client that wrote reads from the writer for this long (covers replica lag)
+    read_your_writes_seconds: float = 5.0
+    # Schema is owned by Alembic; only dev/test setups should let the app create it
+    create_schema: bool = False
+    cors_origins: List[str] = field(default_factory=lambda: ["http://localhost:5173"])
+    metrics_enabled: bool = True
+    n_plus_one_threshold: int = 10
+    response_cache_backend: str = "memory"  # "memory" or "redis"
+    response_cache_size: int = 2048
+    response_cache_ttl: float = 60.0
+    redis_url: str = "redis://localhost:6379/0"
+    token_cache_size: int = 10000
+    token_cache_ttl: float = 300.0
+    # bcrypt processes per API worker; from_env splits the CPUs among SERVER_WORKERS
+    hash_workers: int = os.cpu_count() or 1
+    hash_queue_limit: int = 32
+    rate_limit_enabled: bool = True
+    rate_limit_backend: str = "memory"  # "memory" or "redis"
+    rate_limit_max_keys: int = 100_000
+    login_ip_burst: int = 20
+    login_ip_per_minute: float = 20.0
+    login_email_failures: int = 5
+    login_email_failures_per_minute: float = 1.0
+    # Background job queue (app.jobs); with jobs disabled, writes still enqueue
+    jobs_enabled: bool = True
+    job_workers: int = 2
+    job_poll_interval: float = 1.0
+    job_max_attempts: int = 5
+    job_backoff_base: float = 2.0
+    job_backoff_max: float = 300.0
+    job_lease_seconds: float = 60.0
+    job_retention_seconds: float = 7 * 24 * 3600.0
+    youtube_enricher: str = "oembed"  # "oembed" or "stub"
+    youtube_fetch_timeout: float = 5.0
+    # GET /videos/changes broadcaster (app.changes)
+    change_feed_poll_interval: float = 0.5
+    change_feed_queue_size: int = 1000
+    change_feed_heartbeat: float = 15.0
+    change_log_retention_seconds: float = 7 * 24 * 3600.0
+    # include_total on searches (app.stats)
+    search_count_cache_size: int = 1024
+    search_count_cache_ttl: float = 300.0
+    search_count_cap: int = 10000
+    # How long POST /videos/ remembers an Idempotency-Key (app.idempotency)
+    idempotency_key_ttl: float = 24 * 3600.0
+    # GET /videos/suggest: in-memory trigram index, refreshed from the change log (app.suggest)
+    suggest_enabled: bool = True
+    suggest_refresh_interval: float = 1.0
+    # Production runner (app.server) and health checks (app.health)
+    server_workers: int = 1
+    server_drain_seconds: float = 5.0
+    server_shutdown_timeout: float = 30.0
+    warm_on_startup: bool = True
+    health_probe_timeout: float = 1.0
+    readyz_max_db_latency_ms: float = 250.0
+
+    @classmethod
+    def from_env(cls) -> "Settings":
+        defaults = cls()
+        server_workers = _env_int("SERVER_WORKERS", defaults.server_workers)
+        return cls(
+            database_url=os.getenv("DATABASE_URL", defaults.database_url),
+            db_profile=os.getenv("DB_PROFILE", defaults.db_profile),
+            sqlite_synchronous=os.getenv("SQLITE_SYNCHRONOUS", defaults.sqlite_synchronous),
+            sqlite_mmap_size=_env_int("SQLITE_MMAP_SIZE", defaults.sqlite_mmap_size),
+            sqlite_cache_size_kb=_env_int("SQLITE_CACHE_SIZE_KB", defaults.sqlite_cache_size_kb),
+            sqlite_busy_timeout_ms=_env_int("SQLITE_BUSY_TIMEOUT_MS", defaults.sqlite_busy_timeout_ms),
+            db_pool_size=_env_int("DB_POOL_SIZE", defaults.db_pool_size),
+            db_max_overflow=_env_int("DB_MAX_OVERFLOW", defaults.db_max_overflow),
+            db_pool_timeout=_env_int("DB_POOL_TIMEOUT", defaults.db_pool_timeout),
+            extra_sqlite_pragmas=_env_list("SQLITE_EXTRA_PRAGMAS", defaults.extra_sqlite_pragmas, ";"),
+            db_read_routing=_env_bool("DB_READ_ROUTING", defaults.db_read_routing),
+            db_read_replica_url=os.getenv("DB_READ_REPLICA_URL", defaults.db_read_replica_url),
+            db_read_pool_size=_env_int("DB_READ_POOL_SIZE", defaults.db_read_pool_size),
+            read_your_writes_seconds=_env_float("READ_YOUR_WRITES_SECONDS", defaults.read_your_writes_seconds),
+            create_schema=_env_bool("CREATE_SCHEMA", defaults.create_schema),
+            cors_origins=_env_list("CORS_ORIGINS", defaults.cors_origins),
+            metrics_enabled=_env_bool("METRICS_ENABLED", defaults.metrics_enabled),
+            n_plus_one_threshold=_env_int("METRICS_N_PLUS_ONE_THRESHOLD", defaults.n_plus_one_threshold),
+            response_cache_backend=os.getenv("RESPONSE_CACHE_BACKEND", defaults.response_cache_backend),
+            response_cache_size=_env_int("RESPONSE_CACHE_SIZE", defaults.response_cache_size),
+            response_cache_ttl=_env_float("RESPONSE_CACHE_TTL", defaults.response_cache_ttl),
+            redis_url=os.getenv("REDIS_URL", defaults.redis_url),
+            token_cache_size=_env_int("TOKEN_CACHE_SIZE", defaults.token_cache_size),
+            token_cache_ttl=_env_float("TOKEN_CACHE_TTL", defaults.token_cache_ttl),
+            hash_workers=_env_int("HASH_WORKERS", max(1, defaults.hash_workers // server_workers)),
+            hash_queue_limit=_env_int("HASH_QUEUE_LIMIT", defaults.hash_queue_limit),
+            rate_limit_enabled=_env_bool("RATE_LIMIT_ENABLED", defaults.rate_limit_enabled),
+            rate_limit_backend=os.getenv("RATE_LIMIT_BACKEND", defaults.rate_limit_backend),
+            rate_limit_max_keys=_env_int("RATE_LIMIT_MAX_KEYS", defaults.rate_limit_max_keys),
+            login_ip_burst=_env_int("LOGIN_IP_BURST", defaults.login_ip_burst),
+            login_ip_per_minute=_env_float("LOGIN_IP_PER_MINUTE", defaults.login_ip_per_minute),
+            login_email_failures=_env_int("LOGIN_EMAIL_FAILURES", defaults.login_email_failures),
+            login_email_failures_per_minute=_env_float(
+                "LOGIN_EMAIL_FAILURES_PER_MINUTE", defaults.login_email_failures_per_minute,
+            ),
+            jobs_enabled=_env_bool("JOBS_ENABLED", defaults.jobs_enabled),
+            job_workers=_env_int("JOB_WORKERS", defaults.job_workers),
+            job_poll_interval=_env_float("JOB_POLL_INTERVAL", defaults.job_poll_interval),
+            job_max_attempts=_env_int("JOB_MAX_ATTEMPTS", defaults.job_max_attempts),
+            job_backoff_base=_env_float("JOB_BACKOFF_BASE", defaults.job_backoff_base),
+            job_backoff_max=_env_float("JOB_BACKOFF_MAX", defaults.job_backoff_max),
+            job_lease_seconds=_env_float("JOB_LEASE_SECONDS", defaults.job_lease_seconds),
+            job_retention_seconds=_env_float("JOB_RETENTION_SECONDS", defaults.job_retention_seconds),
+            youtube_enricher=os.getenv("YOUTUBE_ENRICHER", defaults.youtube_enricher),
+            youtube_fetch_timeout=_env_float("YOUTUBE_FETCH_TIMEOUT", defaults.youtube_fetch_timeout),
+            change_feed_poll_interval=_env_float("CHANGE_FEED_POLL_INTERVAL", defaults.change_feed_poll_interval),
+            change_feed_queue_size=_env_int("CHANGE_FEED_QUEUE_SIZE", defaults.change_feed_queue_size),
+            change_feed_heartbeat=_env_float("CHANGE_FEED_HEARTBEAT", defaults.change_feed_heartbeat),
+            change_log_retention_seconds=_env_float(
+                "CHANGE_LOG_RETENTION_SECONDS", defaults.change_log_retention_seconds,
+            ),
+            search_count_cache_size=_env_int("SEARCH_COUNT_CACHE_SIZE", defaults.search_count_cache_size),
+            search_count_cache_ttl=_env_float("SEARCH_COUNT_CACHE_TTL", defaults.search_count_cache_ttl),
+            search_count_cap=_env_int("SEARCH_COUNT_CAP", defaults.search_count_cap),
+            idempotency_key_ttl=_env_float("IDEMPOTENCY_KEY_TTL", defaults.idempotency_key_ttl),
+            suggest_enabled=_env_bool("SUGGEST_ENABLED", defaults.suggest_enabled),
+            suggest_refresh_interval=_env_float("SUGGEST_REFRESH_INTERVAL", defaults.suggest_refresh_interval),
+            server_workers=server_workers,
+            server_drain_seconds=_env_float("SERVER_DRAIN_SECONDS", defaults.server_drain_seconds),
+            server_shutdown_timeout=_env_float("SERVER_SHUTDOWN_TIMEOUT", defaults.server_shutdown_timeout),
+            warm_on_startup=_env_bool("WARM_ON_STARTUP", defaults.warm_on_startup),
+            health_probe_timeout=_env_float("HEALTH_PROBE_TIMEOUT", defaults.health_probe_timeout),
+            readyz_max_db_latency_ms=_env_float("READYZ_MAX_DB_LATENCY_MS", defaults.readyz_max_db_latency_ms),
+        )
+
+    @property
+    def async_database_url(self) -> str:
+        return self.database_url.replace("sqlite://", "sqlite+aiosqlite://", 1)
+
+    @property
+    def async_read_database_url(self) -> Optional[str]:
+        """Where the read pool connects, opened read-only; None when reads are not routed."""
+        url = self.db_read_replica_url or self.database_url
+        path = url.split("sqlite:///", 1)[1] if url.startswith("sqlite:///") else ""
+        if not self.db_read_routing or not path or path == ":memory:":
+            return None
+        return f"sqlite+aiosqlite:///file:{path}?mode=ro&uri=true"
+
+    def sqlite_pragmas(self, read_only: bool = False) -> List[str]:
+        """PRAGMA statements run on every new connection for this profile."""
+        # Not a tuning knob: user deletes rely on ON DELETE CASCADE
+        if self.db_profile == "baseline":
+            return ["foreign_keys=ON", *self.extra_sqlite_pragmas]
+        # The journal mode and fsync policy belong to the writer
+        write_pragmas = [] if read_only else ["journal_mode=WAL", f"synchronous={self.sqlite_synchronous}"]
+        return [
+            "foreign_keys=ON",
+            *write_pragmas,
+            f"mmap_size={self.sqlite_mmap_size}",
+            # Negative cache_size is in KiB rather than pages
+            f"cache_size=-{self.sqlite_cache_size_kb}",
+            f"busy_timeout={self.sqlite_busy_timeout_ms}",
+            "temp_store=MEMORY",
+            *self.extra_sqlite_pragmas,
+        ]
+
+
+settings = Settings.from_env()
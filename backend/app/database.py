@@ -1,19 +1,159 @@
-from sqlalchemy import create_engine
+import asyncio
+import math
+import time
+from fastapi import Request
+from sqlalchemy import create_engine, event
+from sqlalchemy.ext.asyncio import async_sessionmaker, create_async_engine
 from sqlalchemy.orm import sessionmaker
+from sqlalchemy.pool import AsyncAdaptedQueuePool
+from app.config import Settings, settings
 
-# Define the database URL
-DATABASE_URL = "sqlite:///./test.db"  # Replace with your database URL
+# Define the database URL (override with the DATABASE_URL environment variable)
+DATABASE_URL = settings.database_url
+ASYNC_DATABASE_URL = settings.async_database_url
 
-# Create the database engine
-engine = create_engine(DATABASE_URL, connect_args={"check_same_thread": False})
+# A client that wrote within READ_YOUR_WRITES_SECONDS reads from the writer
+SAFE_METHODS = ("GET", "HEAD", "OPTIONS")
+LAST_WRITE_COOKIE = "last_write"
+READ_YOUR_WRITES_SECONDS = settings.read_your_writes_seconds
+
+
+def _install_pragmas(sync_engine, config: Settings, read_only: bool = False) -> None:
+    """Runs the profile's PRAGMAs on every new DBAPI connection."""
+    pragmas = config.sqlite_pragmas(read_only)
+    if not pragmas:
+        return
+
+    @event.listens_for(sync_engine, "connect")
+    def set_sqlite_pragmas(dbapi_connection, connection_record):
+        cursor = dbapi_connection.cursor()
+        for pragma in pragmas:
+            cursor.execute(f"PRAGMA {pragma}")
+        cursor.close()
+
+
+def _pool_options(config: Settings, pool_size: int = None) -> dict:
+    return {
+        "pool_size": pool_size or config.db_pool_size,
+        "max_overflow": config.db_max_overflow,
+        "pool_timeout": config.db_pool_timeout,
+    }
+
+
+def create_db_engine(config: Settings = settings):
+    """Sync engine for schema creation, scripts and the legacy app."""
+    db_engine = create_engine(
+        config.database_url, connect_args={"check_same_thread": False}, **_pool_options(config)
+    )
+    _install_pragmas(db_engine, config)
+    return db_engine
+
+
+def create_async_db_engine(config: Settings = settings):
+    """Async (aiosqlite) engine used by the API routers."""
+    # aiosqlite defaults to NullPool, i.e. a new connection (and thread) per session
+    db_engine = create_async_engine(
+        config.async_database_url, poolclass=AsyncAdaptedQueuePool, **_pool_options(config)
+    )
+    _install_pragmas(db_engine.sync_engine, config)
+    return db_engine
+
+
+def create_async_read_engine(config: Settings = settings):
+    """Async engine over read-only connections, or None when reads are not routed."""
+    url = config.async_read_database_url
+    if url is None:
+        return None
+    db_engine = create_async_engine(
+        url, poolclass=AsyncAdaptedQueuePool, **_pool_options(config, config.db_read_pool_size)
+    )
+    _install_pragmas(db_engine.sync_engine, config, read_only=True)
+    return db_engine
+
+
+# Create the database engine (used for schema creation and sync scripts)
+engine = create_db_engine()
 
 # Create a configured "SessionLocal" class
 SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
 
-# Dependency to get DB session
-def get_db():
-    db = SessionLocal()
+# Async engine and session factory used by the API routers
+async_engine = create_async_db_engine()
+
+# Read-only pool for GET requests; falls back to the writer when reads are not routed
+async_read_engine = create_async_read_engine()
+
+# Objects stay usable after commit so handlers can return them without a reload
+AsyncSessionLocal = async_sessionmaker(async_engine, autoflush=False, expire_on_commit=False)
+AsyncReadSessionLocal = async_sessionmaker(async_read_engine or async_engine, autoflush=False, expire_on_commit=False)
+
+def configure(config: Settings) -> None:
+    """Rebinds the engines and session factories to `config` (used by create_app)."""
+    global engine, async_engine, async_read_engine, READ_YOUR_WRITES_SECONDS
+    engine = create_db_engine(config)
+    async_engine = create_async_db_engine(config)
+    async_read_engine = create_async_read_engine(config)
+    READ_YOUR_WRITES_SECONDS = config.read_your_writes_seconds
+    SessionLocal.configure(bind=engine)
+    AsyncSessionLocal.configure(bind=async_engine)
+    AsyncReadSessionLocal.configure(bind=async_read_engine or async_engine)
+
+async def warm_pool(size: int, read_size: int = 0) -> None:
+    """Opens pooled connections up front, so early requests skip the connect and PRAGMAs."""
+    pools = [(async_engine, size)]
+    if async_read_engine is not None:
+        pools.append((async_read_engine, read_size or size))
+    connections = await asyncio.gather(*(db_engine.connect() for db_engine, n in pools for _ in range(n)))
+    for connection in connections:
+        await connection.exec_driver_sql("SELECT 1")
+        await connection.close()
+
+async def dispose_engines() -> None:
+    """Closes the pooled async connections; their aiosqlite threads keep the process alive."""
+    await async_engine.dispose()
+    if async_read_engine is not None:
+        await async_read_engine.dispose()
+
+def _wrote_recently(request: Request) -> bool:
     try:
+        last_write = float(request.cookies.get(LAST_WRITE_COOKIE, 0))
+    except ValueError:
+        return False
+    return time.time() - last_write < READ_YOUR_WRITES_SECONDS
+
+class ReadYourWritesMiddleware:
+    """Stamps successful write responses with a last_write cookie (a cookie, so it holds across workers)."""
+
+    def __init__(self, app, window: float = READ_YOUR_WRITES_SECONDS):
+        self.app = app
+        self.window = window
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http" or scope["method"] in SAFE_METHODS or self.window <= 0:
+            await self.app(scope, receive, send)
+            return
+
+        async def send_with_cookie(message):
+            if message["type"] == "http.response.start" and message["status"] < 400:
+                cookie = (f"{LAST_WRITE_COOKIE}={time.time():.3f}; Max-Age={math.ceil(self.window)}; "
+                          "Path=/; HttpOnly; SameSite=Lax")
+                message["headers"] = [*message.get("headers", []), (b"set-cookie", cookie.encode())]
+            await send(message)
+
+        await self.app(scope, receive, send_with_cookie)
+
+# Dependency to get DB session
+async def get_db(request: Request):
+    """The request's session: the read-only pool for reads, unless the client just wrote."""
+    if request.method in SAFE_METHODS and not _wrote_recently(request):
+        factory = AsyncReadSessionLocal
+    else:
+        factory = AsyncSessionLocal
+    async with factory() as db:
+        yield db
+
+async def get_read_db(request: Request):
+    """Like get_db, but for handlers that only read whatever the method (e.g. a POST lookup)."""
+    factory = AsyncSessionLocal if _wrote_recently(request) else AsyncReadSessionLocal
+    async with factory() as db:
         yield db
-    finally:
-        db.close()
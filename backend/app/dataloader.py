@@ -0,0 +1,65 @@
+import asyncio
+from typing import Awaitable, Callable, Dict, Generic, Hashable, Iterable, List, Mapping, Optional, Set, TypeVar
+
+K = TypeVar("K", bound=Hashable)
+V = TypeVar("V")
+
+
+class DataLoader(Generic[K, V]):
+    """Coalesces the point lookups made while handling one request.
+
+    `load(key)` calls made in the same event-loop iteration (e.g. under
+    `asyncio.gather`) are resolved by one `batch_fn(keys)` call, which returns
+    a mapping of key -> value; keys it leaves out resolve to None. Results are
+    memoized for the loader's lifetime, so build one per request (a FastAPI
+    dependency is already cached per request) and never share it.
+
+    Batches run one after another in a single task, so `batch_fn` may use the
+    request's AsyncSession, which does not allow concurrent statements.
+    """
+
+    def __init__(self, batch_fn: Callable[[List[K]], Awaitable[Mapping[K, V]]], max_batch_size: int = 500):
+        self.batch_fn = batch_fn
+        self.max_batch_size = max_batch_size
+        self.batches = 0
+        self._cache: Dict[K, asyncio.Future] = {}
+        self._queue: List[K] = []
+        # The loop only keeps weak references to tasks
+        self._tasks: Set[asyncio.Task] = set()
+
+    def load(self, key: K) -> "asyncio.Future[Optional[V]]":
+        future = self._cache.get(key)
+        if future is None:
+            loop = asyncio.get_running_loop()
+            future = self._cache[key] = loop.create_future()
+            if not self._queue:
+                loop.call_soon(self._dispatch)
+            self._queue.append(key)
+        return future
+
+    async def load_many(self, keys: Iterable[K]) -> List[Optional[V]]:
+        return list(await asyncio.gather(*[self.load(key) for key in keys]))
+
+    def _dispatch(self) -> None:
+        keys, self._queue = self._queue, []
+        task = asyncio.ensure_future(self._run(keys))
+        self._tasks.add(task)
+        task.add_done_callback(self._tasks.discard)
+
+    async def _run(self, keys: List[K]) -> None:
+        for start in range(0, len(keys), self.max_batch_size):
+            batch = keys[start:start + self.max_batch_size]
+            self.batches += 1
+            try:
+                values = await self.batch_fn(batch)
+            except Exception as e:
+                for key in keys[start:]:
+                    # Not memoized: a later load may retry
+                    future = self._cache.pop(key)
+                    if not future.done():
+                        future.set_exception(e)
+                return
+            for key in batch:
+                future = self._cache[key]
+                if not future.done():
+                    future.set_result(values.get(key))
@@ -0,0 +1,117 @@
+import asyncio
+import logging
+import multiprocessing
+import time
+from concurrent.futures import ProcessPoolExecutor
+from fastapi import HTTPException
+from passlib.context import CryptContext
+from app.config import settings
+
+logger = logging.getLogger("uvicorn")
+
+# Worker processes for bcrypt and the most hashing jobs allowed in flight
+HASH_WORKERS = settings.hash_workers
+HASH_QUEUE_LIMIT = settings.hash_queue_limit
+
+# Password Hashing Context (used inside the worker processes)
+pwd_context = CryptContext(schemes=["bcrypt"], deprecated="auto")
+
+
+def _load_backend() -> None:
+    # passlib imports and self-tests the bcrypt backend on first use
+    pwd_context.handler("bcrypt").get_backend()
+
+
+def _hash(password: str, submitted_at: float):
+    waited = time.time() - submitted_at
+    return pwd_context.hash(password), waited
+
+
+def _verify(plain_password: str, hashed_password: str, submitted_at: float):
+    waited = time.time() - submitted_at
+    return pwd_context.verify(plain_password, hashed_password), waited
+
+
+class HashingExecutor:
+    """Runs bcrypt in a process pool so it never blocks the event loop.
+
+    At most `max_pending` jobs may be queued or running; callers beyond that
+    get an immediate 503 instead of piling up behind a login burst.
+    """
+
+    def __init__(self, max_workers: int = HASH_WORKERS, max_pending: int = HASH_QUEUE_LIMIT):
+        self.max_workers = max_workers
+        self.max_pending = max_pending
+        self.pending = 0
+        self.completed = 0
+        self.rejected = 0
+        self.queue_wait_seconds_total = 0.0
+        self.queue_wait_seconds_max = 0.0
+        self._pool = None
+        # Submitted jobs, so shutdown can cancel the queued ones
+        self._futures = set()
+
+    def _get_pool(self) -> ProcessPoolExecutor:
+        if self._pool is None:
+            # spawn: forking a process that already runs threads is unsafe
+            self._pool = ProcessPoolExecutor(
+                max_workers=self.max_workers,
+                mp_context=multiprocessing.get_context("spawn"),
+                initializer=_load_backend,
+            )
+        return self._pool
+
+    async def _submit(self, fn, *args):
+        if self.pending >= self.max_pending:
+            self.rejected += 1
+            raise HTTPException(
+                status_code=503,
+                detail="Server is busy, please try again",
+                headers={"Retry-After": "1"},
+            )
+        self.pending += 1
+        try:
+            future = self._get_pool().submit(fn, *args, time.time())
+            self._futures.add(future)
+            future.add_done_callback(self._futures.discard)
+            result, waited = await asyncio.wrap_future(future)
+        finally:
+            self.pending -= 1
+        self.completed += 1
+        self.queue_wait_seconds_total += waited
+        self.queue_wait_seconds_max = max(self.queue_wait_seconds_max, waited)
+        logger.debug(f"Hashing job waited {waited * 1000:.1f} ms in queue")
+        return result
+
+    async def warm(self) -> None:
+        """Starts every worker process, bcrypt loaded, before the first login needs one."""
+        loop = asyncio.get_running_loop()
+        pool = self._get_pool()
+        # Submitted together, so no worker is idle yet and each job spawns one
+        await asyncio.gather(*(loop.run_in_executor(pool, _load_backend) for _ in range(self.max_workers)))
+
+    async def hash(self, password: str) -> str:
+        return await self._submit(_hash, password)
+
+    async def verify(self, plain_password: str, hashed_password: str) -> bool:
+        return await self._submit(_verify, plain_password, hashed_password)
+
+    def stats(self) -> dict:
+        return {
+            "pending": self.pending,
+            "completed": self.completed,
+            "rejected": self.rejected,
+            "queue_wait_seconds_total": self.queue_wait_seconds_total,
+            "queue_wait_seconds_max": self.queue_wait_seconds_max,
+        }
+
+    def shutdown(self) -> None:
+        if self._pool is not None:
+            # shutdown(cancel_futures=True) needs Python 3.9
+            for future in list(self._futures):
+                future.cancel()
+            self._pool.shutdown(wait=False)
+            self._pool = None
+
+
+hashing_executor = HashingExecutor()
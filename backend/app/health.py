@@ -0,0 +1,91 @@
+import asyncio
+import logging
+import os
+import time
+from typing import Optional
+from fastapi import APIRouter
+from fastapi.responses import JSONResponse
+from sqlalchemy import select
+from app import database
+from app.config import settings
+from app.hashing import hashing_executor
+from app.models import User
+
+logger = logging.getLogger(__name__)
+
+HEALTH_PROBE_TIMEOUT = settings.health_probe_timeout
+READYZ_MAX_DB_LATENCY_MS = settings.readyz_max_db_latency_ms
+
+
+class Readiness:
+    """Whether this worker should get traffic: warmed up, and not draining for shutdown."""
+
+    def __init__(self):
+        self.warmed = False
+        self.draining = False
+
+    @property
+    def ready(self) -> bool:
+        return self.warmed and not self.draining
+
+
+readiness = Readiness()
+
+
+async def warm_up(pool_size: int, read_pool_size: int = 0) -> None:
+    """Opens the connection pool and starts the bcrypt workers, then marks the worker warmed."""
+    start = time.perf_counter()
+    try:
+        await database.warm_pool(pool_size, read_pool_size)
+        await hashing_executor.warm()
+    except Exception:
+        # /readyz still probes the database, so a broken one keeps the worker out of rotation
+        logger.exception("Warm-up failed")
+    else:
+        logger.info(f"Worker {os.getpid()} warmed up in {time.perf_counter() - start:.2f} s")
+    readiness.warmed = True
+
+
+async def probe_database() -> float:
+    """Milliseconds for a pooled query; raises on failure or after HEALTH_PROBE_TIMEOUT."""
+    async def query():
+        async with database.AsyncSessionLocal() as session:
+            await session.execute(select(User.id).limit(1))
+
+    start = time.perf_counter()
+    await asyncio.wait_for(query(), HEALTH_PROBE_TIMEOUT)
+    return (time.perf_counter() - start) * 1000
+
+
+async def _probe() -> dict:
+    try:
+        return {"db_latency_ms": round(await probe_database(), 2)}
+    except Exception as e:
+        return {"db_error": f"{type(e).__name__}: {e}"}
+
+
+# Initialize Router
+health_router = APIRouter()
+
+
+@health_router.get("/healthz", include_in_schema=False)
+async def healthz():
+    """Liveness: the event loop answers. A database outage is reported, not failed on."""
+    probe = await _probe()
+    return {"status": "ok" if "db_latency_ms" in probe else "degraded", "pid": os.getpid(), **probe}
+
+
+@health_router.get("/readyz", include_in_schema=False)
+async def readyz():
+    """Readiness: warmed up, not draining, and the database answers within READYZ_MAX_DB_LATENCY_MS."""
+    probe = await _probe()
+    latency: Optional[float] = probe.get("db_latency_ms")
+    ready = readiness.ready and latency is not None and latency <= READYZ_MAX_DB_LATENCY_MS
+    body = {
+        "status": "ready" if ready else "not ready",
+        "pid": os.getpid(),
+        "warmed": readiness.warmed,
+        "draining": readiness.draining,
+        **probe,
+    }
+    return JSONResponse(body, status_code=200 if ready else 503)
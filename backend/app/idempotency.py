@@ -0,0 +1,51 @@
+import hashlib
+import time
+from typing import Optional
+from sqlalchemy import delete, select
+from sqlalchemy.dialects.sqlite import insert as sqlite_insert
+from app import database
+from app.config import settings
+from app.jobs import job_queue
+from app.models import IdempotencyKey
+
+IDEMPOTENCY_KEY_TTL = settings.idempotency_key_ttl
+
+# Response header on a replayed response
+REPLAYED_HEADER = "Idempotent-Replayed"
+
+
+def request_hash(body: str) -> str:
+    return hashlib.sha256(body.encode()).hexdigest()
+
+
+async def find_response(db, user_id: int, key: str) -> Optional[IdempotencyKey]:
+    """The stored response for a key, if it was used in the last IDEMPOTENCY_KEY_TTL seconds."""
+    return (await db.execute(
+        select(IdempotencyKey.request_hash, IdempotencyKey.response).where(
+            IdempotencyKey.user_id == user_id,
+            IdempotencyKey.key == key,
+            IdempotencyKey.created_at >= time.time() - IDEMPOTENCY_KEY_TTL,
+        )
+    )).first()
+
+
+async def remember_response(db, user_id: int, key: str, body_hash: str, response: str) -> None:
+    """Stores a response in the caller's transaction; a concurrent retry that stored first wins."""
+    await db.execute(
+        sqlite_insert(IdempotencyKey)
+        .values(user_id=user_id, key=key, request_hash=body_hash, response=response, created_at=time.time())
+        .on_conflict_do_update(
+            index_elements=["user_id", "key"],
+            # Only an expired row is replaced
+            set_=dict(request_hash=body_hash, response=response, created_at=time.time()),
+            where=IdempotencyKey.created_at < time.time() - IDEMPOTENCY_KEY_TTL,
+        )
+    )
+
+
+@job_queue.maintenance
+async def prune_idempotency_keys() -> None:
+    cutoff = time.time() - IDEMPOTENCY_KEY_TTL
+    async with database.AsyncSessionLocal() as session:
+        await session.execute(delete(IdempotencyKey).where(IdempotencyKey.created_at < cutoff))
+        await session.commit()
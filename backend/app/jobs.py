@@ -0,0 +1,249 @@
+import asyncio
+import json
+import logging
+import random
+import time
+from typing import Iterable, Optional, Tuple
+from sqlalchemy import and_, delete, func, select, update
+from sqlalchemy.dialects.sqlite import insert as sqlite_insert
+from app import database
+from app.config import settings
+from app.models import Job
+
+logger = logging.getLogger(__name__)
+
+JOB_WORKERS = settings.job_workers
+JOB_POLL_INTERVAL = settings.job_poll_interval
+JOB_MAX_ATTEMPTS = settings.job_max_attempts
+JOB_BACKOFF_BASE = settings.job_backoff_base
+JOB_BACKOFF_MAX = settings.job_backoff_max
+JOB_LEASE_SECONDS = settings.job_lease_seconds
+JOB_RETENTION_SECONDS = settings.job_retention_seconds
+
+# How often an idle worker prunes old jobs and runs the maintenance tasks
+PRUNE_INTERVAL = 3600.0
+
+
+class JobQueue:
+    """Async job queue over the `jobs` outbox table, shared by every worker process.
+
+    Enqueue in the writer's transaction and `notify()` after its commit. A claim
+    is a lease that expires if the worker dies; failures retry with backoff.
+    A handler's writes commit with the job's "done" status.
+    """
+
+    def __init__(
+        self,
+        workers: int = JOB_WORKERS,
+        poll_interval: float = JOB_POLL_INTERVAL,
+        max_attempts: int = JOB_MAX_ATTEMPTS,
+        backoff_base: float = JOB_BACKOFF_BASE,
+        backoff_max: float = JOB_BACKOFF_MAX,
+        lease_seconds: float = JOB_LEASE_SECONDS,
+        retention_seconds: float = JOB_RETENTION_SECONDS,
+    ):
+        self.workers = workers
+        self.poll_interval = poll_interval
+        self.max_attempts = max_attempts
+        self.backoff_base = backoff_base
+        self.backoff_max = backoff_max
+        self.lease_seconds = lease_seconds
+        self.retention_seconds = retention_seconds
+        self.handlers = {}
+        self.maintenance_tasks = []
+        self.completed = 0
+        self.retried = 0
+        self.failed = 0
+        self._tasks = []
+        self._wakeup: Optional[asyncio.Event] = None
+        self._stopping = False
+        self._pruned_at = 0.0
+
+    def handler(self, kind: str):
+        """Registers the coroutine that runs jobs of this kind."""
+        def register(fn):
+            self.handlers[kind] = fn
+            return fn
+        return register
+
+    def maintenance(self, fn):
+        """Registers `async def fn()` to run every PRUNE_INTERVAL on an idle worker."""
+        self.maintenance_tasks.append(fn)
+        return fn
+
+    async def enqueue(self, db, kind: str, payload: dict, key: Optional[str] = None, **options) -> None:
+        await self.enqueue_many(db, kind, [(key, payload)], **options)
+
+    async def enqueue_many(
+        self,
+        db,
+        kind: str,
+        jobs: Iterable[Tuple[Optional[str], dict]],
+        delay: float = 0.0,
+        rearm: bool = False,
+    ) -> None:
+        """Adds (idempotency key, payload) jobs in the caller's transaction.
+
+        An existing key is left alone, unless `rearm` reschedules it once finished.
+        """
+        now = time.time()
+        rows = []
+        for key, payload in jobs:
+            body = json.dumps(payload, sort_keys=True)
+            rows.append({
+                "kind": kind,
+                "payload": body,
+                "idempotency_key": key or f"{kind}:{body}",
+                "status": "pending",
+                "attempts": 0,
+                "max_attempts": self.max_attempts,
+                "run_at": now + delay,
+                "created_at": now,
+            })
+        if not rows:
+            return
+        stmt = sqlite_insert(Job.__table__)
+        if rearm:
+            stmt = stmt.on_conflict_do_update(
+                index_elements=["idempotency_key"],
+                set_={"status": "pending", "attempts": 0, "run_at": stmt.excluded.run_at,
+                      "last_error": None, "finished_at": None},
+                where=Job.status.in_(("done", "failed")),
+            )
+        else:
+            stmt = stmt.on_conflict_do_nothing(index_elements=["idempotency_key"])
+        await db.execute(stmt, rows)
+
+    def notify(self) -> None:
+        """Wakes an idle worker; call after committing enqueued jobs."""
+        if self._wakeup is not None:
+            self._wakeup.set()
+
+    def backoff(self, attempts: int) -> float:
+        delay = min(self.backoff_max, self.backoff_base * 2 ** (attempts - 1))
+        # Jitter spreads out retries of jobs that failed together
+        return delay * random.uniform(0.5, 1.0)
+
+    async def _claim(self, session):
+        now = time.time()
+        # Due pending jobs first, then jobs whose lease ran out
+        pending = (
+            select(Job.id).where(Job.status == "pending", Job.run_at <= now)
+            .order_by(Job.run_at).limit(1).scalar_subquery()
+        )
+        expired = (
+            select(Job.id).where(Job.status == "running", Job.locked_until < now)
+            .limit(1).scalar_subquery()
+        )
+        stmt = (
+            update(Job)
+            .where(Job.id == func.coalesce(pending, expired))
+            .values(status="running", attempts=Job.attempts + 1, locked_until=now + self.lease_seconds)
+            .returning(Job.id, Job.kind, Job.payload, Job.attempts, Job.max_attempts)
+        )
+        job = (await session.execute(stmt.execution_options(synchronize_session=False))).first()
+        await session.commit()
+        return job
+
+    async def run_one(self) -> bool:
+        """Claims and runs one due job. Returns False when none is due."""
+        async with database.AsyncSessionLocal() as session:
+            job = await self._claim(session)
+            if job is None:
+                return False
+            handler = self.handlers.get(job.kind)
+            try:
+                if handler is None:
+                    raise LookupError(f"No handler for job kind {job.kind!r}")
+                await handler(session, json.loads(job.payload))
+                await session.execute(
+                    update(Job).where(Job.id == job.id)
+                    .values(status="done", locked_until=None, last_error=None, finished_at=time.time())
+                )
+                await session.commit()
+            except Exception as e:
+                await session.rollback()
+                await self._record_failure(session, job, e)
+                return True
+        self.completed += 1
+        return True
+
+    async def _record_failure(self, session, job, error: Exception) -> None:
+        now = time.time()
+        values = {"locked_until": None, "last_error": f"{type(error).__name__}: {error}"}
+        if job.attempts >= job.max_attempts:
+            values.update(status="failed", finished_at=now)
+            self.failed += 1
+            logger.error(f"Job {job.id} ({job.kind}) failed after {job.attempts} attempts: {values['last_error']}")
+        else:
+            values.update(status="pending", run_at=now + self.backoff(job.attempts))
+            self.retried += 1
+            logger.warning(f"Job {job.id} ({job.kind}) attempt {job.attempts} failed, retrying: {values['last_error']}")
+        await session.execute(update(Job).where(Job.id == job.id).values(**values))
+        await session.commit()
+
+    async def run_pending(self) -> int:
+        """Runs due jobs in the calling task until none is left. For scripts and tests."""
+        count = 0
+        while await self.run_one():
+            count += 1
+        return count
+
+    async def prune(self) -> int:
+        """Deletes done jobs older than the retention; their keys can then be reused."""
+        cutoff = time.time() - self.retention_seconds
+        async with database.AsyncSessionLocal() as session:
+            result = await session.execute(
+                delete(Job).where(and_(Job.status == "done", Job.finished_at < cutoff))
+            )
+            await session.commit()
+        return result.rowcount
+
+    async def _worker(self) -> None:
+        while not self._stopping:
+            self._wakeup.clear()
+            try:
+                if await self.run_one():
+                    continue
+                if time.time() - self._pruned_at > PRUNE_INTERVAL:
+                    self._pruned_at = time.time()
+                    await self.prune()
+                    for task in self.maintenance_tasks:
+                        await task()
+            except Exception:
+                # e.g. the database is locked or gone; back off to the poll interval
+                logger.exception("Job worker error")
+            try:
+                await asyncio.wait_for(self._wakeup.wait(), self.poll_interval)
+            except asyncio.TimeoutError:
+                pass
+
+    def start(self, workers: Optional[int] = None) -> None:
+        """Starts the worker tasks on the running event loop."""
+        self._stopping = False
+        self._wakeup = asyncio.Event()
+        self._tasks = [asyncio.create_task(self._worker()) for _ in range(workers or self.workers)]
+
+    async def stop(self, timeout: float = 5.0) -> None:
+        """Lets running jobs finish for up to `timeout` seconds; cancelled ones rerun after their lease."""
+        if not self._tasks:
+            return
+        self._stopping = True
+        self._wakeup.set()
+        _, pending = await asyncio.wait(self._tasks, timeout=timeout)
+        for task in pending:
+            task.cancel()
+        await asyncio.gather(*pending, return_exceptions=True)
+        self._tasks = []
+        self._wakeup = None
+
+    def stats(self) -> dict:
+        return {
+            "workers": len(self._tasks),
+            "completed": self.completed,
+            "retried": self.retried,
+            "failed": self.failed,
+        }
+
+
+job_queue = JobQueue()
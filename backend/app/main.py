@@ -1,31 +1,113 @@
+import asyncio
+from contextlib import asynccontextmanager
+from dataclasses import fields
 from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
-from app.database import engine
+from app import database
+from app.config import Settings, settings
 from app.models import Base
-from app.routers import  videos
+from app.routers import  users, videos
 from app.auth import auth_router
+from app.hashing import hashing_executor
+from app.jobs import job_queue
+from app.changes import change_feed
+from app.suggest import suggest_index
+from app.health import health_router, readiness, warm_up
+from app import youtube
+from app.metrics import MetricsMiddleware, TimedJSONResponse, instrument_engine, metrics_router
+from app.ratelimit import login_rate_limiter
 
+# The settings create_app applies. The rest are read from the environment when their
+# module is imported, so a config that changes any of them is rejected
+APP_SETTINGS = frozenset({
+    "database_url", "db_profile", "sqlite_synchronous", "sqlite_mmap_size", "sqlite_cache_size_kb",
+    "sqlite_busy_timeout_ms", "db_pool_size", "db_max_overflow", "db_pool_timeout", "extra_sqlite_pragmas",
+    "db_read_routing", "db_read_replica_url", "db_read_pool_size", "read_your_writes_seconds",
+    "create_schema", "cors_origins", "metrics_enabled", "rate_limit_enabled", "hash_workers",
+    "hash_queue_limit", "jobs_enabled", "job_workers", "suggest_enabled", "warm_on_startup",
+})
 
-# Create database tables
-Base.metadata.create_all(bind=engine)
 
-# Initialize FastAPI app
-app = FastAPI()
+def create_app(config: Settings = settings) -> FastAPI:
+    """Builds the API from the APP_SETTINGS fields of `config`; the database waits for the lifespan hook."""
+    if config is not settings:
+        ignored = [
+            field.name for field in fields(Settings)
+            if field.name not in APP_SETTINGS and getattr(config, field.name) != getattr(settings, field.name)
+        ]
+        if ignored:
+            raise ValueError(f"create_app cannot apply {', '.join(ignored)}; set them in the environment instead")
+        database.configure(config)
+    login_rate_limiter.enabled = config.rate_limit_enabled
+    # The pool starts lazily, so these apply as long as nothing has hashed yet
+    hashing_executor.max_workers = config.hash_workers
+    hashing_executor.max_pending = config.hash_queue_limit
 
-# Add CORS middleware
-app.add_middleware(
-    CORSMiddleware,
-    allow_origins=["http://localhost:5173"],  # Frontend URL
-    allow_credentials=True,
-    allow_methods=["*"],
-    allow_headers=["*"],
-)
+    @asynccontextmanager
+    async def lifespan(app: FastAPI):
+        # Alembic owns the schema; this is only for throwaway dev/test databases
+        if config.create_schema:
+            async with database.async_engine.begin() as connection:
+                await connection.run_sync(Base.metadata.create_all)
+        if config.jobs_enabled:
+            job_queue.start(config.job_workers)
+        if config.suggest_enabled:
+            suggest_index.start()
+        # Serve at once; /readyz waits for the warm-up
+        if config.warm_on_startup:
+            warming = asyncio.create_task(warm_up(config.db_pool_size, config.db_read_pool_size))
+        else:
+            warming = None
+            readiness.warmed = True
+        yield
+        readiness.draining = True
+        if warming is not None:
+            warming.cancel()
+            await asyncio.gather(warming, return_exceptions=True)
+        await change_feed.stop()
+        await suggest_index.stop()
+        await job_queue.stop()
+        await youtube.metadata_enricher.close()
+        hashing_executor.shutdown()
+        # Pooled aiosqlite connections run on non-daemon threads
+        await database.dispose_engines()
 
-# Include Routers
-app.include_router(videos.router, prefix="/videos", tags=["Videos"])
-app.include_router(auth_router, prefix="/api", tags=["Authentication"])
+    # Initialize FastAPI app
+    app = FastAPI(lifespan=lifespan, default_response_class=TimedJSONResponse)
+    app.state.settings = config
 
+    # Add CORS middleware
+    app.add_middleware(
+        CORSMiddleware,
+        allow_origins=config.cors_origins,  # Frontend URL
+        allow_credentials=True,
+        allow_methods=["*"],
+        allow_headers=["*"],
+    )
 
-@app.get("/")
-def root():
-    return {"message": "Welcome to the Educational Video App"}
+    # Sends a client's reads to the writer for a while after it writes (see database.get_db)
+    app.add_middleware(database.ReadYourWritesMiddleware, window=config.read_your_writes_seconds)
+
+    # Per-route latency, SQL and serialization metrics, served at /metrics
+    if config.metrics_enabled:
+        app.add_middleware(MetricsMiddleware)
+        instrument_engine(database.async_engine.sync_engine)
+        instrument_engine(database.engine)
+        if database.async_read_engine is not None:
+            instrument_engine(database.async_read_engine.sync_engine)
+        app.include_router(metrics_router, tags=["Metrics"])
+
+    # Include Routers
+    app.include_router(videos.router, prefix="/videos", tags=["Videos"])
+    app.include_router(users.router, prefix="/users", tags=["Users"])
+    app.include_router(auth_router, prefix="/api", tags=["Authentication"])
+    app.include_router(health_router, tags=["Health"])
+
+    @app.get("/")
+    def root():
+        return {"message": "Welcome to the Educational Video App"}
+
+    return app
+
+
+app = create_app()
@@ -0,0 +1,235 @@
+import bisect
+import logging
+import time
+from contextlib import contextmanager
+from contextvars import ContextVar
+from typing import Optional
+from fastapi import APIRouter
+from fastapi.responses import JSONResponse, PlainTextResponse
+from sqlalchemy import event
+from app.config import settings
+from app.hashing import hashing_executor
+from app.jobs import job_queue
+from app.changes import change_feed
+from app.ratelimit import login_rate_limiter
+
+# More queries than this in one request is logged as a likely N+1
+N_PLUS_ONE_THRESHOLD = settings.n_plus_one_threshold
+
+LATENCY_BUCKETS = (0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+QUERY_COUNT_BUCKETS = (0, 1, 2, 3, 5, 10, 20, 50, 100)
+
+logger = logging.getLogger(__name__)
+
+
+class RequestStats:
+    """Timings collected while one request is being handled."""
+
+    __slots__ = ("queries", "db_seconds", "serialization_seconds")
+
+    def __init__(self):
+        self.queries = 0
+        self.db_seconds = 0.0
+        self.serialization_seconds = 0.0
+
+
+# Holds a mutable object so updates from copied contexts (greenlets, threads) are kept
+current_request_stats: ContextVar[Optional[RequestStats]] = ContextVar("current_request_stats", default=None)
+
+
+class Histogram:
+    """Cumulative-bucket histogram in the shape Prometheus expects."""
+
+    __slots__ = ("buckets", "counts", "sum", "count")
+
+    def __init__(self, buckets):
+        self.buckets = buckets
+        self.counts = [0] * (len(buckets) + 1)
+        self.sum = 0.0
+        self.count = 0
+
+    def observe(self, value: float) -> None:
+        self.counts[bisect.bisect_left(self.buckets, value)] += 1
+        self.sum += value
+        self.count += 1
+
+    def render(self, name: str, labels: str) -> list:
+        lines = []
+        cumulative = 0
+        for bound, count in zip(self.buckets, self.counts):
+            cumulative += count
+            lines.append(f'{name}_bucket{{{labels},le="{bound}"}} {cumulative}')
+        lines.append(f'{name}_bucket{{{labels},le="+Inf"}} {self.count}')
+        lines.append(f"{name}_sum{{{labels}}} {self.sum}")
+        lines.append(f"{name}_count{{{labels}}} {self.count}")
+        return lines
+
+
+class RouteMetrics:
+    __slots__ = ("latency", "queries", "db_seconds", "serialization_seconds", "n_plus_one", "statuses")
+
+    def __init__(self):
+        self.latency = Histogram(LATENCY_BUCKETS)
+        self.queries = Histogram(QUERY_COUNT_BUCKETS)
+        self.db_seconds = 0.0
+        self.serialization_seconds = 0.0
+        self.n_plus_one = 0
+        self.statuses = {}
+
+
+class MetricsRegistry:
+    """Per-route request metrics, keyed on (method, route template)."""
+
+    def __init__(self, n_plus_one_threshold: int = N_PLUS_ONE_THRESHOLD):
+        self.n_plus_one_threshold = n_plus_one_threshold
+        self.routes = {}
+
+    def record(self, method: str, route: str, status: int, seconds: float, stats: RequestStats) -> None:
+        metrics = self.routes.get((method, route))
+        if metrics is None:
+            metrics = self.routes[(method, route)] = RouteMetrics()
+        metrics.latency.observe(seconds)
+        metrics.queries.observe(stats.queries)
+        metrics.db_seconds += stats.db_seconds
+        metrics.serialization_seconds += stats.serialization_seconds
+        metrics.statuses[status] = metrics.statuses.get(status, 0) + 1
+        if stats.queries > self.n_plus_one_threshold:
+            metrics.n_plus_one += 1
+            logger.warning(f"Possible N+1: {method} {route} issued {stats.queries} queries")
+
+    def clear(self) -> None:
+        self.routes.clear()
+
+    def render(self) -> str:
+        """Prometheus text exposition format (version 0.0.4)."""
+        sections = {
+            "http_request_duration_seconds": ("histogram", "Request latency by route template."),
+            "http_requests_total": ("counter", "Requests by route template and status."),
+            "http_request_db_queries": ("histogram", "SQL statements issued per request."),
+            "http_request_db_seconds_total": ("counter", "Time spent executing SQL."),
+            "http_request_serialization_seconds_total": ("counter", "Time spent rendering response bodies."),
+            "http_request_n_plus_one_total": (
+                "counter", f"Requests that issued more than {self.n_plus_one_threshold} queries.",
+            ),
+        }
+        lines = {name: [f"# HELP {name} {help}", f"# TYPE {name} {kind}"] for name, (kind, help) in sections.items()}
+        for (method, route), metrics in sorted(self.routes.items()):
+            labels = f'method="{method}",route="{route}"'
+            lines["http_request_duration_seconds"] += metrics.latency.render("http_request_duration_seconds", labels)
+            for status, count in sorted(metrics.statuses.items()):
+                lines["http_requests_total"].append(f'http_requests_total{{{labels},status="{status}"}} {count}')
+            lines["http_request_db_queries"] += metrics.queries.render("http_request_db_queries", labels)
+            lines["http_request_db_seconds_total"].append(
+                f"http_request_db_seconds_total{{{labels}}} {metrics.db_seconds}"
+            )
+            lines["http_request_serialization_seconds_total"].append(
+                f"http_request_serialization_seconds_total{{{labels}}} {metrics.serialization_seconds}"
+            )
+            lines["http_request_n_plus_one_total"].append(
+                f"http_request_n_plus_one_total{{{labels}}} {metrics.n_plus_one}"
+            )
+
+        for key, value in hashing_executor.stats().items():
+            name = f"password_hashing_{key}"
+            kind = "gauge" if key in ("pending", "queue_wait_seconds_max") else "counter"
+            lines[name] = [f"# TYPE {name} {kind}", f"{name} {value}"]
+        for key, value in job_queue.stats().items():
+            name = f"jobs_{key}" if key == "workers" else f"jobs_{key}_total"
+            kind = "gauge" if key == "workers" else "counter"
+            lines[name] = [f"# TYPE {name} {kind}", f"{name} {value}"]
+        for key, value in change_feed.stats().items():
+            name = f"change_feed_{key}" if key == "subscribers" else f"change_feed_{key}_total"
+            kind = "gauge" if key == "subscribers" else "counter"
+            lines[name] = [f"# TYPE {name} {kind}", f"{name} {value}"]
+        lines["login_rate_limited_total"] = [
+            "# TYPE login_rate_limited_total counter", f"login_rate_limited_total {login_rate_limiter.rejected}",
+        ]
+        return "\n".join(line for block in lines.values() for line in block) + "\n"
+
+
+metrics = MetricsRegistry()
+
+
+class MetricsMiddleware:
+    """Times each HTTP request and records it under its route template, not the raw path."""
+
+    def __init__(self, app, registry: MetricsRegistry = metrics):
+        self.app = app
+        self.registry = registry
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        stats = RequestStats()
+        token = current_request_stats.set(stats)
+        status = 500
+        start = time.perf_counter()
+
+        async def send_wrapper(message):
+            nonlocal status
+            if message["type"] == "http.response.start":
+                status = message["status"]
+            await send(message)
+
+        try:
+            await self.app(scope, receive, send_wrapper)
+        finally:
+            elapsed = time.perf_counter() - start
+            current_request_stats.reset(token)
+            route = scope.get("route")
+            template = getattr(route, "path", None) or "unmatched"
+            self.registry.record(scope["method"], template, status, elapsed, stats)
+
+
+def _before_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    if current_request_stats.get() is not None:
+        conn.info.setdefault("query_start_time", []).append(time.perf_counter())
+
+
+def _after_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    stats = current_request_stats.get()
+    if stats is None:
+        return
+    starts = conn.info.get("query_start_time")
+    if starts:
+        stats.db_seconds += time.perf_counter() - starts.pop()
+    stats.queries += 1
+
+
+def instrument_engine(sync_engine) -> None:
+    """Counts and times every statement run during a request (pass `async_engine.sync_engine`)."""
+    if event.contains(sync_engine, "before_cursor_execute", _before_cursor_execute):
+        return
+    event.listen(sync_engine, "before_cursor_execute", _before_cursor_execute)
+    event.listen(sync_engine, "after_cursor_execute", _after_cursor_execute)
+
+
+@contextmanager
+def timed_serialization():
+    """Adds the time spent in the block to the current request's serialization time."""
+    start = time.perf_counter()
+    try:
+        yield
+    finally:
+        stats = current_request_stats.get()
+        if stats is not None:
+            stats.serialization_seconds += time.perf_counter() - start
+
+
+class TimedJSONResponse(JSONResponse):
+    """JSONResponse that reports its render time to the request metrics."""
+
+    def render(self, content) -> bytes:
+        with timed_serialization():
+            return super().render(content)
+
+
+# Initialize Router
+metrics_router = APIRouter()
+
+
+@metrics_router.get("/metrics", response_class=PlainTextResponse, include_in_schema=False)
+def get_metrics():
+    return PlainTextResponse(metrics.render(), media_type="text/plain; version=0.0.4")
@@ -1,4 +1,4 @@
-from sqlalchemy import Column, Integer, String, ForeignKey
+from sqlalchemy import Column, Float, Integer, String, Text, ForeignKey, DDL, Index, event
 from sqlalchemy.orm import declarative_base, relationship
 
 # Base class for ORM models
@@ -11,8 +11,9 @@ class User(Base):
     email = Column(String, nullable=False, unique=True)
     password = Column(String, nullable=False)
 
-    # Relationship to Video table
-    videos = relationship('Video', back_populates='owner', cascade="all, delete-orphan")
+    # Relationship to Video table; the database deletes a user's videos (ON DELETE CASCADE),
+    # so deleting a User never loads them into the session
+    videos = relationship('Video', back_populates='owner', cascade="all, delete-orphan", passive_deletes=True)
 
     def __repr__(self):
         return f"<User(id={self.id}, username='{self.username}', email='{self.email}')>"
@@ -20,14 +21,197 @@ class User(Base):
 class Video(Base):
     __tablename__ = "videos"
 
-    id = Column(Integer, primary_key=True, index=True)
-    title = Column(String, index=True)
+    id = Column(Integer, primary_key=True)
+    title = Column(String, nullable=False, index=True)
     description = Column(String)
-    youtube_url = Column(String, unique=True, index=True)
-    uploaded_by = Column(Integer, ForeignKey("users.id"))
+    youtube_url = Column(String, nullable=False, unique=True, index=True)
+    # The URL's video id (app.youtube.parse_youtube_id), so every URL form of one
+    # video collides; NULL for URLs without one
+    youtube_id = Column(String, unique=True, index=True)
+    uploaded_by = Column(Integer, ForeignKey("users.id", ondelete="CASCADE"), nullable=False)
+
+    # "Videos by this user" paged by id, and the user delete cascade
+    __table_args__ = (Index("ix_videos_uploaded_by_id", "uploaded_by", "id"),)
 
     # Relationship to User table
     owner = relationship('User', back_populates='videos')
 
     def __repr__(self):
         return f"<Video(id={self.id}, title='{self.title}', user_id={self.user_id}, youtube_url='{self.youtube_url}')>"
+
+
+class VideoMetadata(Base):
+    """Data derived from a video's youtube_url by the background enrichment job."""
+    __tablename__ = "video_metadata"
+
+    video_id = Column(Integer, ForeignKey("videos.id"), primary_key=True)
+    youtube_url = Column(String, nullable=False)  # the URL this row was derived from
+    youtube_id = Column(String)
+    thumbnail_url = Column(String)
+    title = Column(String)
+    author_name = Column(String)
+    duration_seconds = Column(Integer)
+    fetched_at = Column(Float, nullable=False)
+
+
+class Job(Base):
+    """Outbox row for the background job queue (see app.jobs)."""
+    __tablename__ = "jobs"
+
+    id = Column(Integer, primary_key=True)
+    kind = Column(String, nullable=False)
+    payload = Column(Text, nullable=False)  # JSON
+    # Enqueueing an existing key is a no-op, so retried writes never duplicate work
+    idempotency_key = Column(String, nullable=False, unique=True)
+    status = Column(String, nullable=False, default="pending")  # pending, running, done, failed
+    attempts = Column(Integer, nullable=False, default=0)
+    max_attempts = Column(Integer, nullable=False)
+    run_at = Column(Float, nullable=False)  # epoch seconds
+    locked_until = Column(Float)
+    last_error = Column(Text)
+    created_at = Column(Float, nullable=False)
+    finished_at = Column(Float)
+
+    # Workers claim the oldest due job of a status
+    __table_args__ = (Index("ix_jobs_status_run_at", "status", "run_at"),)
+
+
+class IdempotencyKey(Base):
+    """The response to a POST /videos/ sent with an Idempotency-Key header, replayed on retries."""
+    __tablename__ = "idempotency_keys"
+
+    # Keys are the client's, so they are scoped per user
+    user_id = Column(Integer, ForeignKey("users.id", ondelete="CASCADE"), primary_key=True)
+    key = Column(String, primary_key=True)
+    request_hash = Column(String, nullable=False)  # SHA-256 of the request body
+    response = Column(Text, nullable=False)  # JSON
+    created_at = Column(Float, nullable=False)
+
+    __table_args__ = (Index("ix_idempotency_keys_created_at", "created_at"),)
+
+
+class VideoChange(Base):
+    """Append-only log of catalog writes, filled by triggers; served by GET /videos/changes."""
+    __tablename__ = "video_changes"
+
+    seq = Column(Integer, primary_key=True, autoincrement=True)
+    video_id = Column(Integer, nullable=False)
+    op = Column(String, nullable=False)  # insert, update or delete
+    data = Column(Text)  # the video as JSON after the write; NULL for deletes
+    created_at = Column(Float, nullable=False)
+
+    # AUTOINCREMENT: a seq is never reused, even after the log is pruned
+    __table_args__ = (Index("ix_video_changes_created_at", "created_at"), {"sqlite_autoincrement": True})
+
+
+_VIDEO_JSON = (
+    "json_object('id', new.id, 'title', new.title, 'description', new.description, "
+    "'youtube_url', new.youtube_url, 'uploaded_by', new.uploaded_by)"
+)
+_NOW = "(julianday('now') - 2440587.5) * 86400.0"
+
+# Triggers write the log in the same transaction as every videos write,
+# including bulk imports, raw SQL and the user delete cascade
+VIDEO_CHANGE_TRIGGERS = [
+    "CREATE TRIGGER IF NOT EXISTS video_changes_ai AFTER INSERT ON videos BEGIN "
+    f"INSERT INTO video_changes(video_id, op, data, created_at) VALUES (new.id, 'insert', {_VIDEO_JSON}, {_NOW}); "
+    "END",
+    "CREATE TRIGGER IF NOT EXISTS video_changes_au AFTER UPDATE ON videos "
+    "WHEN old.title IS NOT new.title OR old.description IS NOT new.description "
+    "OR old.youtube_url IS NOT new.youtube_url OR old.uploaded_by IS NOT new.uploaded_by BEGIN "
+    f"INSERT INTO video_changes(video_id, op, data, created_at) VALUES (new.id, 'update', {_VIDEO_JSON}, {_NOW}); "
+    "END",
+    "CREATE TRIGGER IF NOT EXISTS video_changes_ad AFTER DELETE ON videos BEGIN "
+    f"INSERT INTO video_changes(video_id, op, data, created_at) VALUES (old.id, 'delete', NULL, {_NOW}); "
+    "END",
+]
+# Bound to videos: video_changes has no foreign key, so create_all may create it
+# first, and a trigger's body tables are only resolved when it fires
+for _statement in VIDEO_CHANGE_TRIGGERS:
+    event.listen(Video.__table__, "after_create", DDL(_statement))
+
+
+class UploaderVideoCount(Base):
+    """Videos per uploader, maintained by triggers; rows are removed at zero."""
+    __tablename__ = "uploader_video_counts"
+
+    user_id = Column(Integer, primary_key=True)
+    video_count = Column(Integer, nullable=False)
+
+    # Top uploaders without sorting the table
+    __table_args__ = (Index("ix_uploader_video_counts_video_count", "video_count"),)
+
+
+class CatalogCounter(Base):
+    """Catalog-wide counters maintained by triggers: "videos" and "uploaders"."""
+    __tablename__ = "catalog_counters"
+
+    name = Column(String, primary_key=True)
+    value = Column(Integer, nullable=False)
+
+
+_COUNT_INSERT = (
+    # A first video makes a new uploader
+    "INSERT INTO catalog_counters(name, value) SELECT 'uploaders', 1 WHERE NOT EXISTS "
+    "(SELECT 1 FROM uploader_video_counts WHERE user_id = new.uploaded_by) "
+    "ON CONFLICT(name) DO UPDATE SET value = value + 1; "
+    "INSERT INTO uploader_video_counts(user_id, video_count) VALUES (new.uploaded_by, 1) "
+    "ON CONFLICT(user_id) DO UPDATE SET video_count = video_count + 1; "
+)
+_COUNT_DELETE = (
+    "UPDATE uploader_video_counts SET video_count = video_count - 1 WHERE user_id = old.uploaded_by; "
+    "UPDATE catalog_counters SET value = value - 1 WHERE name = 'uploaders' AND EXISTS "
+    "(SELECT 1 FROM uploader_video_counts WHERE user_id = old.uploaded_by AND video_count <= 0); "
+    "DELETE FROM uploader_video_counts WHERE user_id = old.uploaded_by AND video_count <= 0; "
+)
+
+# Counts for include_total and /videos/stats, kept in step with every videos write
+VIDEO_COUNT_TRIGGERS = [
+    "CREATE TRIGGER IF NOT EXISTS video_counts_ai AFTER INSERT ON videos BEGIN "
+    f"{_COUNT_INSERT}"
+    "INSERT INTO catalog_counters(name, value) VALUES ('videos', 1) "
+    "ON CONFLICT(name) DO UPDATE SET value = value + 1; "
+    "END",
+    "CREATE TRIGGER IF NOT EXISTS video_counts_ad AFTER DELETE ON videos BEGIN "
+    f"{_COUNT_DELETE}"
+    "UPDATE catalog_counters SET value = value - 1 WHERE name = 'videos'; "
+    "END",
+    "CREATE TRIGGER IF NOT EXISTS video_counts_au AFTER UPDATE OF uploaded_by ON videos "
+    f"WHEN old.uploaded_by IS NOT new.uploaded_by BEGIN {_COUNT_DELETE}{_COUNT_INSERT}END",
+]
+for _statement in VIDEO_COUNT_TRIGGERS:
+    event.listen(Video.__table__, "after_create", DDL(_statement))
+
+
+# Metadata goes with its video, whichever path deletes it
+VIDEO_METADATA_DELETE_TRIGGER = (
+    "CREATE TRIGGER IF NOT EXISTS video_metadata_ad AFTER DELETE ON videos BEGIN "
+    "DELETE FROM video_metadata WHERE video_id = old.id; "
+    "END"
+)
+event.listen(VideoMetadata.__table__, "after_create", DDL(VIDEO_METADATA_DELETE_TRIGGER))
+
+
+# Full-text search index over videos (SQLite FTS5, external content table).
+# Triggers keep it in sync with every write, including bulk and raw SQL paths.
+VIDEO_SEARCH_DDL = [
+    "CREATE VIRTUAL TABLE IF NOT EXISTS videos_fts USING fts5("
+    "title, description, content='videos', content_rowid='id', "
+    "tokenize='unicode61 remove_diacritics 2')",
+    # Rank title matches above description matches when ordering by `rank`
+    "INSERT INTO videos_fts(videos_fts, rank) VALUES ('rank', 'bm25(10.0, 1.0)')",
+    "CREATE TRIGGER IF NOT EXISTS videos_fts_ai AFTER INSERT ON videos BEGIN "
+    "INSERT INTO videos_fts(rowid, title, description) VALUES (new.id, new.title, new.description); "
+    "END",
+    "CREATE TRIGGER IF NOT EXISTS videos_fts_ad AFTER DELETE ON videos BEGIN "
+    "INSERT INTO videos_fts(videos_fts, rowid, title, description) VALUES ('delete', old.id, old.title, old.description); "
+    "END",
+    "CREATE TRIGGER IF NOT EXISTS videos_fts_au AFTER UPDATE OF title, description ON videos BEGIN "
+    "INSERT INTO videos_fts(videos_fts, rowid, title, description) VALUES ('delete', old.id, old.title, old.description); "
+    "INSERT INTO videos_fts(rowid, title, description) VALUES (new.id, new.title, new.description); "
+    "END",
+]
+
+for _statement in VIDEO_SEARCH_DDL:
+    event.listen(Video.__table__, "after_create", DDL(_statement))
+event.listen(Video.__table__, "before_drop", DDL("DROP TABLE IF EXISTS videos_fts"))
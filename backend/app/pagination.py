@@ -0,0 +1,50 @@
+import base64
+import binascii
+import json
+from fastapi import HTTPException
+
+# Most rows one list page may ask for, in offset or keyset mode
+MAX_PAGE_SIZE = 1000
+
+# SQLite's INTEGER range; the driver raises OverflowError on anything wider
+MIN_ID, MAX_ID = -2**63, 2**63 - 1
+
+
+def encode_cursor(last_id: int) -> str:
+    """Builds an opaque cursor pointing just past the row with `last_id`."""
+    payload = json.dumps({"id": last_id}, separators=(",", ":")).encode()
+    return base64.urlsafe_b64encode(payload).decode().rstrip("=")
+
+
+def decode_cursor(cursor: str):
+    """Returns the last seen id, or None for an empty cursor (first page)."""
+    if not cursor:
+        return None
+    try:
+        padded = cursor + "=" * (-len(cursor) % 4)
+        last_id = json.loads(base64.urlsafe_b64decode(padded))["id"]
+    except (binascii.Error, ValueError, KeyError, TypeError):
+        raise HTTPException(status_code=400, detail="Invalid cursor")
+    if not isinstance(last_id, int) or not MIN_ID <= last_id <= MAX_ID:
+        raise HTTPException(status_code=400, detail="Invalid cursor")
+    return last_id
+
+
+def keyset_query(query, id_column, cursor: str, limit: int):
+    """Orders a query by `id_column` and seeks past the cursor.
+
+    One extra row is requested so `split_page` can tell whether another page exists.
+    """
+    last_id = decode_cursor(cursor)
+    query = query.order_by(None).order_by(id_column)
+    if last_id is not None:
+        query = query.filter(id_column > last_id)
+    return query.limit(limit + 1)
+
+
+def split_page(rows, limit: int):
+    """Returns the page rows and the cursor for the next page (None on the last page)."""
+    if len(rows) <= limit:
+        return rows, None
+    rows = rows[:limit]
+    return rows, encode_cursor(rows[-1].id)
@@ -0,0 +1,186 @@
+import math
+import time
+from abc import ABC, abstractmethod
+from collections import OrderedDict
+from fastapi import HTTPException
+from app.config import settings
+
+RATE_LIMIT_ENABLED = settings.rate_limit_enabled
+RATE_LIMIT_BACKEND = settings.rate_limit_backend
+RATE_LIMIT_MAX_KEYS = settings.rate_limit_max_keys
+REDIS_URL = settings.redis_url
+
+# Login attempts per client IP: a burst of LOGIN_IP_BURST, refilled per minute
+LOGIN_IP_BURST = settings.login_ip_burst
+LOGIN_IP_PER_MINUTE = settings.login_ip_per_minute
+# Failed logins per email address
+LOGIN_EMAIL_FAILURES = settings.login_email_failures
+LOGIN_EMAIL_FAILURES_PER_MINUTE = settings.login_email_failures_per_minute
+
+
+class TokenBucketStore:
+    """Compact in-process token buckets: key -> (tokens, last update, full at).
+
+    A bucket that has refilled to capacity carries no information, so such
+    buckets are evicted lazily from the least recently charged end, and the
+    least recently charged ones also go first when `maxsize` is reached.
+    """
+
+    def __init__(self, maxsize: int = RATE_LIMIT_MAX_KEYS):
+        self.maxsize = maxsize
+        self._buckets = OrderedDict()
+
+    def _level(self, key: str, capacity: float, rate: float, now: float) -> float:
+        entry = self._buckets.get(key)
+        if entry is None:
+            return capacity
+        tokens, updated_at, _ = entry
+        return min(capacity, tokens + (now - updated_at) * rate)
+
+    def take(self, key: str, capacity: float, rate: float, cost: float = 1.0) -> float:
+        now = time.monotonic()
+        tokens = self._level(key, capacity, rate, now)
+        if tokens < cost:
+            return (cost - tokens) / rate
+        tokens -= cost
+        self._buckets[key] = (tokens, now, now + (capacity - tokens) / rate)
+        self._buckets.move_to_end(key)
+        self._evict(now)
+        return 0.0
+
+    def peek(self, key: str, capacity: float, rate: float, cost: float = 1.0) -> float:
+        tokens = self._level(key, capacity, rate, time.monotonic())
+        return 0.0 if tokens >= cost else (cost - tokens) / rate
+
+    def _evict(self, now: float) -> None:
+        while len(self._buckets) > self.maxsize:
+            self._buckets.popitem(last=False)
+        # Stop at the first bucket that is still refilling; later ones are swept on later calls
+        while self._buckets:
+            key, (_, _, full_at) = next(iter(self._buckets.items()))
+            if full_at > now:
+                break
+            del self._buckets[key]
+
+    def __len__(self) -> int:
+        return len(self._buckets)
+
+
+class RateLimitBackend(ABC):
+    """Token bucket storage. Both methods return 0.0 when `cost` tokens are
+    available, otherwise the seconds until they will be; only `take` spends them.
+    """
+
+    @abstractmethod
+    async def take(self, key: str, capacity: float, rate: float, cost: float = 1.0) -> float:
+        ...
+
+    @abstractmethod
+    async def peek(self, key: str, capacity: float, rate: float, cost: float = 1.0) -> float:
+        ...
+
+
+class InMemoryRateLimitBackend(RateLimitBackend):
+    """Per-process buckets; each worker enforces the limits on its own."""
+
+    def __init__(self, maxsize: int = RATE_LIMIT_MAX_KEYS):
+        self.store = TokenBucketStore(maxsize=maxsize)
+
+    async def take(self, key: str, capacity: float, rate: float, cost: float = 1.0) -> float:
+        return self.store.take(key, capacity, rate, cost)
+
+    async def peek(self, key: str, capacity: float, rate: float, cost: float = 1.0) -> float:
+        return self.store.peek(key, capacity, rate, cost)
+
+
+# Atomic refill-and-take; KEYS[1] = bucket, ARGV = capacity, rate, cost, now, apply
+_TOKEN_BUCKET_SCRIPT = """
+local bucket = redis.call('HMGET', KEYS[1], 'tokens', 'ts')
+local capacity, rate, cost, now = tonumber(ARGV[1]), tonumber(ARGV[2]), tonumber(ARGV[3]), tonumber(ARGV[4])
+local tokens = capacity
+if bucket[1] then
+    tokens = math.min(capacity, tonumber(bucket[1]) + (now - tonumber(bucket[2])) * rate)
+end
+if tokens < cost then
+    return tostring((cost - tokens) / rate)
+end
+if ARGV[5] == '1' then
+    redis.call('HSET', KEYS[1], 'tokens', tokens - cost, 'ts', now)
+    redis.call('EXPIRE', KEYS[1], math.ceil(capacity / rate))
+end
+return '0'
+"""
+
+
+class RedisRateLimitBackend(RateLimitBackend):
+    """Shared buckets over any client with redis.asyncio's `eval`, so limits hold across workers."""
+
+    def __init__(self, client, prefix: str = "edu-video:ratelimit:"):
+        self.client = client
+        self.prefix = prefix
+
+    @classmethod
+    def from_url(cls, url: str, **kwargs):
+        import redis.asyncio  # optional dependency, only needed for this backend
+
+        return cls(redis.asyncio.Redis.from_url(url), **kwargs)
+
+    async def _run(self, key: str, capacity: float, rate: float, cost: float, apply: bool) -> float:
+        result = await self.client.eval(
+            _TOKEN_BUCKET_SCRIPT, 1, self.prefix + key, capacity, rate, cost, time.time(), "1" if apply else "0",
+        )
+        return float(result)
+
+    async def take(self, key: str, capacity: float, rate: float, cost: float = 1.0) -> float:
+        return await self._run(key, capacity, rate, cost, apply=True)
+
+    async def peek(self, key: str, capacity: float, rate: float, cost: float = 1.0) -> float:
+        return await self._run(key, capacity, rate, cost, apply=False)
+
+
+def _too_many(retry_after: float) -> HTTPException:
+    return HTTPException(
+        status_code=429,
+        detail="Too many login attempts, try again later",
+        headers={"Retry-After": str(max(1, math.ceil(retry_after)))},
+    )
+
+
+class LoginRateLimiter:
+    """Every attempt spends from the client IP's bucket; only failures spend
+    from the email's bucket, so password guessing against one account is
+    throttled from any number of IPs while successful logins cost nothing.
+    """
+
+    def __init__(self, backend: RateLimitBackend, enabled: bool = RATE_LIMIT_ENABLED):
+        self.backend = backend
+        self.enabled = enabled
+        self.rejected = 0
+
+    async def check(self, ip: str, email: str) -> None:
+        """Raises 429 before any DB or bcrypt work if either bucket is empty."""
+        if not self.enabled:
+            return
+        wait = await self.backend.peek(
+            f"login:email:{email.lower()}", LOGIN_EMAIL_FAILURES, LOGIN_EMAIL_FAILURES_PER_MINUTE / 60,
+        )
+        if not wait:
+            wait = await self.backend.take(f"login:ip:{ip}", LOGIN_IP_BURST, LOGIN_IP_PER_MINUTE / 60)
+        if wait:
+            self.rejected += 1
+            raise _too_many(wait)
+
+    async def record_failure(self, email: str) -> None:
+        if self.enabled:
+            await self.backend.take(
+                f"login:email:{email.lower()}", LOGIN_EMAIL_FAILURES, LOGIN_EMAIL_FAILURES_PER_MINUTE / 60,
+            )
+
+
+def _build_backend() -> RateLimitBackend:
+    if RATE_LIMIT_BACKEND == "redis":
+        return RedisRateLimitBackend.from_url(REDIS_URL)
+    return InMemoryRateLimitBackend()
+
+
+login_rate_limiter = LoginRateLimiter(_build_backend())
@@ -0,0 +1,59 @@
+import hashlib
+from fastapi import Request, Response
+from app.cache import InMemoryCacheBackend, RedisCacheBackend
+from app.config import settings
+
+RESPONSE_CACHE_BACKEND = settings.response_cache_backend
+RESPONSE_CACHE_SIZE = settings.response_cache_size
+RESPONSE_CACHE_TTL = settings.response_cache_ttl
+REDIS_URL = settings.redis_url
+
+
+class ResponseCache:
+    """Caches JSON response bodies keyed on path plus query parameters.
+
+    Every key also carries the current generation of its scope. Writers call
+    `invalidate(scope)` to bump the generation, so entries built before the
+    write can never be served again; they simply age out of the backend.
+    Readers fetch the generation before querying the database, so a response
+    built concurrently with a write is stored under the old generation.
+    """
+
+    def __init__(self, backend, ttl: float = RESPONSE_CACHE_TTL):
+        self.backend = backend
+        self.ttl = ttl
+
+    async def _key(self, scope: str, request: Request) -> str:
+        generation = await self.backend.counter(f"gen:{scope}")
+        query = "&".join(sorted(f"{key}={value}" for key, value in request.query_params.multi_items()))
+        return f"{scope}:{generation}:{request.url.path}?{query}"
+
+    async def respond(self, request: Request, scope: str, build) -> Response:
+        """Serves the cached body for this request, or awaits `build()` for fresh bytes."""
+        key = await self._key(scope, request)
+        entry = await self.backend.get(key)
+        if entry is None:
+            body = await build()
+            etag = f'"{hashlib.blake2b(body, digest_size=16).hexdigest()}"'
+            await self.backend.set(key, etag.encode() + b"\n" + body, self.ttl)
+        else:
+            etag, body = entry.split(b"\n", 1)
+            etag = etag.decode()
+
+        headers = {"ETag": etag, "Cache-Control": "no-cache"}
+        if etag in request.headers.get("if-none-match", ""):
+            return Response(status_code=304, headers=headers)
+        return Response(content=body, media_type="application/json", headers=headers)
+
+    async def invalidate(self, *scopes: str) -> None:
+        for scope in scopes:
+            await self.backend.incr(f"gen:{scope}")
+
+
+def _build_backend():
+    if RESPONSE_CACHE_BACKEND == "redis":
+        return RedisCacheBackend.from_url(REDIS_URL)
+    return InMemoryCacheBackend(maxsize=RESPONSE_CACHE_SIZE, ttl=RESPONSE_CACHE_TTL)
+
+
+response_cache = ResponseCache(_build_backend())
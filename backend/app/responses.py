@@ -0,0 +1,20 @@
+from typing import Sequence
+import orjson
+from app.metrics import timed_serialization
+from app.models import Video
+
+# Column order matches the fields of schemas.VideoResponse
+VIDEO_COLUMNS = (Video.id, Video.title, Video.description, Video.youtube_url, Video.uploaded_by)
+VIDEO_KEYS = tuple(column.key for column in VIDEO_COLUMNS)
+
+
+def dump_rows(rows, keys: Sequence[str] = VIDEO_KEYS, **extra) -> bytes:
+    """Serializes row tuples straight to a JSON array of objects, skipping Pydantic.
+
+    With keyword arguments the array becomes the "items" of an object holding
+    them too, e.g. `dump_rows(rows, next_cursor=...)` for a keyset page.
+    """
+    with timed_serialization():
+        items = [dict(zip(keys, row)) for row in rows]
+        return orjson.dumps({"items": items, **extra} if extra else items)
+
@@ -1,4 +1,5 @@
 from .videos import router as videos_router
+from .users import router as users_router
 
 
 __all__ = ["users_router", "videos_router", "activities_router"]
@@ -0,0 +1,138 @@
+from fastapi import APIRouter, Depends, HTTPException, Query, Request, Response
+from sqlalchemy import delete, select, update
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.ext.asyncio import AsyncSession
+from app.database import get_db
+from app.auth import get_current_user, hash_password, invalidate_cached_user, invalidate_cached_user_id
+from app.models import User, Video
+from app.schemas import UserPage, UserResponse, UserUpdate, VideoPage, VideoResponse
+from app.pagination import MAX_PAGE_SIZE, keyset_query, split_page
+from app.response_cache import response_cache
+from app.changes import change_feed
+from app.stats import uploader_video_count
+from app.responses import VIDEO_COLUMNS, dump_rows
+from app.routers.videos import ITEM_CACHE_SCOPE, LIST_CACHE_SCOPE
+from typing import List, Optional, Union
+import logging
+
+# Logging setup
+logger = logging.getLogger(__name__)
+
+router = APIRouter()
+
+# Public user fields, in UserResponse order; the password hash never leaves the DB
+USER_COLUMNS = (User.id, User.name, User.email)
+USER_KEYS = tuple(column.key for column in USER_COLUMNS)
+
+def _require_self(user_id: int, current_user: UserResponse) -> None:
+    if user_id != current_user.id:
+        raise HTTPException(status_code=403, detail="You can only change your own account")
+
+@router.get("/", response_model=Union[List[UserResponse], UserPage])
+async def get_users(
+    skip: int = Query(0, ge=0),
+    limit: int = Query(10, ge=1, le=MAX_PAGE_SIZE),
+    cursor: Optional[str] = None,
+    db: AsyncSession = Depends(get_db),
+):
+    query = select(*USER_COLUMNS)
+    if cursor is not None:
+        # Keyset mode: pass an empty cursor for the first page, then next_cursor
+        rows = (await db.execute(keyset_query(query, User.id, cursor, limit))).all()
+        items, next_cursor = split_page(rows, limit)
+        return Response(dump_rows(items, USER_KEYS, next_cursor=next_cursor), media_type="application/json")
+    rows = (await db.execute(query.offset(skip).limit(limit))).all()
+    return Response(dump_rows(rows, USER_KEYS), media_type="application/json")
+
+@router.get("/{user_id}", response_model=UserResponse)
+async def get_user(user_id: int, db: AsyncSession = Depends(get_db)):
+    row = (await db.execute(select(*USER_COLUMNS).where(User.id == user_id))).first()
+    if row is None:
+        raise HTTPException(status_code=404, detail="User not found")
+    return row._mapping
+
+@router.patch("/{user_id}", response_model=UserResponse)
+async def update_user(
+    user_id: int,
+    user_data: UserUpdate,
+    db: AsyncSession = Depends(get_db),
+    current_user: UserResponse = Depends(get_current_user),
+):
+    _require_self(user_id, current_user)
+    update_data = user_data.dict(exclude_unset=True)
+    if "password" in update_data:
+        update_data["password"] = await hash_password(update_data["password"])
+    if update_data:
+        # One UPDATE ... RETURNING round trip; the unique index rejects a taken email
+        stmt = update(User).where(User.id == user_id).values(**update_data).returning(*USER_COLUMNS)
+        try:
+            row = (await db.execute(stmt.execution_options(synchronize_session=False))).first()
+        except IntegrityError as e:
+            await db.rollback()
+            if "users.email" in str(e.orig):
+                raise HTTPException(status_code=400, detail="Email already in use")
+            raise
+    else:
+        row = (await db.execute(select(*USER_COLUMNS).where(User.id == user_id))).first()
+    if row is None:
+        raise HTTPException(status_code=404, detail="User not found")
+    await db.commit()
+    if "email" in update_data:
+        # RETURNING only sees the new email, so drop the old entry by id
+        invalidate_cached_user_id(user_id)
+    invalidate_cached_user(row.email)
+    logger.info(f"User updated: {row.email}")
+    return row._mapping
+
+@router.delete("/{user_id}")
+async def delete_user(
+    user_id: int,
+    db: AsyncSession = Depends(get_db),
+    current_user: UserResponse = Depends(get_current_user),
+):
+    _require_self(user_id, current_user)
+    # The user's videos go with it (ON DELETE CASCADE), deleted by the database in one
+    # pass over ix_videos_uploaded_by_id
+    stmt = delete(User).where(User.id == user_id).returning(User.email)
+    email = await db.scalar(stmt.execution_options(synchronize_session=False))
+    if email is None:
+        await db.rollback()
+        raise HTTPException(status_code=404, detail="User not found")
+    await db.commit()
+    change_feed.notify()
+    invalidate_cached_user(email)
+    await response_cache.invalidate(LIST_CACHE_SCOPE, ITEM_CACHE_SCOPE)
+    logger.info(f"User deleted: {user_id}")
+    return {"message": "User deleted successfully"}
+
+@router.get("/{user_id}/videos", response_model=Union[List[VideoResponse], VideoPage])
+async def get_user_videos(
+    user_id: int,
+    request: Request,
+    offset: int = Query(0, ge=0),
+    limit: int = Query(10, ge=1, le=MAX_PAGE_SIZE),
+    cursor: Optional[str] = None,
+    include_total: bool = False,
+    db: AsyncSession = Depends(get_db),
+):
+    """Videos uploaded by one user, in id order (served by ix_videos_uploaded_by_id)."""
+    async def build() -> bytes:
+        query = select(*VIDEO_COLUMNS).where(Video.uploaded_by == user_id).order_by(Video.id)
+        if cursor is not None:
+            # Keyset mode: pass an empty cursor for the first page, then next_cursor
+            rows = (await db.execute(keyset_query(query, Video.id, cursor, limit))).all()
+        else:
+            rows = (await db.execute(query.offset(offset).limit(limit))).all()
+        # Only an empty page needs the extra lookup to tell "no videos" from "no user"
+        if not rows and await db.scalar(select(User.id).where(User.id == user_id)) is None:
+            raise HTTPException(status_code=404, detail="User not found")
+        extra = {}
+        if include_total:
+            extra["total"], extra["total_exact"] = await uploader_video_count(db, user_id), True
+        if cursor is not None:
+            items, next_cursor = split_page(rows, limit)
+            return dump_rows(items, next_cursor=next_cursor, **extra)
+        return dump_rows(rows, **extra)
+
+    # Any video write bumps the list scope, which covers these pages too
+    return await response_cache.respond(request, LIST_CACHE_SCOPE, build)
@@ -1,10 +1,37 @@
-from fastapi import APIRouter, Depends, HTTPException
-from sqlalchemy.orm import Session
-from app.database import get_db
-from app.models import Video
-from app.schemas import VideoCreate, VideoResponse, VideoUpdate
-from typing import List
+from fastapi import APIRouter, Depends, Header, HTTPException, Query, Request, Response
+from fastapi.responses import StreamingResponse
+from pydantic import ValidationError
+from sqlalchemy import delete, or_, select, update
+from sqlalchemy.dialects.sqlite import insert as sqlite_insert
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.ext.asyncio import AsyncSession
+from app.database import AsyncReadSessionLocal, get_db, get_read_db
+from app.auth import get_current_user
+from app.models import Video, VideoMetadata
+from app.schemas import (
+    BulkImportResult, BulkRowResult, CatalogStats, UserResponse, VideoBatch, VideoBatchRequest, VideoCreate, VideoMetadataResponse,
+    VideoPage, VideoResponse, VideoSuggestions, VideoUpdate,
+)
+from app.search import apply_search, enqueue_optimize
+from app.jobs import job_queue
+from app.youtube import enqueue_enrichment, parse_youtube_id
+from app.idempotency import REPLAYED_HEADER, find_response, remember_response, request_hash
+from app.pagination import MAX_ID, MAX_PAGE_SIZE, MIN_ID, keyset_query, split_page
+from app.response_cache import response_cache
+from app.metrics import timed_serialization
+from app.responses import VIDEO_COLUMNS, dump_rows
+from app.dataloader import DataLoader
+from app.suggest import suggest_index
+from app.stats import catalog_counter, catalog_stats, search_total
+from app.changes import CHANGE_BATCH_SIZE, change_feed, format_change, iter_changes, log_bounds, read_changes
+from app.config import settings
+from typing import List, Optional, Union
+import asyncio
+import csv
+import io
+import json
 import logging
+import orjson
 
 # Logging setup
 logging.basicConfig(level=logging.INFO)
@@ -12,53 +39,493 @@ logger = logging.getLogger(__name__)
 
 router = APIRouter()
 
+# Rows validated and inserted per transaction by the bulk import endpoint
+BULK_BATCH_SIZE = 1000
+
+# Columns written by the export endpoint, and rows fetched per round trip
+EXPORT_COLUMNS = VIDEO_COLUMNS
+EXPORT_CHUNK_ROWS = 1000
+
+# Most ids one batch lookup may ask for
+MAX_BATCH_IDS = 100
+
+# Most suggestions one request may ask for
+MAX_SUGGESTIONS = 50
+
+# Response cache scopes: every list page, and every single-video response (one shared
+# generation, so the backend never keeps a counter per video)
+LIST_CACHE_SCOPE = "videos:list"
+ITEM_CACHE_SCOPE = "videos:item"
+
 @router.post("/", response_model=VideoResponse)
-def create_video(video: VideoCreate, db: Session = Depends(get_db)):
-    new_video = Video(
-        title=video.title,
-        description=video.description,
-        youtube_url=video.youtube_url,
-        uploaded_by=video.uploaded_by,
+async def create_video(
+    video: VideoCreate,
+    db: AsyncSession = Depends(get_db),
+    current_user: UserResponse = Depends(get_current_user),
+    idempotency_key: Optional[str] = Header(None, max_length=255),
+):
+    """Creates a video, or returns the one that already has its YouTube id or URL.
+
+    Every URL form of one YouTube video (youtu.be, watch?v=...&t=, m.youtube.com)
+    resolves to the same row. A retry carrying the same Idempotency-Key gets the
+    first response back from one primary-key lookup.
+    """
+    if video.uploaded_by != current_user.id:
+        raise HTTPException(status_code=403, detail="uploaded_by: you can only upload videos as yourself")
+    if idempotency_key:
+        body_hash = request_hash(video.model_dump_json())
+        stored = await find_response(db, current_user.id, idempotency_key)
+        if stored is not None:
+            if stored.request_hash != body_hash:
+                raise HTTPException(status_code=422, detail="Idempotency-Key was already used for a different request")
+            return Response(stored.response, media_type="application/json", headers={REPLAYED_HEADER: "true"})
+    youtube_id = parse_youtube_id(video.youtube_url)
+    # One round trip either way: a duplicate inserts nothing and returns no row
+    stmt = (
+        sqlite_insert(Video.__table__)
+        .values(**video.model_dump(), youtube_id=youtube_id)
+        .on_conflict_do_nothing()
+        .returning(*Video.__table__.c)
+    )
+    try:
+        row = (await db.execute(stmt)).first()
+    except IntegrityError as e:
+        await db.rollback()
+        if "FOREIGN KEY" in str(e.orig):
+            raise HTTPException(status_code=400, detail="uploaded_by: user not found")
+        raise
+    created = row is not None
+    if not created:
+        duplicate = Video.youtube_url == video.youtube_url
+        if youtube_id:
+            duplicate = or_(duplicate, Video.youtube_id == youtube_id)
+        row = (await db.execute(select(*Video.__table__.c).where(duplicate))).first()
+        if row is None:
+            # Deleted between the two statements
+            raise HTTPException(status_code=409, detail="Conflicting video was just deleted; retry the request")
+    response = VideoResponse.model_validate(row._mapping).model_dump_json()
+    if created:
+        # Enrichment runs in the background; the job commits with the video or not at all
+        await enqueue_enrichment(db, [(row.id, row.youtube_url)])
+    if idempotency_key:
+        await remember_response(db, current_user.id, idempotency_key, body_hash, response)
+    await db.commit()
+    if created:
+        job_queue.notify()
+        change_feed.notify()
+        await response_cache.invalidate(LIST_CACHE_SCOPE)
+        logger.info(f"Video created: {video.title}")
+    return Response(response, media_type="application/json")
+
+async def _iter_bulk_rows(request: Request):
+    """Yields (index, row, parse error) from a JSON array or NDJSON body."""
+    content_type = request.headers.get("content-type", "")
+    if "ndjson" in content_type or "jsonlines" in content_type:
+        # Stream NDJSON line by line instead of buffering the whole upload
+        index = 0
+        buffer = b""
+        async for chunk in request.stream():
+            buffer += chunk
+            *lines, buffer = buffer.split(b"\n")
+            for line in lines:
+                if line.strip():
+                    yield (index, *_parse_json_line(line))
+                    index += 1
+        if buffer.strip():
+            yield (index, *_parse_json_line(buffer))
+        return
+
+    try:
+        rows = json.loads(await request.body())
+    except ValueError:
+        raise HTTPException(status_code=400, detail="Body must be a JSON array or NDJSON")
+    if not isinstance(rows, list):
+        raise HTTPException(status_code=400, detail="Body must be a JSON array or NDJSON")
+    for index, row in enumerate(rows):
+        yield index, row, None
+
+
+def _parse_json_line(line: bytes):
+    try:
+        return json.loads(line), None
+    except ValueError as e:
+        return None, f"Invalid JSON: {e}"
+
+
+def _validation_errors(error: ValidationError) -> List[str]:
+    return [f"{'.'.join(str(part) for part in err['loc']) or 'row'}: {err['msg']}" for err in error.errors()]
+
+
+async def _insert_batch(db: AsyncSession, batch, uploader: int, results: List[BulkRowResult]) -> None:
+    """Inserts one batch in a single statement, skipping existing youtube_urls."""
+    unique = {}
+    for index, video in batch:
+        youtube_id = parse_youtube_id(video.youtube_url)
+        # Two URL forms of one YouTube video are duplicates
+        key = youtube_id or video.youtube_url
+        if video.uploaded_by != uploader:
+            results.append(BulkRowResult(index=index, status="error", errors=["uploaded_by: must be your own user id"]))
+        elif key in unique:
+            results.append(BulkRowResult(index=index, status="skipped", errors=["youtube_url: duplicate in request"]))
+        else:
+            unique[key] = index, {**video.model_dump(), "youtube_id": youtube_id}
+    if not unique:
+        # Nothing to insert; an empty parameter list would insert a row of defaults
+        await db.rollback()
+        return
+    # executemany on a Core insert: compiled once and cached, sent as multi-row VALUES
+    # No conflict target: an existing youtube_url or youtube_id both skip the row
+    stmt = sqlite_insert(Video.__table__).on_conflict_do_nothing().returning(Video.id, Video.youtube_url)
+    params = [values for _, values in unique.values()]
+    created = {row.youtube_url: row.id for row in await db.execute(stmt, params)}
+    await enqueue_enrichment(db, [(video_id, url) for url, video_id in created.items()])
+    await db.commit()
+    for index, values in unique.values():
+        url = values["youtube_url"]
+        if url in created:
+            results.append(BulkRowResult(index=index, status="created", id=created[url]))
+        else:
+            results.append(BulkRowResult(index=index, status="skipped", errors=["youtube_url: already exists"]))
+
+
+@router.post("/bulk", response_model=BulkImportResult)
+async def bulk_create_videos(
+    request: Request,
+    db: AsyncSession = Depends(get_db),
+    current_user: UserResponse = Depends(get_current_user),
+):
+    """Imports many videos from a JSON array or an NDJSON stream.
+
+    Rows are validated and inserted in batches of BULK_BATCH_SIZE, one
+    transaction per batch. Rows whose youtube_url or YouTube video id already
+    exists are skipped; rows uploaded by anyone but the caller fail.
+    """
+    results: List[BulkRowResult] = []
+    batch = []
+    try:
+        async for index, row, parse_error in _iter_bulk_rows(request):
+            if parse_error:
+                results.append(BulkRowResult(index=index, status="error", errors=[parse_error]))
+                continue
+            try:
+                batch.append((index, VideoCreate.model_validate(row)))
+            except ValidationError as e:
+                results.append(BulkRowResult(index=index, status="error", errors=_validation_errors(e)))
+                continue
+            if len(batch) == BULK_BATCH_SIZE:
+                await _insert_batch(db, batch, current_user.id, results)
+                batch = []
+        if batch:
+            await _insert_batch(db, batch, current_user.id, results)
+    finally:
+        # Earlier batches are already committed even if a later one fails
+        await response_cache.invalidate(LIST_CACHE_SCOPE)
+        job_queue.notify()
+        change_feed.notify()
+
+    results.sort(key=lambda result: result.index)
+    counts = {status: 0 for status in ("created", "skipped", "error")}
+    for result in results:
+        counts[result.status] += 1
+    if counts["created"]:
+        await enqueue_optimize(db)
+        await db.commit()
+    logger.info(f"Bulk import: {counts['created']} created, {counts['skipped']} skipped, {counts['error']} failed")
+    return BulkImportResult(
+        created=counts["created"], skipped=counts["skipped"], failed=counts["error"], results=results,
+    )
+
+def _video_loader(db: AsyncSession) -> DataLoader:
+    """Loader of video column rows by id over `db`, one IN query per batch."""
+    async def fetch(ids: List[int]):
+        rows = await db.execute(select(*VIDEO_COLUMNS).where(Video.id.in_(ids)))
+        return {row.id: row for row in rows}
+
+    return DataLoader(fetch, max_batch_size=MAX_BATCH_IDS)
+
+def get_video_loader(db: AsyncSession = Depends(get_read_db)) -> DataLoader:
+    """Request-scoped video loader, for handlers that only read."""
+    return _video_loader(db)
+
+def _parse_ids(ids: str) -> List[int]:
+    try:
+        return [int(part) for part in ids.split(",") if part.strip()]
+    except ValueError:
+        raise HTTPException(status_code=400, detail="ids must be comma-separated integers")
+
+async def _batch_get(loader: DataLoader, ids: List[int]) -> bytes:
+    """Videos in the requested order (duplicates once), plus the ids that do not exist."""
+    if len(ids) > MAX_BATCH_IDS:
+        raise HTTPException(status_code=400, detail=f"At most {MAX_BATCH_IDS} ids per request")
+    if not all(MIN_ID <= video_id <= MAX_ID for video_id in ids):
+        raise HTTPException(status_code=400, detail="ids must be 64-bit integers")
+    ids = list(dict.fromkeys(ids))
+    rows = await loader.load_many(ids)
+    return dump_rows(
+        [row for row in rows if row is not None],
+        missing=[video_id for video_id, row in zip(ids, rows) if row is None],
+    )
+
+@router.post("/batch-get", response_model=VideoBatch)
+async def batch_get_videos(body: VideoBatchRequest, loader: DataLoader = Depends(get_video_loader)):
+    """Same as GET /videos?ids=..., for id lists too long for a URL."""
+    return Response(content=await _batch_get(loader, body.ids), media_type="application/json")
+
+@router.get("/", response_model=Union[List[VideoResponse], VideoPage, VideoBatch])
+async def get_videos(
+    request: Request,
+    offset: int = Query(0, ge=0),
+    limit: int = Query(10, ge=1, le=MAX_PAGE_SIZE),
+    search: str = "",
+    cursor: Optional[str] = None,
+    ids: Optional[str] = None,
+    include_total: bool = False,
+    db: AsyncSession = Depends(get_db),
+):
+    async def build() -> bytes:
+        if ids is not None:
+            # Batch lookup: offset, limit, search, cursor and include_total do not apply
+            return await _batch_get(_video_loader(db), _parse_ids(ids))
+        # Plain column rows serialized by orjson; same JSON shape as VideoResponse
+        query = select(*VIDEO_COLUMNS)
+        if search:
+            query = apply_search(query, search)
+        extra = {}
+        if include_total:
+            # From the counter tables, never a COUNT(*) over videos
+            if search:
+                extra["total"], extra["total_exact"] = await search_total(db, search)
+            else:
+                extra["total"], extra["total_exact"] = await catalog_counter(db, "videos"), True
+        if cursor is not None:
+            # Keyset mode: pass an empty cursor for the first page, then next_cursor
+            rows = (await db.execute(keyset_query(query, Video.id, cursor, limit))).all()
+            items, next_cursor = split_page(rows, limit)
+            return dump_rows(items, next_cursor=next_cursor, **extra)
+        return dump_rows((await db.execute(query.offset(offset).limit(limit))).all(), **extra)
+
+    return await response_cache.respond(request, LIST_CACHE_SCOPE, build)
+
+def _ndjson_chunk(rows) -> str:
+    keys = [column.key for column in EXPORT_COLUMNS]
+    return "".join(json.dumps(dict(zip(keys, row))) + "\n" for row in rows)
+
+
+def _csv_chunk(rows) -> str:
+    buffer = io.StringIO()
+    csv.writer(buffer).writerows(rows)
+    return buffer.getvalue()
+
+
+async def _export_rows(serialize, header: str = ""):
+    """Streams the catalog in id order, one chunk of rows at a time.
+
+    Uses its own read-only session: the request's get_db session is closed
+    before a streaming body is sent. Rows are plain tuples, never ORM objects.
+    """
+    if header:
+        yield header
+    async with AsyncReadSessionLocal() as session:
+        stmt = select(*EXPORT_COLUMNS).order_by(Video.id).execution_options(yield_per=EXPORT_CHUNK_ROWS)
+        result = await session.stream(stmt)
+        async for rows in result.partitions():
+            yield serialize(rows)
+
+
+@router.get("/export")
+async def export_videos(format: str = Query("ndjson", pattern="^(ndjson|csv)$")):
+    """Streams every video as NDJSON or CSV with constant memory use."""
+    if format == "csv":
+        header = _csv_chunk([[column.key for column in EXPORT_COLUMNS]])
+        body, media_type = _export_rows(_csv_chunk, header), "text/csv"
+    else:
+        body, media_type = _export_rows(_ndjson_chunk), "application/x-ndjson"
+    return StreamingResponse(
+        body,
+        media_type=media_type,
+        headers={"Content-Disposition": f'attachment; filename="videos.{format}"'},
     )
-    db.add(new_video)
-    db.commit()
-    db.refresh(new_video)
-    logger.info(f"Video created: {video.title}")
-    return new_video
-
-@router.get("/", response_model=List[VideoResponse])
-def get_videos(offset: int = 0, limit: int = 10, search: str = "", db: Session = Depends(get_db)):
-    query = db.query(Video)
-    if search:
-        query = query.filter(Video.title.ilike(f"%{search}%"))
-    videos = query.offset(offset).limit(limit).all()
-    return videos
+
+def _sse_event(change) -> str:
+    return f"id: {change.seq}\ndata: {format_change(change)}\n\n"
+
+async def _change_stream(start: int, reset: bool):
+    subscription = change_feed.subscribe()
+    sent = start
+    try:
+        if reset:
+            yield f'event: reset\nid: {start}\ndata: {{"last_seq":{start}}}\n\n'
+        async for change in iter_changes(sent):
+            yield _sse_event(change)
+            sent = change.seq
+        while True:
+            try:
+                change = await subscription.get(settings.change_feed_heartbeat)
+            except asyncio.TimeoutError:
+                # Keeps proxies from closing an idle connection
+                yield ": keepalive\n\n"
+                continue
+            if change is None:
+                # Dropped for falling behind, or shutting down; EventSource
+                # reconnects with Last-Event-ID and resumes from the log
+                return
+            if change.seq <= sent:
+                continue
+            if change.seq > sent + 1:
+                async for missed in iter_changes(sent, before=change.seq):
+                    yield _sse_event(missed)
+            yield _sse_event(change)
+            sent = change.seq
+    finally:
+        change_feed.unsubscribe(subscription)
+
+async def _long_poll(start: int, reset: bool, timeout: float, limit: int) -> Response:
+    rows = []
+    if not reset:
+        subscription = change_feed.subscribe()
+        try:
+            rows = await read_changes(start, limit=limit)
+            if not rows and timeout:
+                try:
+                    await subscription.get(timeout)
+                    rows = await read_changes(start, limit=limit)
+                except asyncio.TimeoutError:
+                    pass
+        finally:
+            change_feed.unsubscribe(subscription)
+    last_seq = rows[-1].seq if rows else start
+    body = f'{{"reset":{"true" if reset else "false"},"last_seq":{last_seq},"changes":[{",".join(map(format_change, rows))}]}}'
+    return Response(content=body, media_type="application/json")
+
+@router.get("/changes")
+async def get_video_changes(
+    request: Request,
+    since: Optional[int] = None,
+    timeout: float = Query(25.0, ge=0, le=60),
+    limit: int = Query(CHANGE_BATCH_SIZE, ge=1, le=CHANGE_BATCH_SIZE),
+):
+    """Catalog changes after sequence number `since` (or the Last-Event-ID header).
+
+    With `Accept: text/event-stream` this is an SSE stream, one event per
+    change with the seq as its id. Otherwise it is a long-poll: it returns as
+    soon as there are changes, or empty after `timeout` seconds, with the
+    `last_seq` to pass next time. Without `since` only new changes are sent.
+    If the log no longer holds everything after `since`, the client gets a
+    reset and should refetch the list before following the feed again.
+    """
+    last_event_id = request.headers.get("last-event-id")
+    if since is None and last_event_id:
+        try:
+            since = int(last_event_id)
+        except ValueError:
+            raise HTTPException(status_code=400, detail="Last-Event-ID must be a sequence number")
+    oldest, newest = await log_bounds()
+    head = newest or 0
+    reset = since is not None and (since > head or (oldest is not None and since < oldest - 1))
+    start = head if since is None or reset else since
+
+    if "text/event-stream" in request.headers.get("accept", ""):
+        return StreamingResponse(
+            _change_stream(start, reset),
+            media_type="text/event-stream",
+            headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"},
+        )
+    return await _long_poll(start, reset, timeout, limit)
+
+@router.get("/stats", response_model=CatalogStats)
+async def get_video_stats(request: Request, top: int = Query(10, ge=1, le=100), db: AsyncSession = Depends(get_db)):
+    """Catalog size and top uploaders, read from the trigger-maintained counters."""
+    async def build() -> bytes:
+        return orjson.dumps(await catalog_stats(db, top))
+
+    return await response_cache.respond(request, LIST_CACHE_SCOPE, build)
+
+@router.get("/suggest", response_model=VideoSuggestions)
+async def suggest_videos(q: str = Query(..., min_length=1, max_length=200), limit: int = Query(10, ge=1, le=MAX_SUGGESTIONS)):
+    """Typo-tolerant title completions for the search box, from the in-memory trigram index."""
+    if not suggest_index.running:
+        raise HTTPException(status_code=503, detail="Suggestions are not available.")
+    items = [{"id": video_id, "title": title, "score": score} for video_id, title, score in suggest_index.suggest(q, limit)]
+    return Response(orjson.dumps({"query": q, "complete": suggest_index.complete, "items": items}),
+                    media_type="application/json")
 
 @router.get("/{video_id}", response_model=VideoResponse)
-def get_video(video_id: int, db: Session = Depends(get_db)):
-    video = db.query(Video).filter(Video.id == video_id).first()
-    if not video:
-        raise HTTPException(status_code=404, detail="Video not found.")
-    return video
+async def get_video(video_id: int, request: Request, db: AsyncSession = Depends(get_db)):
+    async def build() -> bytes:
+        video = await db.get(Video, video_id)
+        if not video:
+            raise HTTPException(status_code=404, detail="Video not found.")
+        with timed_serialization():
+            return VideoResponse.model_validate(video, from_attributes=True).model_dump_json().encode()
 
-@router.put("/{video_id}", response_model=VideoResponse)
-def update_video(video_id: int, video: VideoUpdate, db: Session = Depends(get_db)):
-    db_video = db.query(Video).filter(Video.id == video_id).first()
-    if not db_video:
+    return await response_cache.respond(request, ITEM_CACHE_SCOPE, build)
+
+@router.get("/{video_id}/metadata", response_model=VideoMetadataResponse)
+async def get_video_metadata(video_id: int, db: AsyncSession = Depends(get_db)):
+    """What the background enrichment job derived from the video's youtube_url."""
+    metadata = await db.get(VideoMetadata, video_id)
+    if not metadata:
+        raise HTTPException(status_code=404, detail="Video metadata not available.")
+    return metadata
+
+async def _raise_missing_or_forbidden(db: AsyncSession, video_id: int):
+    """After a write limited to the caller's own video matched nothing: 404 or 403."""
+    await db.rollback()
+    if await db.scalar(select(Video.id).where(Video.id == video_id)) is None:
         raise HTTPException(status_code=404, detail="Video not found")
+    raise HTTPException(status_code=403, detail="You can only change your own videos")
+
+@router.put("/{video_id}", response_model=VideoResponse)
+async def update_video(
+    video_id: int,
+    video: VideoUpdate,
+    db: AsyncSession = Depends(get_db),
+    current_user: UserResponse = Depends(get_current_user),
+):
     update_data = video.dict(exclude_unset=True)
-    for key, value in update_data.items():
-        setattr(db_video, key, value)
-    db.commit()
-    db.refresh(db_video)
-    return db_video
+    if "youtube_url" in update_data:
+        update_data["youtube_id"] = parse_youtube_id(update_data["youtube_url"])
+    if update_data:
+        # One UPDATE ... RETURNING round trip; no ORM object is loaded
+        stmt = (
+            update(Video)
+            .where(Video.id == video_id, Video.uploaded_by == current_user.id)
+            .values(**update_data)
+            .returning(*Video.__table__.c)
+        )
+        try:
+            row = (await db.execute(stmt.execution_options(synchronize_session=False))).first()
+        except IntegrityError as e:
+            await db.rollback()
+            if "UNIQUE" in str(e.orig):
+                raise HTTPException(status_code=409, detail="youtube_url: another video has the same YouTube video")
+            raise
+    else:
+        row = (await db.execute(select(*Video.__table__.c).where(Video.id == video_id))).first()
+        if row is not None and row.uploaded_by != current_user.id:
+            row = None
+    if row is None:
+        await _raise_missing_or_forbidden(db, video_id)
+    if "youtube_url" in update_data:
+        # rearm: a URL changed back to an earlier value must be enriched again
+        await enqueue_enrichment(db, [(video_id, row.youtube_url)], rearm=True)
+    await db.commit()
+    job_queue.notify()
+    change_feed.notify()
+    await response_cache.invalidate(LIST_CACHE_SCOPE, ITEM_CACHE_SCOPE)
+    return row._mapping
 
 @router.delete("/{video_id}")
-def delete_video(video_id: int, db: Session = Depends(get_db)):
-    video = db.query(Video).filter(Video.id == video_id).first()
-    if not video:
-        raise HTTPException(status_code=404, detail="Video not found")
-    db.delete(video)
-    db.commit()
+async def delete_video(
+    video_id: int,
+    db: AsyncSession = Depends(get_db),
+    current_user: UserResponse = Depends(get_current_user),
+):
+    stmt = delete(Video).where(Video.id == video_id, Video.uploaded_by == current_user.id).returning(Video.id)
+    if await db.scalar(stmt.execution_options(synchronize_session=False)) is None:
+        await _raise_missing_or_forbidden(db, video_id)
+    await db.commit()
+    change_feed.notify()
+    await response_cache.invalidate(LIST_CACHE_SCOPE, ITEM_CACHE_SCOPE)
     logger.info(f"Video deleted: {video_id}")
     return {"message": "Video deleted successfully"}
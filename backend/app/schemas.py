@@ -1,5 +1,17 @@
-from pydantic import BaseModel
-from typing import Optional
+from pydantic import BaseModel, field_validator
+from typing import List, Optional
+
+def _not_null(value):
+    # Update fields may be left out, but null would clear a NOT NULL column
+    if value is None:
+        raise ValueError("may be omitted, but not null")
+    return value
+
+def _password_length(value):
+    # Same rule as POST /api/register
+    if value is not None and len(value) < 6:
+        raise ValueError("Password must be at least 6 characters long")
+    return value
 
 class UserCreate(BaseModel):
     name: str
@@ -17,10 +29,17 @@ class UserResponse(BaseModel):
     class Config:
         orm_mode = True
 
+class UserPage(BaseModel):
+    items: List[UserResponse]
+    next_cursor: Optional[str]
+
 class UserUpdate(BaseModel):
-    name: Optional[str]
-    email: Optional[str]
-    password: Optional[str]
+    name: Optional[str] = None
+    email: Optional[str] = None
+    password: Optional[str] = None
+
+    _not_null = field_validator("*")(_not_null)
+    _password_length = field_validator("password")(_password_length)
 
     class Config:
         orm_mode = True
@@ -44,10 +63,69 @@ class VideoResponse(BaseModel):
     class Config:
         orm_mode = True
 
+class VideoPage(BaseModel):
+    items: List[VideoResponse]
+    next_cursor: Optional[str] = None
+    # With include_total; total_exact is false when a search count hit its cap
+    total: Optional[int] = None
+    total_exact: Optional[bool] = None
+
+class UploaderCount(BaseModel):
+    user_id: int
+    name: str
+    video_count: int
+
+class CatalogStats(BaseModel):
+    videos: int
+    uploaders: int
+    videos_per_uploader: float
+    top_uploaders: List[UploaderCount]
+
+class VideoSuggestion(BaseModel):
+    id: int
+    title: str
+    score: float
+
+class VideoSuggestions(BaseModel):
+    query: str
+    complete: bool  # false while the index is still loading the catalog
+    items: List[VideoSuggestion]
+
+class VideoBatch(BaseModel):
+    items: List[VideoResponse]
+    missing: List[int]
+
+class VideoBatchRequest(BaseModel):
+    ids: List[int]
+
 class VideoUpdate(BaseModel):
-    title: Optional[str]
-    description: Optional[str]
-    youtube_url: Optional[str]
+    title: Optional[str] = None
+    description: Optional[str] = None
+    youtube_url: Optional[str] = None
+
+    _not_null = field_validator("*")(_not_null)
 
     class Config:
         orm_mode = True
+
+class VideoMetadataResponse(BaseModel):
+    video_id: int
+    youtube_url: str
+    youtube_id: Optional[str]
+    thumbnail_url: Optional[str]
+    title: Optional[str]
+    author_name: Optional[str]
+    duration_seconds: Optional[int]
+    fetched_at: float
+
+class BulkRowResult(BaseModel):
+    index: int
+    status: str  # "created", "skipped" or "error"
+    id: Optional[int] = None
+    errors: Optional[List[str]] = None
+
+class BulkImportResult(BaseModel):
+    created: int
+    skipped: int
+    failed: int
+    results: List[BulkRowResult]
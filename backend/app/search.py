@@ -0,0 +1,58 @@
+import re
+import time
+from sqlalchemy import Column, Integer, MetaData, String, Table, false, literal_column, text
+from app.jobs import job_queue
+from app.models import Video
+
+# The FTS5 table is created by the DDL hooks in app.models, so it lives in its
+# own MetaData and is never emitted by Base.metadata.create_all directly.
+videos_fts = Table(
+    "videos_fts",
+    MetaData(),
+    Column("rowid", Integer, primary_key=True),
+    Column("title", String),
+    Column("description", String),
+    Column("rank", String),
+)
+
+_TOKEN_RE = re.compile(r"\w+", re.UNICODE)
+
+
+def build_match_query(search: str) -> str:
+    """Turns free text into an FTS5 query where every term is prefix-matched.
+
+    Terms are quoted so user input can never be parsed as FTS5 syntax.
+    Returns an empty string when the input has no searchable terms.
+    """
+    terms = _TOKEN_RE.findall(search.lower())
+    return " ".join(f'"{term}"*' for term in terms)
+
+
+def apply_search(query, search: str):
+    """Restricts a video query to BM25-ranked full-text matches, ties broken by id."""
+    match = build_match_query(search)
+    if not match:
+        # Nothing searchable (e.g. only punctuation): match no rows
+        return query.filter(false())
+    return (
+        query.join(videos_fts, videos_fts.c.rowid == Video.id)
+        .filter(literal_column("videos_fts").op("MATCH")(match))
+        # The id tiebreak keeps offset pages stable
+        .order_by(videos_fts.c.rank, Video.id)
+    )
+
+
+OPTIMIZE_JOB = "search.optimize"
+# Bulk writes within one window share a single index optimization
+OPTIMIZE_WINDOW_SECONDS = 300
+
+
+async def enqueue_optimize(db) -> None:
+    """Schedules an FTS5 merge of the index segments left by large writes."""
+    window = int(time.time() // OPTIMIZE_WINDOW_SECONDS)
+    await job_queue.enqueue(db, OPTIMIZE_JOB, {}, key=f"{OPTIMIZE_JOB}:{window}", delay=OPTIMIZE_WINDOW_SECONDS)
+
+
+@job_queue.handler(OPTIMIZE_JOB)
+async def optimize_search_index(session, payload: dict) -> None:
+    await session.execute(text("INSERT INTO videos_fts(videos_fts) VALUES ('optimize')"))
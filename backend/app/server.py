@@ -0,0 +1,88 @@
+"""Production runner: N shared-nothing uvicorn workers that drain before shutting down.
+
+    python -m app.server --workers 4 --port 8000
+
+On SIGTERM a worker fails /readyz and keeps serving for SERVER_DRAIN_SECONDS,
+then shuts down gracefully. A second signal skips the rest of the drain.
+"""
+import argparse
+import logging
+import os
+import time
+from typing import Optional
+import uvicorn
+from uvicorn.supervisors import Multiprocess
+from app.changes import change_feed
+from app.config import settings
+from app.health import readiness
+
+logger = logging.getLogger("uvicorn.error")
+
+SERVER_WORKERS = settings.server_workers
+SERVER_DRAIN_SECONDS = settings.server_drain_seconds
+SERVER_SHUTDOWN_TIMEOUT = settings.server_shutdown_timeout
+
+
+class DrainingServer(uvicorn.Server):
+    """uvicorn server whose first exit signal starts a drain instead of a shutdown."""
+
+    def __init__(self, config: uvicorn.Config, drain_seconds: float = SERVER_DRAIN_SECONDS):
+        super().__init__(config)
+        self.drain_seconds = drain_seconds
+        self.drain_started: Optional[float] = None
+
+    def handle_exit(self, sig, frame) -> None:
+        if self.drain_started is None and self.drain_seconds > 0:
+            self.drain_started = time.monotonic()
+            readiness.draining = True
+            logger.info(f"Draining worker {os.getpid()} for {self.drain_seconds:.0f} s")
+            return
+        super().handle_exit(sig, frame)
+
+    async def on_tick(self, counter: int) -> bool:
+        if self.drain_started is not None:
+            # Streams would otherwise hold the shutdown until its timeout
+            await change_feed.stop()
+            if time.monotonic() - self.drain_started >= self.drain_seconds:
+                return True
+        return await super().on_tick(counter)
+
+
+def run(host: str, port: int, workers: int, drain_seconds: float, shutdown_timeout: float, log_level: str) -> None:
+    # Workers read their settings at import; per-worker defaults such as HASH_WORKERS follow --workers
+    os.environ["SERVER_WORKERS"] = str(workers)
+    config = uvicorn.Config(
+        "app.main:app",
+        host=host,
+        port=port,
+        workers=workers,
+        timeout_graceful_shutdown=shutdown_timeout,
+        log_level=log_level,
+    )
+    if workers > 1 and settings.response_cache_backend == "memory":
+        logger.warning(
+            "Each worker has its own in-memory response cache, so a worker may serve a list "
+            "up to RESPONSE_CACHE_TTL seconds stale after another one writes; "
+            "set RESPONSE_CACHE_BACKEND=redis to share it"
+        )
+    server = DrainingServer(config, drain_seconds)
+    if workers > 1:
+        Multiprocess(config, target=server.run, sockets=[config.bind_socket()]).run()
+    else:
+        server.run()
+
+
+def main(argv=None) -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8000)
+    parser.add_argument("--workers", type=int, default=SERVER_WORKERS)
+    parser.add_argument("--drain-seconds", type=float, default=SERVER_DRAIN_SECONDS)
+    parser.add_argument("--shutdown-timeout", type=float, default=SERVER_SHUTDOWN_TIMEOUT)
+    parser.add_argument("--log-level", default="info")
+    args = parser.parse_args(argv)
+    run(args.host, args.port, args.workers, args.drain_seconds, args.shutdown_timeout, args.log_level)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,72 @@
+from typing import Tuple
+from sqlalchemy import func, literal, literal_column, select
+from app.cache import TTLCache
+from app.config import settings
+from app.models import CatalogCounter, UploaderVideoCount, User, VideoChange
+from app.search import build_match_query, videos_fts
+
+SEARCH_COUNT_CACHE_SIZE = settings.search_count_cache_size
+SEARCH_COUNT_CACHE_TTL = settings.search_count_cache_ttl
+# Searches matching more rows than this report the cap with total_exact false
+SEARCH_COUNT_CAP = settings.search_count_cap
+
+# (match query, change log head) -> (count, exact)
+_search_counts = TTLCache(maxsize=SEARCH_COUNT_CACHE_SIZE, ttl=SEARCH_COUNT_CACHE_TTL)
+
+
+async def catalog_counter(db, name: str) -> int:
+    """A trigger-maintained catalog counter: one primary-key lookup."""
+    return await db.scalar(select(CatalogCounter.value).where(CatalogCounter.name == name)) or 0
+
+
+async def uploader_video_count(db, user_id: int) -> int:
+    return await db.scalar(
+        select(UploaderVideoCount.video_count).where(UploaderVideoCount.user_id == user_id)
+    ) or 0
+
+
+async def search_total(db, search: str) -> Tuple[int, bool]:
+    """How many videos match a search, and whether that number is exact.
+
+    Counted on the FTS index alone (no join to videos), stopping at
+    SEARCH_COUNT_CAP. Counts are cached per change log head, so paging
+    through one search counts it once and any catalog write invalidates it.
+    """
+    match = build_match_query(search)
+    if not match:
+        return 0, True
+    head = await db.scalar(select(func.max(VideoChange.seq)))
+    key = (match, head)
+    cached = _search_counts.get(key)
+    if cached is not None:
+        return cached
+    matches = (
+        select(literal(1)).select_from(videos_fts)
+        .where(literal_column("videos_fts").op("MATCH")(match))
+        .limit(SEARCH_COUNT_CAP + 1)
+        .subquery()
+    )
+    count = await db.scalar(select(func.count()).select_from(matches))
+    result = (min(count, SEARCH_COUNT_CAP), count <= SEARCH_COUNT_CAP)
+    _search_counts.set(key, result)
+    return result
+
+
+async def catalog_stats(db, top: int) -> dict:
+    """Catalog totals and the biggest uploaders, read from the counter tables only."""
+    total = await catalog_counter(db, "videos")
+    uploaders = await catalog_counter(db, "uploaders")
+    rows = await db.execute(
+        select(UploaderVideoCount.user_id, User.name, UploaderVideoCount.video_count)
+        .join(User, User.id == UploaderVideoCount.user_id)
+        .order_by(UploaderVideoCount.video_count.desc(), UploaderVideoCount.user_id)
+        .limit(top)
+    )
+    return {
+        "videos": total,
+        "uploaders": uploaders,
+        "videos_per_uploader": total / uploaders if uploaders else 0.0,
+        "top_uploaders": [
+            {"user_id": user_id, "name": name, "video_count": count} for user_id, name, count in rows
+        ],
+    }
@@ -0,0 +1,281 @@
+import asyncio
+import bisect
+import heapq
+import logging
+import re
+from array import array
+from collections import Counter
+from operator import itemgetter
+from typing import Dict, List, Optional, Tuple
+import orjson
+from sqlalchemy import select
+from app import database
+from app.changes import iter_changes, log_bounds
+from app.config import settings
+from app.models import Video
+
+logger = logging.getLogger(__name__)
+
+SUGGEST_REFRESH_INTERVAL = settings.suggest_refresh_interval
+
+# Same tokenization as the full-text search
+_TOKEN_RE = re.compile(r"\w+", re.UNICODE)
+
+LOAD_BATCH_ROWS = 5000
+MAX_EXPANSIONS = 16
+# Scores relative to an exact term match (1.0)
+PREFIX_SCORE = 0.9
+FUZZY_WEIGHT = 0.8
+FUZZY_MIN_LENGTH = 3
+FUZZY_THRESHOLD = 0.3
+FUZZY_SHORTLIST_FACTOR = 4
+PREFIX_SCAN = 2000
+# A query stops after CANDIDATE_FACTOR * limit matches or SCAN_LIMIT titles
+CANDIDATE_FACTOR = 2
+SCAN_LIMIT = 2000
+
+
+def tokenize(text: str) -> List[str]:
+    """Distinct lowercase terms, in order."""
+    return list(dict.fromkeys(_TOKEN_RE.findall(text.lower())))
+
+
+def trigrams(term: str, prefix: bool = False) -> set:
+    """Padded trigrams of a term; a prefix has no end padding, since the term goes on."""
+    padded = f"  {term}" if prefix else f"  {term} "
+    return {padded[i:i + 3] for i in range(len(padded) - 2)}
+
+
+class SuggestIndex:
+    """In-memory, typo-tolerant title completion: term -> video id and trigram -> term id postings.
+
+    Each process loads the catalog once, then follows the change log every
+    `refresh_interval`; until the load finishes `complete` is false.
+    """
+
+    def __init__(self, refresh_interval: float = SUGGEST_REFRESH_INTERVAL):
+        self.refresh_interval = refresh_interval
+        self.titles: List[Optional[str]] = []  # by video id
+        self.postings: Dict[str, array] = {}  # term -> sorted video ids
+        self.terms: List[str] = []  # by term id
+        self.sorted_terms: List[str] = []
+        self.trigrams: Dict[str, array] = {}  # trigram -> term ids
+        self.size = 0
+        self.seq = 0
+        self.complete = False
+        self._sort_pending = False
+        self._task: Optional[asyncio.Task] = None
+
+    def _title(self, video_id: int) -> Optional[str]:
+        return self.titles[video_id] if video_id < len(self.titles) else None
+
+    def _add_term(self, term: str) -> array:
+        postings = self.postings[term] = array("I")
+        term_id = len(self.terms)
+        self.terms.append(term)
+        if self._sort_pending:
+            self.sorted_terms.append(term)
+        else:
+            bisect.insort(self.sorted_terms, term)
+        for gram in trigrams(term):
+            self.trigrams.setdefault(gram, array("I")).append(term_id)
+        return postings
+
+    def _post(self, video_id: int, title: str) -> None:
+        for term in tokenize(title):
+            postings = self.postings.get(term)
+            if postings is None:
+                postings = self._add_term(term)
+            # Ids mostly arrive in order, so this is nearly always an append
+            if not postings or postings[-1] < video_id:
+                postings.append(video_id)
+            else:
+                i = bisect.bisect_left(postings, video_id)
+                if i == len(postings) or postings[i] != video_id:
+                    postings.insert(i, video_id)
+
+    def _unpost(self, video_id: int, title: str) -> None:
+        for term in tokenize(title):
+            postings = self.postings[term]
+            i = bisect.bisect_left(postings, video_id)
+            if i < len(postings) and postings[i] == video_id:
+                del postings[i]
+
+    def index(self, video_id: int, title: str) -> None:
+        """Adds or re-titles a video; applying the same change twice is harmless."""
+        old = self._title(video_id)
+        if old == title:
+            return
+        if old is None:
+            if video_id >= len(self.titles):
+                self.titles.extend([None] * (video_id + 1 - len(self.titles)))
+            self.size += 1
+        else:
+            self._unpost(video_id, old)
+        self.titles[video_id] = title
+        self._post(video_id, title)
+
+    def index_many(self, rows) -> None:
+        """index() for many (video id, title); new terms are sorted in once, at the end."""
+        self._sort_pending = True
+        try:
+            for video_id, title in rows:
+                self.index(video_id, title)
+        finally:
+            self._sort_pending = False
+            self.sorted_terms.sort()
+
+    def remove(self, video_id: int) -> None:
+        old = self._title(video_id)
+        if old is not None:
+            self._unpost(video_id, old)
+            self.titles[video_id] = None
+            self.size -= 1
+
+    def _expand(self, term: str, prefix: bool) -> Dict[str, float]:
+        """Vocabulary terms a query term may stand for, with their scores."""
+        scores = {}
+        if self.postings.get(term):
+            scores[term] = 1.0
+        if prefix:
+            start = bisect.bisect_right(self.sorted_terms, term)
+            candidates = []
+            for candidate in self.sorted_terms[start:start + PREFIX_SCAN]:
+                if not candidate.startswith(term):
+                    break
+                if self.postings[candidate]:
+                    candidates.append(candidate)
+            for candidate in heapq.nlargest(MAX_EXPANSIONS, candidates, key=lambda t: len(self.postings[t])):
+                scores[candidate] = PREFIX_SCORE
+        # Typo tolerance is for terms that match nothing as typed
+        if scores or len(term) < FUZZY_MIN_LENGTH:
+            return scores
+        grams = trigrams(term, prefix)
+        shared = Counter()
+        for gram in grams:
+            term_ids = self.trigrams.get(gram)
+            if term_ids:
+                shared.update(term_ids)
+        fuzzy = []
+        for term_id, count in heapq.nlargest(MAX_EXPANSIONS * FUZZY_SHORTLIST_FACTOR, shared.items(), key=itemgetter(1)):
+            candidate = self.terms[term_id]
+            postings = self.postings[candidate]
+            # A padded term has len + 1 trigrams; a prefix is compared only to as much as was typed
+            similarity = count / len(grams) if prefix else 2 * count / (len(grams) + len(candidate) + 1)
+            if postings and similarity >= FUZZY_THRESHOLD:
+                fuzzy.append((similarity, len(postings), candidate))
+        for similarity, _, candidate in heapq.nlargest(MAX_EXPANSIONS, fuzzy):
+            scores[candidate] = FUZZY_WEIGHT * similarity
+        return scores
+
+    def suggest(self, query: str, limit: int = 10) -> List[Tuple[int, str, float]]:
+        """Up to `limit` (video id, title, score) for what has been typed so far.
+
+        Every query term must match exactly, as a prefix (the last term) or
+        fuzzily; terms matching nothing are ignored. Ties go to the newest video.
+        """
+        words = tokenize(query)
+        if not words:
+            return []
+        prefix = bool(_TOKEN_RE.match(query[-1]))
+        expansions = [self._expand(word, prefix and i == len(words) - 1) for i, word in enumerate(words)]
+        expansions = [expansion for expansion in expansions if expansion]
+        if not expansions:
+            return []
+
+        def cost(expansion):
+            return sum(len(self.postings[term]) for term in expansion)
+
+        # The rarest term drives the scan; candidates are checked against the next rarest first
+        expansions.sort(key=cost)
+        driver = expansions[0]
+        checks = expansions[1:] + [driver]
+        wanted = limit * CANDIDATE_FACTOR
+        titles = self.titles
+        findall = _TOKEN_RE.findall
+        matches = []
+        seen = set()
+        for term, _ in sorted(driver.items(), key=lambda item: (-item[1], -len(self.postings[item[0]]))):
+            for video_id in reversed(self.postings[term]):
+                if video_id in seen:
+                    continue
+                seen.add(video_id)
+                title_terms = findall(titles[video_id].lower())
+                zeros = [0.0] * len(title_terms)
+                score = 0.0
+                for expansion in checks:
+                    best = max(map(expansion.get, title_terms, zeros), default=0.0)
+                    if not best:
+                        break
+                    score += best
+                else:
+                    matches.append((score, video_id))
+                if len(matches) >= wanted or len(seen) >= SCAN_LIMIT:
+                    break
+            if len(matches) >= wanted or len(seen) >= SCAN_LIMIT:
+                break
+        return [
+            (video_id, self.titles[video_id], round(score / len(words), 3))
+            for score, video_id in heapq.nlargest(limit, matches)
+        ]
+
+    async def load(self) -> None:
+        """Indexes every title, a batch at a time, then marks the index complete."""
+        # refresh() replays changes from here on; replaying a loaded one is harmless
+        self.seq = (await log_bounds())[1] or 0
+        after = 0
+        while True:
+            async with database.AsyncReadSessionLocal() as session:
+                rows = (await session.execute(
+                    select(Video.id, Video.title).where(Video.id > after).order_by(Video.id).limit(LOAD_BATCH_ROWS)
+                )).all()
+            self.index_many(rows)
+            if len(rows) < LOAD_BATCH_ROWS:
+                break
+            after = rows[-1].id
+        self.complete = True
+
+    async def refresh(self) -> None:
+        """Applies the change log past the last seq seen."""
+        async for change in iter_changes(self.seq):
+            if change.op == "delete":
+                self.remove(change.video_id)
+            else:
+                self.index(change.video_id, orjson.loads(change.data)["title"])
+            self.seq = change.seq
+
+    async def _run(self) -> None:
+        while True:
+            try:
+                if not self.complete:
+                    await self.load()
+                await self.refresh()
+            except Exception:
+                logger.exception("Suggest index refresh failed")
+            await asyncio.sleep(self.refresh_interval)
+
+    @property
+    def running(self) -> bool:
+        return self._task is not None and not self._task.done()
+
+    def start(self) -> None:
+        if not self.running:
+            self._task = asyncio.create_task(self._run())
+
+    async def stop(self) -> None:
+        if self._task is not None:
+            self._task.cancel()
+            await asyncio.gather(self._task, return_exceptions=True)
+            self._task = None
+
+    def stats(self) -> dict:
+        return {
+            "videos": self.size,
+            "terms": len(self.terms),
+            "postings": sum(len(postings) for postings in self.postings.values()),
+            "complete": self.complete,
+            "seq": self.seq,
+        }
+
+
+suggest_index = SuggestIndex()
@@ -0,0 +1,168 @@
+import asyncio
+import re
+import time
+from abc import ABC, abstractmethod
+from typing import Iterable, Optional, Tuple
+from urllib.parse import parse_qs, urlparse
+import httpx
+from sqlalchemy import literal, select
+from sqlalchemy.dialects.sqlite import insert as sqlite_insert
+from app.config import settings
+from app.jobs import job_queue
+from app.models import Video, VideoMetadata
+
+YOUTUBE_ENRICHER = settings.youtube_enricher
+YOUTUBE_FETCH_TIMEOUT = settings.youtube_fetch_timeout
+
+ENRICH_JOB = "video.enrich"
+
+_YOUTUBE_ID_RE = re.compile(r"^[A-Za-z0-9_-]{11}$")
+_YOUTUBE_HOSTS = {
+    "youtube.com", "www.youtube.com", "m.youtube.com", "music.youtube.com",
+    "youtube-nocookie.com", "www.youtube-nocookie.com",
+}
+# Path prefixes followed by the video id, e.g. /embed/<id>
+_ID_PATH_PREFIXES = {"embed", "shorts", "v", "e", "live"}
+
+
+def parse_youtube_id(url: str) -> Optional[str]:
+    """Returns the 11-character video id of a YouTube URL, or None if there is none."""
+    url = url.strip()
+    parsed = urlparse(url if "//" in url else f"https://{url}")
+    host = (parsed.hostname or "").lower()
+    candidate = None
+    if host in ("youtu.be", "www.youtu.be"):
+        candidate = parsed.path.lstrip("/").split("/")[0]
+    elif host in _YOUTUBE_HOSTS:
+        parts = parsed.path.strip("/").split("/")
+        if parts[0] == "watch":
+            candidate = parse_qs(parsed.query).get("v", [None])[0]
+        elif len(parts) >= 2 and parts[0] in _ID_PATH_PREFIXES:
+            candidate = parts[1]
+    if candidate and _YOUTUBE_ID_RE.match(candidate):
+        return candidate
+    return None
+
+
+def thumbnail_url(youtube_id: str, quality: str = "hqdefault") -> str:
+    return f"https://i.ytimg.com/vi/{youtube_id}/{quality}.jpg"
+
+
+class MetadataEnricher(ABC):
+    """Looks up what can only be learned over the network about a video.
+
+    `fetch` returns any of title, author_name, thumbnail_url and
+    duration_seconds; missing keys are left empty. Raising makes the job retry.
+    """
+
+    @abstractmethod
+    async def fetch(self, youtube_id: str) -> dict:
+        ...
+
+    async def close(self) -> None:
+        pass
+
+
+class OEmbedEnricher(MetadataEnricher):
+    """YouTube's public oEmbed endpoint: title, channel and thumbnail, no API key.
+
+    oEmbed does not report duration.
+    """
+
+    OEMBED_URL = "https://www.youtube.com/oembed"
+
+    def __init__(self, timeout: float = YOUTUBE_FETCH_TIMEOUT):
+        self.timeout = timeout
+        self._client: Optional[httpx.AsyncClient] = None
+
+    async def fetch(self, youtube_id: str) -> dict:
+        if self._client is None:
+            self._client = httpx.AsyncClient(timeout=self.timeout)
+        response = await self._client.get(
+            self.OEMBED_URL,
+            params={"url": f"https://www.youtube.com/watch?v={youtube_id}", "format": "json"},
+        )
+        if response.status_code in (400, 401, 403, 404):
+            # Private, removed or malformed: retrying will not help
+            return {}
+        response.raise_for_status()
+        data = response.json()
+        return {key: data.get(key) for key in ("title", "author_name", "thumbnail_url")}
+
+    async def close(self) -> None:
+        if self._client is not None:
+            await self._client.aclose()
+            self._client = None
+
+
+class StubEnricher(MetadataEnricher):
+    """Offline stand-in for tests, benchmarks and air-gapped setups.
+
+    Simulates `delay` seconds of network latency and fails the first
+    `fail_times` calls, so retries can be exercised.
+    """
+
+    def __init__(self, delay: float = 0.0, fail_times: int = 0):
+        self.delay = delay
+        self.fail_times = fail_times
+        self.calls = 0
+
+    async def fetch(self, youtube_id: str) -> dict:
+        self.calls += 1
+        call = self.calls
+        if self.delay:
+            await asyncio.sleep(self.delay)
+        if call <= self.fail_times:
+            raise ConnectionError("stub enricher failure")
+        return {"title": f"YouTube video {youtube_id}", "author_name": "stub", "duration_seconds": 0}
+
+
+ENRICHERS = {"oembed": OEmbedEnricher, "stub": StubEnricher}
+
+# Replace to swap the network step, e.g. `app.youtube.metadata_enricher = StubEnricher()`
+metadata_enricher: MetadataEnricher = ENRICHERS[YOUTUBE_ENRICHER]()
+
+
+async def enqueue_enrichment(db, videos: Iterable[Tuple[int, str]], rearm: bool = False) -> None:
+    """Schedules metadata enrichment for (video id, youtube_url) pairs in the caller's transaction."""
+    await job_queue.enqueue_many(
+        db,
+        ENRICH_JOB,
+        [(f"{ENRICH_JOB}:{video_id}:{url}", {"video_id": video_id, "youtube_url": url}) for video_id, url in videos],
+        rearm=rearm,
+    )
+
+
+@job_queue.handler(ENRICH_JOB)
+async def enrich_video(session, payload: dict) -> None:
+    video_id, url = payload["video_id"], payload["youtube_url"]
+    current_url = await session.scalar(select(Video.youtube_url).where(Video.id == video_id))
+    if current_url != url:
+        # Deleted, or its URL changed and a newer job covers it
+        return
+
+    values = {
+        "video_id": video_id,
+        "youtube_url": url,
+        "youtube_id": parse_youtube_id(url),
+        "thumbnail_url": None,
+        "title": None,
+        "author_name": None,
+        "duration_seconds": None,
+    }
+    if values["youtube_id"]:
+        values["thumbnail_url"] = thumbnail_url(values["youtube_id"])
+        fetched = await metadata_enricher.fetch(values["youtube_id"])
+        values.update({key: value for key, value in fetched.items() if key in values and value is not None})
+    values["fetched_at"] = time.time()
+
+    # INSERT ... SELECT so nothing is written if the video went away during the fetch
+    stmt = sqlite_insert(VideoMetadata.__table__).from_select(
+        list(values),
+        select(*(literal(value) for value in values.values())).where(Video.id == video_id, Video.youtube_url == url),
+    )
+    stmt = stmt.on_conflict_do_update(
+        index_elements=["video_id"],
+        set_={key: stmt.excluded[key] for key in values if key != "video_id"},
+    )
+    await session.execute(stmt)
@@ -0,0 +1,113 @@
+"""Load test for the async AsyncSession handlers under uvicorn.
+
+Starts the app against a seeded SQLite file and drives GET requests at a
+fixed concurrency, then reports requests/sec and latency percentiles. The
+sync baseline this was written against (the legacy `main:app` with its own
+Session handlers) has since been folded into `app.main`; check out an
+earlier revision to rerun that comparison.
+
+Run from the backend directory:
+
+    python -m benchmarks.bench_async --concurrency 200 --duration 10
+"""
+import argparse
+import asyncio
+import os
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+
+import httpx
+from sqlalchemy import create_engine
+from sqlalchemy.orm import sessionmaker
+
+from app.models import Base
+from benchmarks.seed import seed_catalog
+
+BACKEND_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+TARGETS = {
+    "async": ("app.main:app", "/videos/"),
+}
+
+
+async def drive(url: str, concurrency: int, duration: float) -> dict:
+    latencies = []
+    errors = 0
+    limits = httpx.Limits(max_connections=concurrency, max_keepalive_connections=concurrency)
+    async with httpx.AsyncClient(limits=limits, timeout=30) as client:
+        deadline = time.perf_counter() + duration
+
+        async def worker():
+            nonlocal errors
+            while time.perf_counter() < deadline:
+                start = time.perf_counter()
+                try:
+                    response = await client.get(url, params={"limit": 20})
+                    if response.status_code != 200:
+                        errors += 1
+                except httpx.HTTPError:
+                    errors += 1
+                latencies.append((time.perf_counter() - start) * 1000)
+
+        started = time.perf_counter()
+        await asyncio.gather(*(worker() for _ in range(concurrency)))
+        elapsed = time.perf_counter() - started
+
+    quantiles = statistics.quantiles(latencies, n=100)
+    return {
+        "requests": len(latencies),
+        "errors": errors,
+        "rps": len(latencies) / elapsed,
+        "p50_ms": quantiles[49],
+        "p99_ms": quantiles[98],
+    }
+
+
+def wait_until_up(url: str, timeout: float = 20) -> None:
+    deadline = time.time() + timeout
+    while time.time() < deadline:
+        try:
+            httpx.get(url, timeout=1)
+            return
+        except httpx.HTTPError:
+            time.sleep(0.2)
+    raise RuntimeError(f"server at {url} did not start")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--concurrency", type=int, default=200)
+    parser.add_argument("--duration", type=float, default=10)
+    parser.add_argument("--rows", type=int, default=10_000)
+    parser.add_argument("--port", type=int, default=8765)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        database_url = f"sqlite:///{os.path.join(tmp, 'bench.db')}"
+        engine = create_engine(database_url)
+        Base.metadata.create_all(bind=engine)
+        with sessionmaker(bind=engine)() as session:
+            seed_catalog(session, args.rows)
+        engine.dispose()
+
+        env = dict(os.environ, PYTHONPATH=BACKEND_DIR, DATABASE_URL=database_url)
+        for name, (app, path) in TARGETS.items():
+            server = subprocess.Popen(
+                [sys.executable, "-m", "uvicorn", app, "--port", str(args.port), "--log-level", "warning"],
+                cwd=BACKEND_DIR, env=env,
+            )
+            try:
+                url = f"http://127.0.0.1:{args.port}{path}"
+                wait_until_up(url)
+                result = asyncio.run(drive(url, args.concurrency, args.duration))
+            finally:
+                server.terminate()
+                server.wait()
+            print(f"{name:>6}: {result['rps']:8.1f} req/s  p50 {result['p50_ms']:7.1f} ms  "
+                  f"p99 {result['p99_ms']:7.1f} ms  errors {result['errors']}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,95 @@
+"""Rendering a playlist: one GET /videos/{id} per item vs. one batch lookup.
+
+Each iteration picks `--playlist` random ids from a seeded catalog (so the
+response cache rarely helps), plus a few ids that do not exist, and fetches
+them as N sequential GETs, N concurrent GETs, one GET /videos?ids=... and one
+POST /videos/batch-get, all in-process over ASGI. Reports playlists/s and the
+SQL statements per playlist.
+
+Run from the backend directory:
+
+    python -m benchmarks.bench_batch --videos 20000 --playlist 50 --iterations 200
+"""
+import argparse
+import asyncio
+import os
+import random
+import sys
+import tempfile
+import time
+
+import httpx
+
+from benchmarks.suite import seed_database
+
+
+async def run(args) -> None:
+    from sqlalchemy import event
+
+    from app.database import async_engine, async_read_engine, dispose_engines
+    from app.hashing import hashing_executor
+    from app.main import app
+
+    statements = 0
+
+    def count(*_):
+        nonlocal statements
+        statements += 1
+
+    for db_engine in (async_engine, async_read_engine):
+        if db_engine is not None:
+            event.listen(db_engine.sync_engine, "before_cursor_execute", count)
+
+    async def sequential(client, ids):
+        for video_id in ids:
+            await client.get(f"/videos/{video_id}")
+
+    async def concurrent(client, ids):
+        await asyncio.gather(*(client.get(f"/videos/{video_id}") for video_id in ids))
+
+    async def batch_get(client, ids):
+        body = (await client.get("/videos/", params={"ids": ",".join(map(str, ids))})).json()
+        assert len(body["items"]) + len(body["missing"]) == len(ids)
+
+    async def batch_post(client, ids):
+        body = (await client.post("/videos/batch-get", json={"ids": ids})).json()
+        assert [item["id"] for item in body["items"]] == [i for i in ids if i <= args.videos]
+
+    transport = httpx.ASGITransport(app=app)
+    async with httpx.AsyncClient(transport=transport, base_url="http://bench", timeout=60) as client:
+        for name, fetch in (("per-item sequential", sequential), ("per-item concurrent", concurrent),
+                            ("GET ?ids=", batch_get), ("POST batch-get", batch_post)):
+            rng = random.Random(42)
+            statements = 0
+            start = time.perf_counter()
+            for _ in range(args.iterations):
+                ids = rng.sample(range(1, args.videos + 1), args.playlist - 2)
+                ids += [args.videos + 1 + rng.randrange(1000) for _ in range(2)]  # missing ids
+                await fetch(client, ids)
+            elapsed = time.perf_counter() - start
+            print(f"{name:>20}: {args.iterations / elapsed:8.1f} playlists/s  "
+                  f"{elapsed / args.iterations * 1000:7.2f} ms/playlist  "
+                  f"{statements / args.iterations:6.1f} statements/playlist")
+
+    hashing_executor.shutdown()
+    await dispose_engines()
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--videos", type=int, default=20_000)
+    parser.add_argument("--playlist", type=int, default=50)
+    parser.add_argument("--iterations", type=int, default=200)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        database_url = f"sqlite:///{os.path.join(tmp, 'batch.db')}"
+        # Read at import by app.config
+        os.environ.update(DATABASE_URL=database_url, METRICS_ENABLED="0")
+        seed_database(database_url, 10, args.videos)
+        asyncio.run(run(args))
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
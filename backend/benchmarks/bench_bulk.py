@@ -0,0 +1,77 @@
+"""Import throughput: looping POST /videos/ vs. one POST /videos/bulk.
+
+Drives the app in-process over ASGI against a scratch database. Auth is
+overridden so the numbers only reflect the write path.
+
+Run from the backend directory:
+
+    python -m benchmarks.bench_bulk --single 1000 --bulk 50000
+"""
+import argparse
+import asyncio
+import json
+import os
+import tempfile
+import time
+
+import httpx
+
+def video(i: int, prefix: str) -> dict:
+    return {
+        "title": f"Lecture {i}",
+        "description": "Imported curriculum video",
+        "youtube_url": f"https://youtu.be/{prefix}{i:09d}",
+        "uploaded_by": 1,
+    }
+
+
+async def run(single: int, bulk: int) -> dict:
+    from app.auth import get_current_user
+    from app.database import dispose_engines, engine
+    from app.main import app
+    from app.models import Base, User
+    from app.schemas import UserResponse
+
+    Base.metadata.create_all(bind=engine)
+    # The uploader every video points at (uploaded_by is a foreign key)
+    with engine.begin() as connection:
+        connection.execute(User.__table__.insert().values(id=1, name="Bench", email="bench@example.com", password="x"))
+    app.dependency_overrides[get_current_user] = lambda: UserResponse(id=1, name="Bench", email="bench@example.com")
+    transport = httpx.ASGITransport(app=app)
+    async with httpx.AsyncClient(transport=transport, base_url="http://bench", timeout=None) as client:
+        start = time.perf_counter()
+        for i in range(single):
+            response = await client.post("/videos/", json=video(i, "s"))
+            response.raise_for_status()
+        single_rate = single / (time.perf_counter() - start)
+
+        body = b"\n".join(json.dumps(video(i, "b")).encode() for i in range(bulk))
+        start = time.perf_counter()
+        response = await client.post(
+            "/videos/bulk", content=body, headers={"content-type": "application/x-ndjson"},
+        )
+        response.raise_for_status()
+        bulk_rate = bulk / (time.perf_counter() - start)
+        assert response.json()["created"] == bulk
+    await dispose_engines()
+    return {"single_rows_per_s": single_rate, "bulk_rows_per_s": bulk_rate}
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--single", type=int, default=1000)
+    parser.add_argument("--bulk", type=int, default=50_000)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        # Point the app at a scratch database before it is imported
+        os.environ["DATABASE_URL"] = f"sqlite:///{os.path.join(tmp, 'bench.db')}"
+        result = asyncio.run(run(args.single, args.bulk))
+
+    print(f"single create: {result['single_rows_per_s']:10.1f} rows/s")
+    print(f"bulk import:   {result['bulk_rows_per_s']:10.1f} rows/s")
+    print(f"speedup:       {result['bulk_rows_per_s'] / result['single_rows_per_s']:10.1f}x")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,155 @@
+"""Deleting a user who owns 100k videos: ORM orphan cascade vs. ON DELETE CASCADE.
+
+Seeds two users with `--videos` videos each, then deletes user 1 on a fresh
+copy of the database per variant, each in its own process so peak memory
+(max RSS) is comparable:
+
+- orm-loaded: the old path; `session.delete(user)` after loading
+  `user.videos`, so the ORM deletes every video row by primary key
+- orm-passive: `session.delete(user)` on the passive_deletes relationship;
+  nothing is loaded and the database cascades
+- sql-cascade: a bare `DELETE FROM users`, cascaded by the foreign key
+- api: DELETE /users/1 over ASGI as user 1, i.e. the set-based delete plus cache
+  invalidation
+
+Every variant must leave user 2's videos, the counters, the search index
+and the change log consistent, or the run fails.
+
+Run from the backend directory:
+
+    python -m benchmarks.bench_cascade --videos 100000
+"""
+import argparse
+import asyncio
+import json
+import os
+import resource
+import shutil
+import subprocess
+import sys
+import tempfile
+import time
+
+from benchmarks.suite import seed_database
+
+VARIANTS = ("orm-loaded", "orm-passive", "sql-cascade", "api")
+
+
+def count_statements(engine) -> list:
+    from sqlalchemy import event
+
+    counter = [0]
+
+    def count(conn, cursor, statement, parameters, context, executemany):
+        counter[0] += len(parameters) if executemany else 1
+
+    event.listen(engine, "before_cursor_execute", count)
+    return counter
+
+
+def run_sync(variant: str) -> dict:
+    from sqlalchemy import delete
+
+    from app.database import SessionLocal, engine
+    from app.models import User
+
+    statements = count_statements(engine)
+    start = time.perf_counter()
+    with SessionLocal() as session:
+        if variant == "sql-cascade":
+            session.execute(delete(User).where(User.id == 1))
+        else:
+            user = session.get(User, 1)
+            if variant == "orm-loaded":
+                len(user.videos)
+            session.delete(user)
+        session.commit()
+    return {"seconds": time.perf_counter() - start, "statements": statements[0]}
+
+
+async def run_api() -> dict:
+    import httpx
+
+    from app.auth import create_access_token
+    from app.database import async_engine, dispose_engines
+    from app.hashing import hashing_executor
+    from app.main import app
+    from benchmarks.seed import user_email
+
+    headers = {"Authorization": f"Bearer {create_access_token({'sub': user_email(1)})}"}
+    statements = count_statements(async_engine.sync_engine)
+    async with httpx.AsyncClient(transport=httpx.ASGITransport(app=app), base_url="http://bench") as client:
+        start = time.perf_counter()
+        (await client.delete("/users/1", headers=headers)).raise_for_status()
+        seconds = time.perf_counter() - start
+    hashing_executor.shutdown()
+    await dispose_engines()
+    return {"seconds": seconds, "statements": statements[0]}
+
+
+def check(database_url: str, videos: int) -> list:
+    """Ways the database disagrees with "user 1 and only their videos are gone"."""
+    from sqlalchemy import create_engine, text
+
+    engine = create_engine(database_url)
+    with engine.connect() as conn:
+        scalar = lambda sql: conn.execute(text(sql)).scalar()
+        problems = []
+        if scalar("SELECT count(*) FROM users WHERE id = 1"):
+            problems.append("user still exists")
+        if scalar("SELECT count(*) FROM videos WHERE uploaded_by = 1"):
+            problems.append("videos left behind")
+        if scalar("SELECT count(*) FROM videos") != videos:
+            problems.append("other users' videos deleted")
+        if scalar("SELECT value FROM catalog_counters WHERE name = 'videos'") != videos:
+            problems.append("videos counter off")
+        if scalar("SELECT count(*) FROM uploader_video_counts WHERE user_id = 1"):
+            problems.append("uploader count left behind")
+        if scalar("SELECT count(*) FROM videos_fts") != videos:
+            problems.append("search index out of step")
+        if scalar("SELECT count(*) FROM video_changes WHERE op = 'delete'") != videos:
+            problems.append("change log missing deletes")
+    engine.dispose()
+    return problems
+
+
+def child(variant: str, videos: int) -> None:
+    result = asyncio.run(run_api()) if variant == "api" else run_sync(variant)
+    # ru_maxrss is in KiB on Linux
+    result["max_rss_mb"] = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024
+    result["problems"] = check(os.environ["DATABASE_URL"], videos)
+    print(json.dumps(result))
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--videos", type=int, default=100_000)
+    parser.add_argument("--variant", choices=VARIANTS, help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.variant:
+        child(args.variant, args.videos)
+        return 0
+
+    ok = True
+    with tempfile.TemporaryDirectory() as tmp:
+        seeded = os.path.join(tmp, "seeded.db")
+        # Round-robin over two users: each owns --videos videos
+        seed_database(f"sqlite:///{seeded}", 2, 2 * args.videos)
+        for variant in VARIANTS:
+            path = os.path.join(tmp, f"{variant}.db")
+            shutil.copy(seeded, path)
+            env = dict(os.environ, DATABASE_URL=f"sqlite:///{path}", METRICS_ENABLED="0", JOBS_ENABLED="0")
+            output = subprocess.run(
+                [sys.executable, "-m", "benchmarks.bench_cascade", "--videos", str(args.videos), "--variant", variant],
+                env=env, capture_output=True, text=True, check=True,
+            ).stdout
+            result = json.loads(output.strip().splitlines()[-1])
+            ok = ok and not result["problems"]
+            print(f"{variant:>12}: {result['seconds']:7.2f} s  {result['statements']:>7} statements  "
+                  f"max RSS {result['max_rss_mb']:6.0f} MB  {', '.join(result['problems']) or 'consistent'}")
+    return 0 if ok else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,161 @@
+"""Keeping N open tabs up to date: re-polling GET /videos/ vs. the /videos/changes SSE feed.
+
+Starts uvicorn on a seeded scratch database. A writer creates a video every
+`--write-interval` seconds while N clients either re-poll the first list
+page every `--poll-interval` seconds or hold an SSE connection to
+/videos/changes. Reports the server's CPU use and request rate for both,
+and for SSE the delay from starting the write to each subscriber receiving
+it. Afterwards a long-poll resumed from the starting seq must return every
+write, and every subscriber must have seen every write, or the run fails.
+
+Linux only (server CPU is read from /proc). Run from the backend directory:
+
+    python -m benchmarks.bench_changes --clients 200 --duration 10
+"""
+import argparse
+import asyncio
+import json
+import os
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+
+import httpx
+
+from benchmarks.suite import BACKEND_DIR, PASSWORD, seed_database
+
+
+def cpu_seconds(pid: int) -> float:
+    with open(f"/proc/{pid}/stat") as f:
+        fields = f.read().rsplit(")", 1)[1].split()
+    # utime and stime, fields 14 and 15 of stat(5)
+    return (int(fields[11]) + int(fields[12])) / os.sysconf("SC_CLK_TCK")
+
+
+async def writer(client, headers, args, started: dict, stop: asyncio.Event) -> None:
+    n = 0
+    while not stop.is_set():
+        title = f"Change feed video {n}"
+        started[title] = time.perf_counter()
+        response = await client.post("/videos/", headers=headers, json={
+            "title": title, "description": "bench_changes",
+            "youtube_url": f"https://youtu.be/chg{args.run}{n:05d}", "uploaded_by": 1,
+        })
+        response.raise_for_status()
+        n += 1
+        try:
+            await asyncio.wait_for(stop.wait(), args.write_interval)
+        except asyncio.TimeoutError:
+            pass
+
+
+async def poller(client, args, counts: list) -> None:
+    while True:
+        await client.get("/videos/", params={"limit": 20})
+        counts[0] += 1
+        await asyncio.sleep(args.poll_interval)
+
+
+async def subscriber(client, started: dict, delays: list, seen: list, ready: asyncio.Event) -> None:
+    async with client.stream("GET", "/videos/changes", headers={"Accept": "text/event-stream"}) as response:
+        ready.set()
+        async for line in response.aiter_lines():
+            if line.startswith("data: "):
+                change = json.loads(line[6:])
+                title = (change["video"] or {}).get("title")
+                if title in started:
+                    delays.append(time.perf_counter() - started[title])
+                    seen[0] += 1
+
+
+async def run_mode(mode: str, base_url: str, server_pid: int, args) -> dict:
+    limits = httpx.Limits(max_connections=args.clients + 10, max_keepalive_connections=args.clients + 10)
+    async with httpx.AsyncClient(base_url=base_url, limits=limits, timeout=None) as client:
+        from benchmarks.seed import user_email
+
+        login = await client.post("/api/login", json={"email": user_email(1), "password": PASSWORD})
+        headers = {"Authorization": f"Bearer {login.json()['access_token']}"}
+        head = (await client.get("/videos/changes", params={"timeout": 0})).json()["last_seq"]
+
+        started, delays, poll_counts = {}, [], [0]
+        per_client_seen = []
+        tasks = []
+        if mode == "sse":
+            for _ in range(args.clients):
+                ready, seen = asyncio.Event(), [0]
+                per_client_seen.append(seen)
+                tasks.append(asyncio.create_task(subscriber(client, started, delays, seen, ready)))
+                await ready.wait()
+        else:
+            tasks = [asyncio.create_task(poller(client, args, poll_counts)) for _ in range(args.clients)]
+
+        stop = asyncio.Event()
+        cpu_start, wall_start = cpu_seconds(server_pid), time.perf_counter()
+        write_task = asyncio.create_task(writer(client, headers, args, started, stop))
+        await asyncio.sleep(args.duration)
+        stop.set()
+        await write_task
+        await asyncio.sleep(1.0)  # let the last events arrive
+        wall = time.perf_counter() - wall_start
+        cpu = cpu_seconds(server_pid) - cpu_start
+        for task in tasks:
+            task.cancel()
+        await asyncio.gather(*tasks, return_exceptions=True)
+
+        result = {"server_cpu": cpu / wall, "writes": len(started), "requests_per_s": poll_counts[0] / wall}
+        if mode == "sse":
+            delays.sort()
+            result["p50_ms"] = statistics.median(delays) * 1000 if delays else float("nan")
+            result["p99_ms"] = delays[int(len(delays) * 0.99) - 1] * 1000 if delays else float("nan")
+            result["min_seen"] = min(seen[0] for seen in per_client_seen)
+            resumed = (await client.get("/videos/changes", params={"since": head, "timeout": 0})).json()
+            result["resumed"] = sum(1 for change in resumed["changes"] if change["video"]["title"] in started)
+        return result
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--clients", type=int, default=200)
+    parser.add_argument("--duration", type=float, default=10.0)
+    parser.add_argument("--poll-interval", type=float, default=1.0)
+    parser.add_argument("--write-interval", type=float, default=0.5)
+    parser.add_argument("--port", type=int, default=8768)
+    args = parser.parse_args()
+
+    ok = True
+    with tempfile.TemporaryDirectory() as tmp:
+        database_url = f"sqlite:///{os.path.join(tmp, 'changes.db')}"
+        seed_database(database_url, 10, 5000)
+        server = subprocess.Popen(
+            [sys.executable, "-m", "uvicorn", "app.main:app", "--port", str(args.port), "--log-level", "warning"],
+            cwd=BACKEND_DIR, env=dict(os.environ, DATABASE_URL=database_url, RATE_LIMIT_ENABLED="0", YOUTUBE_ENRICHER="stub"),
+        )
+        base_url = f"http://127.0.0.1:{args.port}"
+        try:
+            while True:
+                try:
+                    httpx.get(base_url + "/", timeout=1)
+                    break
+                except httpx.HTTPError:
+                    time.sleep(0.1)
+            for run, mode in enumerate(("poll", "sse")):
+                args.run = run
+                result = asyncio.run(run_mode(mode, base_url, server.pid, args))
+                line = f"{mode:>4}: server CPU {result['server_cpu'] * 100:5.1f}%  writes {result['writes']}"
+                if mode == "poll":
+                    line += f"  list requests {result['requests_per_s']:.0f}/s"
+                else:
+                    line += (f"  delivery p50 {result['p50_ms']:.1f} ms p99 {result['p99_ms']:.1f} ms  "
+                             f"fewest seen by a client {result['min_seen']}  resumed long-poll {result['resumed']}")
+                    ok = result["min_seen"] == result["writes"] == result["resumed"]
+                print(line)
+        finally:
+            server.terminate()
+            server.wait()
+    return 0 if ok else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,157 @@
+"""Totals and catalog stats: trigger-maintained counters vs. COUNT(*) and GROUP BY scans.
+
+Seeds a catalog, then times each total the API reports both ways: the
+catalog size, one uploader's video count, a search's match count (from the
+cache and freshly capped) and the /videos/stats summary. Also times list
+pages over ASGI with and without include_total (random offsets, so the
+response cache does not answer).
+Finally it creates, deletes and reassigns random videos through the API and
+fails unless the counters still equal a full recount.
+
+Run from the backend directory:
+
+    python -m benchmarks.bench_counts --videos 200000 --users 2000
+"""
+import argparse
+import asyncio
+import os
+import random
+import statistics
+import sys
+import tempfile
+import time
+
+import httpx
+
+from benchmarks.suite import seed_database
+
+
+async def timed(fn, repeat: int) -> float:
+    """Median milliseconds of `repeat` calls."""
+    samples = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        await fn()
+        samples.append(time.perf_counter() - start)
+    return statistics.median(samples) * 1000
+
+
+async def run(args) -> bool:
+    from sqlalchemy import func, select, text
+
+    from app import stats
+    from app.auth import create_access_token
+    from app.database import AsyncSessionLocal, dispose_engines
+    from app.hashing import hashing_executor
+    from app.main import app
+    from app.models import User, Video
+    from benchmarks.seed import user_email
+
+    user_id = 1 + args.users // 2
+    search = "python tutorial"
+    async with AsyncSessionLocal() as db:
+        naive_search = text(
+            "SELECT count(*) FROM videos JOIN videos_fts ON videos_fts.rowid = videos.id "
+            "WHERE videos_fts MATCH :q"
+        )
+        match = stats.build_match_query(search)
+        pairs = (
+            ("catalog size",
+             lambda: db.scalar(select(func.count()).select_from(Video)),
+             lambda: stats.catalog_counter(db, "videos")),
+            ("uploader count",
+             lambda: db.scalar(select(func.count()).where(Video.uploaded_by == user_id)),
+             lambda: stats.uploader_video_count(db, user_id)),
+            ("search count",
+             lambda: db.scalar(naive_search, {"q": match}),
+             lambda: stats.search_total(db, search)),
+            ("search, uncached",
+             lambda: db.scalar(naive_search, {"q": match}),
+             lambda: (stats._search_counts.clear(), stats.search_total(db, search))[1]),
+            ("stats (top 10)",
+             lambda: db.execute(
+                 select(Video.uploaded_by, User.name, func.count()).join(User, User.id == Video.uploaded_by)
+                 .group_by(Video.uploaded_by).order_by(func.count().desc()).limit(10)
+             ),
+             lambda: stats.catalog_stats(db, 10)),
+        )
+        for name, naive, counter in pairs:
+            naive_ms = await timed(naive, args.repeat)
+            counter_ms = await timed(counter, args.repeat)
+            print(f"{name:>16}: scan {naive_ms:8.2f} ms  counters {counter_ms:7.3f} ms  "
+                  f"({naive_ms / counter_ms:,.0f}x)")
+        exact_search = await db.scalar(naive_search, {"q": match})
+        counted, exact = await stats.search_total(db, search)
+        print(f"{'':>16}  search matches {exact_search}, reported {counted} (exact={exact})")
+        ok = counted == min(exact_search, stats.SEARCH_COUNT_CAP) and exact == (exact_search <= stats.SEARCH_COUNT_CAP)
+
+    transport = httpx.ASGITransport(app=app)
+    async with httpx.AsyncClient(transport=transport, base_url="http://bench", timeout=60) as client:
+        rng = random.Random(7)
+        for params in ({}, {"search": search}):
+            for include_total in (False, True):
+                async def page():
+                    query = dict(params, offset=rng.randrange(1000), limit=20)
+                    if include_total:
+                        query["include_total"] = "true"
+                    (await client.get("/videos/", params=query)).raise_for_status()
+                label = f"list{' search' if params else ''}{' +total' if include_total else ''}"
+                print(f"{label:>16}: {await timed(page, args.repeat):8.2f} ms/page")
+
+        def headers(user_id: int) -> dict:
+            # Videos are written by their uploader; a token skips a bcrypt login per user
+            return {"Authorization": f"Bearer {create_access_token({'sub': user_email(user_id)})}"}
+
+        created = []
+        for n in range(args.writes):
+            uploader = rng.randint(1, args.users)
+            response = await client.post("/videos/", headers=headers(uploader), json={
+                "title": f"Counted video {n}", "description": "bench_counts",
+                "youtube_url": f"https://youtu.be/cnt{n:08d}", "uploaded_by": uploader,
+            })
+            created.append((response.json()["id"], uploader))
+        for video_id, uploader in rng.sample(created, args.writes // 2):
+            await client.delete(f"/videos/{video_id}", headers=headers(uploader))
+        # Reassign a few seeded videos straight in SQL; the API keeps uploaded_by fixed
+        async with AsyncSessionLocal() as db:
+            for video_id in rng.sample(range(1, args.videos + 1), args.writes // 4):
+                await db.execute(Video.__table__.update().where(Video.id == video_id)
+                                 .values(uploaded_by=rng.randint(1, args.users)))
+            await db.commit()
+
+    async with AsyncSessionLocal() as db:
+        expected = dict((await db.execute(
+            select(Video.uploaded_by, func.count()).group_by(Video.uploaded_by)
+        )).all())
+        counted = dict((await db.execute(text("SELECT user_id, video_count FROM uploader_video_counts"))).all())
+        total = await stats.catalog_counter(db, "videos")
+        uploaders = await stats.catalog_counter(db, "uploaders")
+    consistent = (counted == expected and total == sum(expected.values()) and uploaders == len(expected))
+    print(f"after {args.writes} creates, {args.writes // 2} deletes, {args.writes // 4} reassigns: "
+          f"counters {'match' if consistent else 'DO NOT match'} a full recount")
+
+    hashing_executor.shutdown()
+    await dispose_engines()
+    return ok and consistent
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--videos", type=int, default=200_000)
+    parser.add_argument("--users", type=int, default=2000)
+    parser.add_argument("--repeat", type=int, default=20)
+    parser.add_argument("--writes", type=int, default=200)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        database_url = f"sqlite:///{os.path.join(tmp, 'counts.db')}"
+        # Read at import by app.config
+        os.environ.update(DATABASE_URL=database_url, METRICS_ENABLED="0", RATE_LIMIT_ENABLED="0",
+                          JOBS_ENABLED="0")
+        seed_database(database_url, args.users, args.videos)
+        ok = asyncio.run(run(args))
+    return 0 if ok else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,70 @@
+"""Export memory benchmark: peak Python heap while streaming the catalog.
+
+Consumes the export body generator directly (httpx's ASGI transport would
+buffer the whole response) and reports the tracemalloc peak per catalog size.
+
+Run from the backend directory:
+
+    python -m benchmarks.bench_export --sizes 10000 100000 500000
+"""
+import argparse
+import asyncio
+import os
+import tempfile
+import tracemalloc
+
+from sqlalchemy import create_engine
+from sqlalchemy.orm import sessionmaker
+
+async def consume(format: str) -> int:
+    from app.routers.videos import export_videos
+
+    response = await export_videos(format=format)
+    total = 0
+    async for chunk in response.body_iterator:
+        total += len(chunk)
+    return total
+
+
+def run(size: int) -> dict:
+    from app.models import Base
+    from app.database import dispose_engines
+    from app.routers import videos  # noqa: F401  (import before tracing starts)
+    from benchmarks.seed import seed_catalog
+
+    engine = create_engine(os.environ["DATABASE_URL"])
+    Base.metadata.drop_all(bind=engine)
+    Base.metadata.create_all(bind=engine)
+    with sessionmaker(bind=engine)() as session:
+        seed_catalog(session, size)
+    engine.dispose()
+
+    result = {"rows": size}
+    for format in ("ndjson", "csv"):
+        tracemalloc.start()
+        written = asyncio.run(consume(format))
+        _, peak = tracemalloc.get_traced_memory()
+        tracemalloc.stop()
+        asyncio.run(dispose_engines())
+        result[f"{format}_mb_written"] = written / 2**20
+        result[f"{format}_peak_kb"] = peak / 2**10
+    return result
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--sizes", type=int, nargs="+", default=[10_000, 100_000, 500_000])
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        # Point the app at a scratch database before it is imported
+        os.environ["DATABASE_URL"] = f"sqlite:///{os.path.join(tmp, 'bench.db')}"
+        for size in args.sizes:
+            result = run(size)
+            print(f"{result['rows']:>8} rows  ndjson {result['ndjson_mb_written']:7.1f} MB, "
+                  f"peak {result['ndjson_peak_kb']:8.1f} KB  |  csv {result['csv_mb_written']:7.1f} MB, "
+                  f"peak {result['csv_peak_kb']:8.1f} KB")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,148 @@
+"""POST /videos/: new videos vs. duplicates vs. Idempotency-Key retries.
+
+Times `--requests` creates of each kind in-process over ASGI and counts the
+SQL statements each costs:
+
+- new: a video whose YouTube id is not in the catalog yet
+- duplicate URL form: an existing video posted as youtube.com/watch?v=...&t=,
+  m.youtube.com/... or youtu.be/... (resolved by INSERT ... ON CONFLICT DO
+  NOTHING RETURNING plus one lookup)
+- retry with Idempotency-Key: the same request again (one primary-key lookup)
+
+Then checks that every URL form of a video maps to one row, that a key reused
+with another body is refused with 422, that concurrent retries of one key all
+get the same video, and that a bulk import skips other URL forms of existing
+videos. Fails on any violation.
+
+Run from the backend directory:
+
+    python -m benchmarks.bench_idempotency --requests 500
+"""
+import argparse
+import asyncio
+import os
+import statistics
+import sys
+import tempfile
+import time
+
+import httpx
+
+from benchmarks.suite import PASSWORD, seed_database
+
+URL_FORMS = (
+    "https://www.youtube.com/watch?v={id}&t=10",
+    "https://m.youtube.com/watch?v={id}",
+    "youtu.be/{id}",
+)
+
+
+def youtube_id(n: int) -> str:
+    return f"idem{n:07d}"
+
+
+async def run(args) -> bool:
+    from sqlalchemy import event, func, select
+
+    from app.database import AsyncSessionLocal, async_engine, dispose_engines
+    from app.hashing import hashing_executor
+    from app.main import app
+    from app.models import Video
+    from benchmarks.seed import user_email
+
+    statements = 0
+
+    def count(*_):
+        nonlocal statements
+        statements += 1
+
+    event.listen(async_engine.sync_engine, "before_cursor_execute", count)
+
+    def video(n: int, url: str, title: str = "") -> dict:
+        return {"title": title or f"Idempotent {n}", "description": "bench_idempotency", "youtube_url": url,
+                "uploaded_by": 1}
+
+    problems = []
+    transport = httpx.ASGITransport(app=app)
+    async with httpx.AsyncClient(transport=transport, base_url="http://bench", timeout=60) as client:
+        login = await client.post("/api/login", json={"email": user_email(1), "password": PASSWORD})
+        client.headers["Authorization"] = f"Bearer {login.json()['access_token']}"
+        # Warm the token cache, so every request below costs the same
+        await client.post("/videos/", json=video(0, f"https://youtu.be/{youtube_id(0)}"))
+
+        kinds = (
+            ("new", lambda n: (video(n, f"https://youtu.be/{youtube_id(n)}"), {"Idempotency-Key": f"k{n}"})),
+            ("duplicate URL form",
+             lambda n: (video(n, URL_FORMS[n % len(URL_FORMS)].format(id=youtube_id(n))), {})),
+            ("retry with Idempotency-Key",
+             lambda n: (video(n, f"https://youtu.be/{youtube_id(n)}"), {"Idempotency-Key": f"k{n}"})),
+        )
+        ids = {}
+        for name, build in kinds:
+            latencies = []
+            statements = 0
+            for n in range(1, args.requests + 1):
+                body, headers = build(n)
+                start = time.perf_counter()
+                response = await client.post("/videos/", json=body, headers=headers)
+                latencies.append((time.perf_counter() - start) * 1000)
+                if response.status_code != 200:
+                    problems.append(f"{name}: {response.status_code} {response.text}")
+                    break
+                video_id = response.json()["id"]
+                if ids.setdefault(n, video_id) != video_id:
+                    problems.append(f"{name}: request {n} got video {video_id}, expected {ids[n]}")
+            latencies.sort()
+            print(f"{name:>26}: p50 {statistics.median(latencies):5.2f} ms  "
+                  f"p99 {latencies[int(len(latencies) * 0.99)]:5.2f} ms  "
+                  f"{statements / args.requests:4.1f} statements/request")
+
+        reused = await client.post("/videos/", json=video(1, "https://youtu.be/otherother1"),
+                                   headers={"Idempotency-Key": "k1"})
+        if reused.status_code != 422:
+            problems.append(f"key reused with another body answered {reused.status_code}")
+
+        concurrent = await asyncio.gather(*(
+            client.post("/videos/", json=video(-1, "https://example.com/not-youtube"),
+                        headers={"Idempotency-Key": "concurrent"})
+            for _ in range(args.concurrency)
+        ))
+        if len({response.json().get("id") for response in concurrent}) != 1:
+            problems.append("concurrent retries of one key got different videos")
+
+        bulk = await client.post("/videos/bulk", json=[
+            video(n, URL_FORMS[0].format(id=youtube_id(n))) for n in range(1, 11)
+        ] + [video(9_999_999, f"https://youtu.be/{youtube_id(9_999_999)}")])
+        if (bulk.json()["created"], bulk.json()["skipped"]) != (1, 10):
+            problems.append(f"bulk import of other URL forms: {bulk.json()['created']} created, "
+                            f"{bulk.json()['skipped']} skipped")
+
+    async with AsyncSessionLocal() as session:
+        rows = await session.scalar(select(func.count()).where(Video.youtube_id.like("idem%")))
+        if rows != args.requests + 2:
+            problems.append(f"{rows} rows for {args.requests + 2} YouTube videos")
+    hashing_executor.shutdown()
+    await dispose_engines()
+    print(f"checks: {'; '.join(problems) or 'one row per YouTube video, keys replayed and enforced'}")
+    return not problems
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--requests", type=int, default=500)
+    parser.add_argument("--concurrency", type=int, default=20)
+    parser.add_argument("--videos", type=int, default=10_000)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        database_url = f"sqlite:///{os.path.join(tmp, 'idempotency.db')}"
+        # Read at import by app.config
+        os.environ.update(DATABASE_URL=database_url, METRICS_ENABLED="0", JOBS_ENABLED="0",
+                          RATE_LIMIT_ENABLED="0", YOUTUBE_ENRICHER="stub")
+        seed_database(database_url, 10, args.videos)
+        ok = asyncio.run(run(args))
+    return 0 if ok else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
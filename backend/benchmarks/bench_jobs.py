@@ -0,0 +1,126 @@
+"""POST /videos with metadata enrichment inline vs. through the background job queue.
+
+Enrichment uses the offline StubEnricher with `--enrich-ms` of simulated
+network latency, and fails its first `--fail-first` calls so the retry path
+runs too. "inline" awaits the enrichment before counting the request as
+done, which is what doing it inside the endpoint would cost; "queued" only
+enqueues, while `--workers` job workers drain the outbox in the background.
+Reports create latency, how long the queue took to drain after the last
+request, and exits non-zero unless every video ended up with metadata.
+
+Run from the backend directory:
+
+    python -m benchmarks.bench_jobs --creates 500 --concurrency 16 --enrich-ms 150
+"""
+import argparse
+import asyncio
+import itertools
+import os
+import statistics
+import sys
+import tempfile
+import time
+
+import httpx
+
+from benchmarks.suite import PASSWORD, seed_database
+
+
+async def run(args) -> bool:
+    from sqlalchemy import func, select
+
+    from app import youtube
+    from app.database import AsyncSessionLocal, dispose_engines
+    from app.hashing import hashing_executor
+    from app.jobs import job_queue
+    from app.main import app
+    from app.models import Job, VideoMetadata
+    from benchmarks.seed import user_email
+
+    # Retries in the benchmark should not wait for the production backoff
+    job_queue.backoff_base = 0.05
+    transport = httpx.ASGITransport(app=app)
+    counter = itertools.count()
+    ok = True
+    async with httpx.AsyncClient(transport=transport, base_url="http://bench", timeout=60) as client:
+        login = await client.post("/api/login", json={"email": user_email(1), "password": PASSWORD})
+        headers = {"Authorization": f"Bearer {login.json()['access_token']}"}
+
+        for mode in ("inline", "queued"):
+            youtube.metadata_enricher = youtube.StubEnricher(args.enrich_ms / 1000, fail_times=args.fail_first)
+            if mode == "queued":
+                job_queue.start(args.workers)
+            latencies = []
+
+            async def create():
+                n = next(counter)
+                start = time.perf_counter()
+                response = await client.post("/videos/", headers=headers, json={
+                    "title": f"Job benchmark video {n}",
+                    "description": "Created by bench_jobs",
+                    "youtube_url": f"https://youtu.be/jobs{n:07d}",
+                    "uploaded_by": 1,
+                })
+                response.raise_for_status()
+                if mode == "inline":
+                    while await job_queue.run_one():
+                        pass
+                latencies.append(time.perf_counter() - start)
+
+            async def client_loop(share: int):
+                for _ in range(share):
+                    await create()
+
+            shares = [args.creates // args.concurrency] * args.concurrency
+            wall_start = time.perf_counter()
+            await asyncio.gather(*(client_loop(share) for share in shares))
+            wall = time.perf_counter() - wall_start
+
+            drain_start = time.perf_counter()
+            async with AsyncSessionLocal() as session:
+                while await session.scalar(select(func.count()).where(Job.status.in_(("pending", "running")))):
+                    if mode == "inline":
+                        # Jobs waiting out a retry backoff
+                        await job_queue.run_pending()
+                    await asyncio.sleep(0.01)
+                    await session.rollback()
+            drain = time.perf_counter() - drain_start
+            await job_queue.stop()
+
+            latencies.sort()
+            p95 = latencies[int(len(latencies) * 0.95) - 1]
+            print(f"{mode:>6}: {len(latencies) / wall:7.1f} creates/s  p50 {statistics.median(latencies) * 1000:7.1f}  "
+                  f"p95 {p95 * 1000:7.1f} ms  queue drained {drain * 1000:6.0f} ms after the last request")
+
+        async with AsyncSessionLocal() as session:
+            metadata = await session.scalar(select(func.count()).select_from(VideoMetadata))
+            statuses = dict((await session.execute(select(Job.status, func.count()).group_by(Job.status))).all())
+        expected = sum(shares) * 2
+        print(f"metadata rows {metadata}/{expected}, jobs {statuses}, retried {job_queue.retried}")
+        ok = metadata == expected and statuses == {"done": expected}
+
+    hashing_executor.shutdown()
+    await dispose_engines()
+    return ok
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--creates", type=int, default=500)
+    parser.add_argument("--concurrency", type=int, default=16)
+    parser.add_argument("--workers", type=int, default=4, help="job workers in queued mode")
+    parser.add_argument("--enrich-ms", type=float, default=150.0)
+    parser.add_argument("--fail-first", type=int, default=3, help="stub enricher calls that fail")
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        database_url = f"sqlite:///{os.path.join(tmp, 'jobs.db')}"
+        # Read at import by app.config
+        os.environ.update(DATABASE_URL=database_url, RATE_LIMIT_ENABLED="0")
+        seed_database(database_url, 10, 1000)
+        ok = asyncio.run(run(args))
+    return 0 if ok else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,111 @@
+"""Credential-stuffing stress test for POST /api/login, with and without the rate limiter.
+
+Attack clients spread over a few IPs send wrong passwords for real and
+unknown emails as fast as they can for `--duration` seconds. Each mode runs
+in a fresh process (RATE_LIMIT_ENABLED is read at import) and reports the
+status codes, how many bcrypt verifications ran and the CPU seconds the
+hashing workers used per second of attack. The attack clients share the
+API process, so its own CPU time is not a useful signal here. With the
+limiter on, verifications are bounded by ips * (LOGIN_IP_BURST +
+LOGIN_IP_PER_MINUTE * minutes) however hard the clients push.
+
+Run from the backend directory:
+
+    python -m benchmarks.bench_login_attack --duration 10 --concurrency 64
+"""
+import argparse
+import asyncio
+import json
+import os
+import random
+import subprocess
+import sys
+import tempfile
+import time
+from collections import Counter
+
+import httpx
+
+from benchmarks.suite import BACKEND_DIR, seed_database
+
+
+async def attack(args) -> dict:
+    from app.database import dispose_engines
+    from app.hashing import hashing_executor
+    from app.main import app
+    from benchmarks.seed import user_email
+
+    statuses = Counter()
+    deadline = time.perf_counter() + args.duration
+
+    async def client(n: int):
+        # ASGI transport reports this address as request.client
+        transport = httpx.ASGITransport(app=app, client=(f"203.0.113.{n % args.ips}", 40000 + n))
+        async with httpx.AsyncClient(transport=transport, base_url="http://bench", timeout=None) as http:
+            rng = random.Random(n)
+            while time.perf_counter() < deadline:
+                user = rng.randint(1, args.users * 2)  # half the emails do not exist
+                response = await http.post(
+                    "/api/login", json={"email": user_email(user), "password": f"guess-{rng.random()}"},
+                )
+                statuses[str(response.status_code)] += 1
+
+    cpu_start, wall_start = os.times(), time.perf_counter()
+    await asyncio.gather(*(client(n) for n in range(args.concurrency)))
+    wall = time.perf_counter() - wall_start
+    verifications = hashing_executor.stats()["completed"]
+    # Joining the pool reaps the workers, so their CPU shows up in children_*
+    if hashing_executor._pool is not None:
+        hashing_executor._pool.shutdown(wait=True)
+    hashing_executor.shutdown()
+    await dispose_engines()
+    cpu_end = os.times()
+    hashing_cpu = sum(getattr(cpu_end, f) - getattr(cpu_start, f) for f in ("children_user", "children_system"))
+    return {
+        "requests": sum(statuses.values()),
+        "statuses": dict(statuses),
+        "bcrypt_verifications": verifications,
+        "hashing_cpu_seconds_per_second": hashing_cpu / wall,
+    }
+
+
+def run_mode(enabled: bool, args) -> dict:
+    with tempfile.NamedTemporaryFile(suffix=".json") as output:
+        subprocess.run(
+            [sys.executable, "-m", "benchmarks.bench_login_attack", "--worker", output.name,
+             "--duration", str(args.duration), "--concurrency", str(args.concurrency),
+             "--ips", str(args.ips), "--users", str(args.users)],
+            cwd=BACKEND_DIR, check=True, stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL,
+            env=dict(os.environ, RATE_LIMIT_ENABLED="1" if enabled else "0"),
+        )
+        return json.load(output)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--duration", type=float, default=10.0)
+    parser.add_argument("--concurrency", type=int, default=64)
+    parser.add_argument("--ips", type=int, default=4, help="distinct attacker IPs")
+    parser.add_argument("--users", type=int, default=50)
+    parser.add_argument("--worker", help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.worker:
+        with tempfile.TemporaryDirectory() as tmp:
+            database_url = f"sqlite:///{os.path.join(tmp, 'attack.db')}"
+            os.environ["DATABASE_URL"] = database_url
+            seed_database(database_url, args.users, 100)
+            result = asyncio.run(attack(args))
+        with open(args.worker, "w") as f:
+            json.dump(result, f)
+        return
+
+    for enabled in (False, True):
+        result = run_mode(enabled, args)
+        print(f"rate limiter {'on ' if enabled else 'off'}: {result['requests']:6d} requests  "
+              f"{result['bcrypt_verifications']:5d} bcrypt verifications  "
+              f"{result['hashing_cpu_seconds_per_second']:.2f} hashing CPU s/s  statuses {result['statuses']}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,106 @@
+"""Overhead of the metrics middleware and SQL hooks.
+
+Runs the API suite with METRICS_ENABLED=0 and =1 in alternating rounds
+(each in a fresh process, since the setting is read at import) and reports
+the req/s change per scenario. The cached read scenarios are the worst
+case: their handlers do the least work of their own. Because run-to-run
+noise on a shared machine is larger than the effect, it also times the
+middleware and SQL hooks directly around a no-op app and reports that
+cost against each scenario's service time (1 / req/s, the CPU time one
+request takes on a saturated single core).
+
+Run from the backend directory:
+
+    python -m benchmarks.bench_metrics --rounds 4 --duration 5
+"""
+import argparse
+import json
+import os
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+
+from benchmarks.suite import BACKEND_DIR
+
+
+def run_suite(enabled: bool, args) -> dict:
+    with tempfile.NamedTemporaryFile(suffix=".json") as output:
+        subprocess.run(
+            [sys.executable, "-m", "benchmarks", "--transport", args.transport,
+             "--videos", str(args.videos), "--concurrency", str(args.concurrency),
+             "--duration", str(args.duration), "--scenarios", *args.scenarios, "--output", output.name],
+            cwd=BACKEND_DIR, check=True, stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL,
+            env=dict(os.environ, METRICS_ENABLED="1" if enabled else "0"),
+        )
+        return json.load(output)["scenarios"]
+
+
+def instrumentation_cost(requests: int = 20_000, queries: int = 2) -> float:
+    """Seconds the middleware and hooks add to one request issuing `queries` statements."""
+    import asyncio
+
+    from app.metrics import MetricsMiddleware, MetricsRegistry, _after_cursor_execute, _before_cursor_execute
+
+    class Connection:
+        info = {}
+
+    async def app(scope, receive, send):
+        for _ in range(queries):
+            _before_cursor_execute(Connection, None, "", (), None, False)
+            _after_cursor_execute(Connection, None, "", (), None, False)
+        await send({"type": "http.response.start", "status": 200, "headers": []})
+        await send({"type": "http.response.body", "body": b""})
+
+    async def send(message):
+        pass
+
+    async def run(handler) -> float:
+        scope = {"type": "http", "method": "GET", "path": "/videos/"}
+        start = time.perf_counter()
+        for _ in range(requests):
+            await handler(scope, None, send)
+        return time.perf_counter() - start
+
+    async def bare(scope, receive, send):
+        await send({"type": "http.response.start", "status": 200, "headers": []})
+        await send({"type": "http.response.body", "body": b""})
+
+    instrumented = MetricsMiddleware(app, MetricsRegistry())
+    baseline, measured = asyncio.run(run(bare)), asyncio.run(run(instrumented))
+    return (measured - baseline) / requests
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--rounds", type=int, default=4)
+    parser.add_argument("--transport", choices=["asgi", "uvicorn"], default="asgi")
+    parser.add_argument("--videos", type=int, default=10_000)
+    parser.add_argument("--concurrency", type=int, default=16)
+    parser.add_argument("--duration", type=float, default=5.0)
+    parser.add_argument("--scenarios", nargs="+", default=["list", "search", "get", "update"])
+    args = parser.parse_args()
+
+    rps = {False: {name: [] for name in args.scenarios}, True: {name: [] for name in args.scenarios}}
+    for round in range(args.rounds):
+        # Swap the order every round so warm-up effects cancel out
+        for enabled in ((False, True) if round % 2 == 0 else (True, False)):
+            for name, result in run_suite(enabled, args).items():
+                rps[enabled][name].append(result["rps"])
+
+    print(f"{'scenario':>9}  {'off req/s':>10}  {'on req/s':>10}  overhead")
+    for name in args.scenarios:
+        off, on = statistics.median(rps[False][name]), statistics.median(rps[True][name])
+        print(f"{name:>9}  {off:10.1f}  {on:10.1f}  {(1 - on / off) * 100:+7.2f}%")
+
+    sys.path.insert(0, BACKEND_DIR)
+    cost = instrumentation_cost()
+    print(f"\nmiddleware + SQL hooks: {cost * 1e6:.1f} us/request")
+    for name in args.scenarios:
+        service = 1 / statistics.median(rps[False][name])
+        print(f"{name:>9}: {cost / service * 100:6.2f}% of {service * 1000:.2f} ms per request")
+
+
+if __name__ == "__main__":
+    main()
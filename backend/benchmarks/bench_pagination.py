@@ -0,0 +1,69 @@
+"""Pagination benchmark: OFFSET paging vs. keyset (cursor) paging.
+
+Compares fetching page 1 and page 10,000 of the video listing in both modes.
+
+Run from the backend directory:
+
+    python -m benchmarks.bench_pagination --page-size 10 --pages 10000
+"""
+import argparse
+import os
+import statistics
+import tempfile
+import time
+
+from sqlalchemy import create_engine
+from sqlalchemy.orm import sessionmaker
+
+from app.models import Base, Video
+from app.pagination import encode_cursor, keyset_query, split_page
+from benchmarks.seed import seed_catalog
+
+
+def median_ms(fn, rounds: int) -> float:
+    samples = []
+    for _ in range(rounds):
+        start = time.perf_counter()
+        fn()
+        samples.append((time.perf_counter() - start) * 1000)
+    return statistics.median(samples)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--page-size", type=int, default=10)
+    parser.add_argument("--pages", type=int, default=10_000)
+    parser.add_argument("--rounds", type=int, default=50)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        engine = create_engine(f"sqlite:///{os.path.join(tmp, 'bench.db')}")
+        Base.metadata.create_all(bind=engine)
+        Session = sessionmaker(bind=engine)
+        with Session() as session:
+            seed_catalog(session, args.page_size * args.pages)
+            # Seeded ids are contiguous from 1, so the row before page N is known
+            last_id = args.page_size * (args.pages - 1)
+
+            def offset_page(page):
+                offset = args.page_size * (page - 1)
+                return lambda: session.query(Video).offset(offset).limit(args.page_size).all()
+
+            def keyset(cursor):
+                query = keyset_query(session.query(Video), Video.id, cursor, args.page_size)
+                return lambda: split_page(query.all(), args.page_size)
+
+            results = {
+                "offset page 1": median_ms(offset_page(1), args.rounds),
+                f"offset page {args.pages}": median_ms(offset_page(args.pages), args.rounds),
+                "keyset page 1": median_ms(keyset(""), args.rounds),
+                f"keyset page {args.pages}": median_ms(keyset(encode_cursor(last_id)), args.rounds),
+            }
+        engine.dispose()
+
+    for name, value in results.items():
+        print(f"{name:>22}: {value:8.3f} ms")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,155 @@
+"""Mixed 95/5 read/write traffic with and without read routing.
+
+Each client is its own httpx client (own cookies) in-process over ASGI, and
+loops over 95% reads (a video, a list page, a search) and 5% writes
+(create or update a video). After every write the client reads the video
+back and checks that it sees its write. Modes, each in a fresh process on
+a copy of one seeded database:
+
+- single: DB_READ_ROUTING=0, every request on the one pool
+- ro: GET requests on a pool of mode=ro connections to the same file
+- replica: reads from a stale copy of the file (a replica that never
+  catches up), with the read-your-writes window, so only a client's own
+  recent writes are routed to the writer
+- replica-no-ryw: the same with READ_YOUR_WRITES_SECONDS=0, to show the
+  stale reads the window prevents (reported, not a failure)
+
+Reports requests/s, read and write p50/p99 and read-your-writes
+violations; fails if any mode but replica-no-ryw has one.
+
+Run from the backend directory:
+
+    python -m benchmarks.bench_read_routing --clients 32 --duration 10
+"""
+import argparse
+import asyncio
+import json
+import os
+import random
+import shutil
+import subprocess
+import sys
+import tempfile
+import time
+
+import httpx
+
+from benchmarks.suite import PASSWORD, seed_database
+
+MODES = {
+    "single": {"DB_READ_ROUTING": "0"},
+    "ro": {},
+    "replica": {"REPLICA": "1"},
+    "replica-no-ryw": {"REPLICA": "1", "READ_YOUR_WRITES_SECONDS": "0"},
+}
+
+
+def percentile(samples: list, q: float) -> float:
+    samples = sorted(samples)
+    return samples[min(len(samples) - 1, int(len(samples) * q))] * 1000 if samples else float("nan")
+
+
+async def run(args) -> dict:
+    from app.database import dispose_engines
+    from app.hashing import hashing_executor
+    from app.main import app
+    from benchmarks.seed import user_email
+
+    transport = httpx.ASGITransport(app=app)
+    reads, writes, violations = [], [], [0]
+    async with httpx.AsyncClient(transport=transport, base_url="http://bench") as login_client:
+        login = await login_client.post("/api/login", json={"email": user_email(1), "password": PASSWORD})
+        token = login.json()["access_token"]
+
+    async def client_loop(n: int, deadline: float) -> None:
+        rng = random.Random(n)
+        headers = {"Authorization": f"Bearer {token}"}
+        async with httpx.AsyncClient(transport=transport, base_url="http://bench", headers=headers) as client:
+            created = 0
+            while time.perf_counter() < deadline:
+                start = time.perf_counter()
+                if rng.random() < 0.05:
+                    if rng.random() < 0.5:
+                        response = await client.post("/videos/", json={
+                            "title": f"Routed {n}-{created}", "description": "bench_read_routing",
+                            "youtube_url": f"https://youtu.be/rr{n:03d}{created:06d}", "uploaded_by": 1,
+                        })
+                        created += 1
+                    else:
+                        # A video of user 1: seeded video i belongs to user 1 + i % 10
+                        response = await client.put(f"/videos/{1 + 10 * rng.randrange(args.videos // 10)}",
+                                                    json={"title": f"Renamed by {n} at {start:.6f}"})
+                    response.raise_for_status()
+                    writes.append(time.perf_counter() - start)
+                    video = response.json()
+                    seen = await client.get(f"/videos/{video['id']}")
+                    if seen.status_code != 200 or seen.json()["title"] != video["title"]:
+                        violations[0] += 1
+                    continue
+                kind = rng.random()
+                if kind < 0.6:
+                    response = await client.get(f"/videos/{rng.randint(1, args.videos)}")
+                elif kind < 0.9:
+                    response = await client.get("/videos/", params={"offset": rng.randrange(1000), "limit": 20})
+                else:
+                    response = await client.get("/videos/", params={"search": rng.choice(("python", "music", "cloud"))})
+                response.raise_for_status()
+                reads.append(time.perf_counter() - start)
+
+    start = time.perf_counter()
+    deadline = start + args.duration
+    await asyncio.gather(*(client_loop(n, deadline) for n in range(args.clients)))
+    elapsed = time.perf_counter() - start
+    hashing_executor.shutdown()
+    await dispose_engines()
+    return {
+        "requests_per_s": (len(reads) + len(writes)) / elapsed,
+        "read_p50": percentile(reads, 0.5), "read_p99": percentile(reads, 0.99),
+        "write_p50": percentile(writes, 0.5), "write_p99": percentile(writes, 0.99),
+        "writes": len(writes), "violations": violations[0],
+    }
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--videos", type=int, default=50_000)
+    parser.add_argument("--clients", type=int, default=32)
+    parser.add_argument("--duration", type=float, default=10.0)
+    parser.add_argument("--mode", choices=MODES, help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.mode:
+        print(json.dumps(asyncio.run(run(args))))
+        return 0
+
+    ok = True
+    with tempfile.TemporaryDirectory() as tmp:
+        seeded = os.path.join(tmp, "seeded.db")
+        seed_database(f"sqlite:///{seeded}", 10, args.videos)
+        for mode, extra in MODES.items():
+            path = os.path.join(tmp, f"{mode}.db")
+            shutil.copy(seeded, path)
+            env = dict(os.environ, DATABASE_URL=f"sqlite:///{path}", METRICS_ENABLED="0", JOBS_ENABLED="0",
+                       RATE_LIMIT_ENABLED="0", YOUTUBE_ENRICHER="stub")
+            if extra.pop("REPLICA", None):
+                replica = os.path.join(tmp, f"{mode}-replica.db")
+                shutil.copy(seeded, replica)
+                env["DB_READ_REPLICA_URL"] = f"sqlite:///{replica}"
+            env.update(extra)
+            output = subprocess.run(
+                [sys.executable, "-m", "benchmarks.bench_read_routing", "--mode", mode, "--videos", str(args.videos),
+                 "--clients", str(args.clients), "--duration", str(args.duration)],
+                env=env, capture_output=True, text=True, check=True,
+            ).stdout
+            result = json.loads(output.strip().splitlines()[-1])
+            if mode != "replica-no-ryw" and result["violations"]:
+                ok = False
+            print(f"{mode:>15}: {result['requests_per_s']:7.0f} req/s  "
+                  f"read p50 {result['read_p50']:6.1f} ms p99 {result['read_p99']:6.1f} ms  "
+                  f"write p50 {result['write_p50']:6.1f} ms p99 {result['write_p99']:6.1f} ms  "
+                  f"read-your-writes violations {result['violations']}/{result['writes']}")
+    return 0 if ok else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
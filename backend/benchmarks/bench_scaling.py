@@ -0,0 +1,196 @@
+"""Read throughput of `python -m app.server` from 1 to N workers, and a graceful drain check.
+
+Seeds a catalog, then for each worker count starts the production runner,
+waits until /readyz is 200 from every worker, and drives it for `--duration`
+seconds from `--clients` load-generator processes doing random
+GET /videos/{id} and list-page reads. Reports requests/s, the speedup over
+one worker and the scaling efficiency (speedup / workers).
+
+Near-linear scaling needs a core per worker plus cores for the clients, so
+the `--min-efficiency` target is only enforced when os.cpu_count() covers
+workers + clients; otherwise the line is marked as not judged.
+
+The drain check starts `--drain-streams` full NDJSON exports, sends SIGTERM to
+the runner while they are in flight and fails unless /readyz turned 503, every
+export finished with every row, and the runner exited.
+
+Linux only. Run from the backend directory:
+
+    python -m benchmarks.bench_scaling --workers 1 2 4 --clients 2 --duration 10
+"""
+import argparse
+import asyncio
+import multiprocessing
+import os
+import random
+import signal
+import subprocess
+import sys
+import tempfile
+import time
+
+import httpx
+
+from benchmarks.suite import BACKEND_DIR, seed_database
+
+
+def start_server(env: dict, workers: int, port: int, drain_seconds: float) -> subprocess.Popen:
+    return subprocess.Popen(
+        [sys.executable, "-m", "app.server", "--workers", str(workers), "--port", str(port),
+         "--drain-seconds", str(drain_seconds), "--log-level", "warning"],
+        cwd=BACKEND_DIR, env=env, stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL,
+    )
+
+
+def wait_ready(base_url: str, workers: int, timeout: float = 120) -> None:
+    """Polls /readyz until every worker (by pid) has answered 200."""
+    ready = set()
+    deadline = time.monotonic() + timeout
+    with httpx.Client(base_url=base_url, timeout=2) as client:
+        while len(ready) < workers:
+            if time.monotonic() > deadline:
+                raise RuntimeError(f"only {len(ready)} of {workers} workers became ready")
+            try:
+                # A fresh connection each time, so the kernel spreads them over the workers
+                response = client.get("/readyz", headers={"Connection": "close"})
+                if response.status_code == 200:
+                    ready.add(response.json()["pid"])
+            except httpx.HTTPError:
+                pass
+            time.sleep(0.05)
+
+
+async def generate_load(base_url: str, videos: int, concurrency: int, duration: float, seed: int) -> tuple:
+    rng = random.Random(seed)
+    ok = errors = 0
+    deadline = time.perf_counter() + duration
+
+    async def worker(client):
+        nonlocal ok, errors
+        while time.perf_counter() < deadline:
+            if rng.random() < 0.8:
+                url = f"/videos/{rng.randint(1, videos)}"
+            else:
+                url = f"/videos/?offset={rng.randrange(videos - 20)}&limit=20"
+            try:
+                response = await client.get(url)
+                ok += response.status_code == 200
+                errors += response.status_code != 200
+            except httpx.HTTPError:
+                errors += 1
+
+    limits = httpx.Limits(max_connections=concurrency)
+    async with httpx.AsyncClient(base_url=base_url, limits=limits, timeout=30) as client:
+        await asyncio.gather(*(worker(client) for _ in range(concurrency)))
+    return ok, errors
+
+
+def load_process(args: tuple) -> tuple:
+    return asyncio.run(generate_load(*args))
+
+
+def measure(base_url: str, args) -> tuple:
+    jobs = [(base_url, args.videos, args.concurrency, args.duration, seed) for seed in range(args.clients)]
+    with multiprocessing.get_context("spawn").Pool(args.clients) as pool:
+        results = pool.map(load_process, jobs)
+    ok = sum(result[0] for result in results)
+    errors = sum(result[1] for result in results)
+    return ok / args.duration, errors
+
+
+async def drain_check(base_url: str, server: subprocess.Popen, args) -> list:
+    problems = []
+    async with httpx.AsyncClient(base_url=base_url, timeout=120) as client:
+        async def export() -> int:
+            async with client.stream("GET", "/videos/export", params={"format": "ndjson"}) as response:
+                rows = 0
+                async for line in response.aiter_lines():
+                    if line:
+                        rows += 1
+                        if rows == 1:
+                            started.release()
+                        # Read slowly, so the export is still running when SIGTERM arrives
+                        if rows % 1000 == 0:
+                            await asyncio.sleep(0.05)
+                return rows
+
+        started = asyncio.Semaphore(0)
+        exports = [asyncio.create_task(export()) for _ in range(args.drain_streams)]
+        for _ in exports:
+            await started.acquire()
+        server.send_signal(signal.SIGTERM)
+        await asyncio.sleep(0.5)
+        try:
+            readyz = await client.get("/readyz", headers={"Connection": "close"})
+            if readyz.status_code != 503:
+                problems.append(f"/readyz answered {readyz.status_code} while draining")
+        except httpx.HTTPError as e:
+            problems.append(f"/readyz unreachable while draining: {type(e).__name__}")
+        for result in await asyncio.gather(*exports, return_exceptions=True):
+            if isinstance(result, Exception):
+                problems.append(f"in-flight export failed: {type(result).__name__}: {result}")
+            elif result != args.videos:
+                problems.append(f"in-flight export cut short at {result} of {args.videos} rows")
+    try:
+        server.wait(timeout=args.drain_seconds + 30)
+    except subprocess.TimeoutExpired:
+        problems.append("runner did not exit")
+    return problems
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--workers", type=int, nargs="+", default=[1, 2, 4])
+    parser.add_argument("--videos", type=int, default=100_000)
+    parser.add_argument("--clients", type=int, default=2)
+    parser.add_argument("--concurrency", type=int, default=32, help="connections per client process")
+    parser.add_argument("--duration", type=float, default=10.0)
+    parser.add_argument("--min-efficiency", type=float, default=0.7)
+    parser.add_argument("--drain-streams", type=int, default=4)
+    parser.add_argument("--drain-seconds", type=float, default=2.0)
+    parser.add_argument("--port", type=int, default=8769)
+    args = parser.parse_args()
+
+    ok = True
+    cpus = os.cpu_count() or 1
+    base_url = f"http://127.0.0.1:{args.port}"
+    with tempfile.TemporaryDirectory() as tmp:
+        database_url = f"sqlite:///{os.path.join(tmp, 'scaling.db')}"
+        seed_database(database_url, 100, args.videos)
+        env = dict(os.environ, DATABASE_URL=database_url, METRICS_ENABLED="0", RATE_LIMIT_ENABLED="0",
+                   JOBS_ENABLED="0", HASH_WORKERS="1")
+        print(f"{cpus} CPUs, {args.clients} client processes x {args.concurrency} connections")
+        baseline = None
+        for workers in args.workers:
+            server = start_server(env, workers, args.port, args.drain_seconds)
+            try:
+                wait_ready(base_url, workers)
+                throughput, errors = measure(base_url, args)
+            finally:
+                server.terminate()
+                server.wait()
+            baseline = baseline or throughput / workers
+            efficiency = throughput / (baseline * workers)
+            judged = cpus >= workers + args.clients
+            line = (f"{workers:>2} workers: {throughput:8.0f} req/s  speedup {throughput / baseline:5.2f}x  "
+                    f"efficiency {efficiency:4.0%}  errors {errors}")
+            if not judged:
+                line += "  (not judged: fewer CPUs than workers + clients)"
+            elif efficiency < args.min_efficiency:
+                line += f"  BELOW {args.min_efficiency:.0%}"
+                ok = False
+            print(line)
+
+        workers = max(2, min(args.workers))
+        server = start_server(env, workers, args.port, args.drain_seconds)
+        wait_ready(base_url, workers)
+        problems = asyncio.run(drain_check(base_url, server, args))
+        if server.poll() is None:
+            server.kill()
+        print(f"drain with {args.drain_streams} exports in flight: {'; '.join(problems) or 'no requests dropped'}")
+        ok = ok and not problems
+    return 0 if ok else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,81 @@
+"""Search latency benchmark: FTS5 index vs. the old `ilike('%term%')` scan.
+
+Every catalog size gets the same fixed number of "needle" rows per selective
+term, so a flat FTS column means lookup cost no longer depends on table size.
+Broad terms match a fixed fraction of the catalog and are reported separately:
+BM25 has to score every match, so their cost grows with the result set.
+
+Run from the backend directory:
+
+    python -m benchmarks.bench_search --sizes 10000 100000 1000000
+"""
+import argparse
+import os
+import random
+import statistics
+import tempfile
+import time
+
+from sqlalchemy import create_engine
+from sqlalchemy.orm import sessionmaker
+
+from app.models import Base, Video
+from app.search import apply_search
+from benchmarks.seed import seed_catalog
+
+NEEDLES = ["kubernetes", "photosynthesis", "renaissance", "thermodynamics"]
+NEEDLE_ROWS = 25
+SELECTIVE_TERMS = ["kubernetes", "photosyn", "renaissance art", "thermo"]
+BROAD_TERMS = ["python", "calc", "react tutorial", "machine learning"]
+
+
+def time_queries(session, build, terms, rounds: int) -> float:
+    samples = []
+    for _ in range(rounds):
+        for term in terms:
+            start = time.perf_counter()
+            build(session, term).limit(10).all()
+            samples.append((time.perf_counter() - start) * 1000)
+    return statistics.median(samples)
+
+
+def ilike_query(session, term):
+    return session.query(Video).filter(Video.title.ilike(f"%{term}%"))
+
+
+def fts_query(session, term):
+    return apply_search(session.query(Video), term)
+
+
+def run(size: int, rounds: int) -> dict:
+    with tempfile.TemporaryDirectory() as tmp:
+        engine = create_engine(f"sqlite:///{os.path.join(tmp, 'bench.db')}")
+        Base.metadata.create_all(bind=engine)
+        Session = sessionmaker(bind=engine)
+        with Session() as session:
+            rng = random.Random(size)
+            needles = {rng.randrange(size): needle for needle in NEEDLES for _ in range(NEEDLE_ROWS)}
+            seed_catalog(session, size, lambda i: f"{needles[i].title()} Art" if i in needles else None)
+            result = {"rows": size}
+            for name, terms in (("selective", SELECTIVE_TERMS), ("broad", BROAD_TERMS)):
+                result[f"{name}_ilike_ms"] = time_queries(session, ilike_query, terms, rounds)
+                result[f"{name}_fts_ms"] = time_queries(session, fts_query, terms, rounds)
+        engine.dispose()
+    return result
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--sizes", type=int, nargs="+", default=[10_000, 100_000, 1_000_000])
+    parser.add_argument("--rounds", type=int, default=5)
+    args = parser.parse_args()
+
+    columns = ["selective_ilike_ms", "selective_fts_ms", "broad_ilike_ms", "broad_fts_ms"]
+    print(f"{'rows':>10} " + " ".join(f"{column:>18}" for column in columns))
+    for size in args.sizes:
+        result = run(size, args.rounds)
+        print(f"{result['rows']:>10} " + " ".join(f"{result[column]:>18.2f}" for column in columns))
+
+
+if __name__ == "__main__":
+    main()
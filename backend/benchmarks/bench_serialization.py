@@ -0,0 +1,88 @@
+"""List page serialization: ORM rows + Pydantic vs. column rows + orjson.
+
+Builds the GET /videos body both ways (no response cache) and reports the
+CPU time per request, measured with time.process_time. Also checks that
+both bodies decode to the same JSON.
+
+Run from the backend directory:
+
+    python -m benchmarks.bench_serialization --page-size 100 --requests 2000
+"""
+import argparse
+import asyncio
+import json
+import os
+import tempfile
+import time
+from typing import List
+
+from pydantic import TypeAdapter
+from sqlalchemy import create_engine, select
+from sqlalchemy.ext.asyncio import async_sessionmaker, create_async_engine
+from sqlalchemy.orm import sessionmaker
+
+from app.models import Base, Video
+from app.responses import VIDEO_COLUMNS, dump_rows
+from app.schemas import VideoResponse
+from benchmarks.seed import seed_catalog
+
+video_list_adapter = TypeAdapter(List[VideoResponse])
+
+
+async def orm_pydantic(db, offset: int, limit: int) -> bytes:
+    videos = (await db.scalars(select(Video).offset(offset).limit(limit))).all()
+    return video_list_adapter.dump_json(video_list_adapter.validate_python(videos, from_attributes=True))
+
+
+async def columns_orjson(db, offset: int, limit: int) -> bytes:
+    return dump_rows((await db.execute(select(*VIDEO_COLUMNS).offset(offset).limit(limit))).all())
+
+
+async def measure(url: str, build, page_size: int, requests: int, rows: int) -> float:
+    engine = create_async_engine(url)
+    Session = async_sessionmaker(engine, autoflush=False, expire_on_commit=False)
+    async with Session() as db:
+        await build(db, 0, page_size)  # warm up statement caches
+    start = time.process_time()
+    for i in range(requests):
+        async with Session() as db:
+            await build(db, (i * page_size) % (rows - page_size), page_size)
+    cpu = time.process_time() - start
+    await engine.dispose()
+    return cpu / requests
+
+
+async def check_same_output(url: str, page_size: int) -> None:
+    engine = create_async_engine(url)
+    async with async_sessionmaker(engine)() as db:
+        assert json.loads(await orm_pydantic(db, 0, page_size)) == json.loads(await columns_orjson(db, 0, page_size))
+    await engine.dispose()
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--rows", type=int, default=20_000)
+    parser.add_argument("--page-size", type=int, default=100)
+    parser.add_argument("--requests", type=int, default=2000)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        path = os.path.join(tmp, "serialization.db")
+        engine = create_engine(f"sqlite:///{path}")
+        Base.metadata.create_all(bind=engine)
+        with sessionmaker(bind=engine)() as session:
+            seed_catalog(session, args.rows)
+        engine.dispose()
+
+        url = f"sqlite+aiosqlite:///{path}"
+        asyncio.run(check_same_output(url, args.page_size))
+        before = asyncio.run(measure(url, orm_pydantic, args.page_size, args.requests, args.rows))
+        after = asyncio.run(measure(url, columns_orjson, args.page_size, args.requests, args.rows))
+
+    print(f"{args.page_size}-row page, CPU per request:")
+    print(f"  ORM + Pydantic:     {before * 1000:7.3f} ms")
+    print(f"  columns + orjson:   {after * 1000:7.3f} ms  ({(1 - after / before) * 100:.1f}% less)")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,102 @@
+"""Concurrent read/write throughput: SQLite defaults vs. the tuned profile.
+
+Reader threads fetch random videos by id and list pages while writer threads
+insert one video per transaction. Each profile gets a fresh database.
+
+Run from the backend directory:
+
+    python -m benchmarks.bench_sqlite_profile --readers 8 --writers 2 --duration 10
+"""
+import argparse
+import os
+import random
+import tempfile
+import threading
+import time
+
+from sqlalchemy import insert, select
+from sqlalchemy.exc import OperationalError
+from sqlalchemy.orm import sessionmaker
+
+from app.config import Settings
+from app.database import create_db_engine
+from app.models import Base, Video
+from benchmarks.seed import seed_catalog
+
+
+def run(profile: str, readers: int, writers: int, duration: float, rows: int) -> dict:
+    with tempfile.TemporaryDirectory() as tmp:
+        config = Settings(
+            database_url=f"sqlite:///{os.path.join(tmp, 'bench.db')}",
+            db_profile=profile,
+            db_pool_size=readers + writers,
+        )
+        engine = create_db_engine(config)
+        Base.metadata.create_all(bind=engine)
+        Session = sessionmaker(bind=engine)
+        with Session() as session:
+            seed_catalog(session, rows)
+
+        counts = {"reads": 0, "writes": 0, "errors": 0}
+        lock = threading.Lock()
+        deadline = time.perf_counter() + duration
+
+        def reader(seed):
+            rng = random.Random(seed)
+            done = errors = 0
+            with engine.connect() as conn:
+                while time.perf_counter() < deadline:
+                    try:
+                        conn.execute(select(Video).where(Video.id == rng.randint(1, rows))).first()
+                        conn.execute(select(Video).offset(rng.randint(0, rows - 20)).limit(20)).all()
+                        conn.rollback()
+                        done += 1
+                    except OperationalError:
+                        errors += 1
+            with lock:
+                counts["reads"] += done
+                counts["errors"] += errors
+
+        def writer(seed):
+            done = errors = 0
+            while time.perf_counter() < deadline:
+                try:
+                    with engine.begin() as conn:
+                        conn.execute(insert(Video).values(
+                            title="Benchmark write", description="written under load",
+                            youtube_url=f"https://youtu.be/w{seed}-{done}-{errors}", uploaded_by=1,
+                        ))
+                    done += 1
+                except OperationalError:
+                    errors += 1
+            with lock:
+                counts["writes"] += done
+                counts["errors"] += errors
+
+        threads = [threading.Thread(target=reader, args=(i,)) for i in range(readers)]
+        threads += [threading.Thread(target=writer, args=(i,)) for i in range(writers)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        engine.dispose()
+
+    return {key: value / duration if key != "errors" else value for key, value in counts.items()}
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--readers", type=int, default=8)
+    parser.add_argument("--writers", type=int, default=2)
+    parser.add_argument("--duration", type=float, default=10)
+    parser.add_argument("--rows", type=int, default=20_000)
+    args = parser.parse_args()
+
+    for profile in ("baseline", "tuned"):
+        result = run(profile, args.readers, args.writers, args.duration, args.rows)
+        print(f"{profile:>9}: {result['reads']:8.1f} reads/s  {result['writes']:8.1f} writes/s  "
+              f"errors {result['errors']}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,117 @@
+"""Cold start of the API: import time and time until every uvicorn worker is serving.
+
+Migrates a scratch database with Alembic, then for each worker count starts
+`uvicorn app.main:app --workers N` and measures the wall time until all N
+workers have logged "Application startup complete" and the first request
+succeeds. Also reports the cost of a bare `import app.main` and of the
+`Base.metadata.create_all` call the app no longer makes at import.
+
+Workers import the app in parallel only when there are CPUs for them, so the
+target is per "wave" of workers: ready time / ceil(workers / cpu_count). Exits
+non-zero if any configuration misses `--target`.
+
+Run from the backend directory:
+
+    python -m benchmarks.bench_startup --workers 1 2 4 --target 2
+"""
+import argparse
+import math
+import os
+import statistics
+import subprocess
+import sys
+import tempfile
+import threading
+import time
+
+import httpx
+
+from benchmarks.suite import BACKEND_DIR
+
+
+def time_import(env: dict, runs: int) -> float:
+    samples = []
+    for _ in range(runs):
+        start = time.perf_counter()
+        subprocess.run([sys.executable, "-c", "import app.main"], cwd=BACKEND_DIR, env=env, check=True,
+                       stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
+        samples.append(time.perf_counter() - start)
+    return statistics.median(samples)
+
+
+def time_create_all(env: dict, runs: int) -> float:
+    code = (
+        "import time; from app.database import engine; from app.models import Base; "
+        "start = time.perf_counter(); Base.metadata.create_all(bind=engine); print(time.perf_counter() - start)"
+    )
+    samples = []
+    for _ in range(runs):
+        output = subprocess.run([sys.executable, "-c", code], cwd=BACKEND_DIR, env=env, check=True,
+                                capture_output=True, text=True).stdout
+        samples.append(float(output.strip().splitlines()[-1]))
+    return statistics.median(samples)
+
+
+def time_workers_ready(env: dict, workers: int, port: int, timeout: float = 60) -> float:
+    start = time.perf_counter()
+    server = subprocess.Popen(
+        [sys.executable, "-m", "uvicorn", "app.main:app", "--port", str(port), "--workers", str(workers)],
+        cwd=BACKEND_DIR, env=env, stdout=subprocess.DEVNULL, stderr=subprocess.PIPE, text=True,
+    )
+    ready = threading.Event()
+
+    def watch():
+        started = 0
+        for line in server.stderr:
+            if "Application startup complete" in line:
+                started += 1
+                if started == workers:
+                    ready.set()
+
+    threading.Thread(target=watch, daemon=True).start()
+    try:
+        if not ready.wait(timeout):
+            raise RuntimeError(f"{workers} workers did not start within {timeout} s")
+        while True:
+            try:
+                httpx.get(f"http://127.0.0.1:{port}/", timeout=1).raise_for_status()
+                break
+            except httpx.HTTPError:
+                time.sleep(0.01)
+        return time.perf_counter() - start
+    finally:
+        server.terminate()
+        server.wait()
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--workers", type=int, nargs="+", default=[1, 2, 4])
+    parser.add_argument("--runs", type=int, default=3)
+    parser.add_argument("--port", type=int, default=8767)
+    parser.add_argument("--target", type=float, default=2.0, help="seconds per wave of workers until all serve")
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        env = dict(os.environ, DATABASE_URL=f"sqlite:///{os.path.join(tmp, 'startup.db')}")
+        subprocess.run([sys.executable, "-m", "alembic", "upgrade", "head"], cwd=BACKEND_DIR, env=env, check=True,
+                       stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
+
+        print(f"import app.main:                  {time_import(env, args.runs) * 1000:7.0f} ms")
+        print(f"create_all on a migrated schema:  {time_create_all(env, args.runs) * 1000:7.1f} ms (no longer at import)")
+        slowest = 0.0
+        for workers in args.workers:
+            ready = statistics.median(time_workers_ready(env, workers, args.port) for _ in range(args.runs))
+            per_wave = ready / math.ceil(workers / (os.cpu_count() or 1))
+            slowest = max(slowest, per_wave)
+            print(f"{workers} worker(s) serving after:     {ready * 1000:7.0f} ms  ({per_wave * 1000:.0f} ms per wave)")
+
+    if slowest > args.target:
+        print(f"FAIL: {slowest:.2f} s per wave exceeds the {args.target:.2f} s target")
+        return 1
+    print(f"ok: within the {args.target:.2f} s per wave target ({os.cpu_count()} CPUs)")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
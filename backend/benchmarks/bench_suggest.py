@@ -0,0 +1,198 @@
+"""GET /videos/suggest: trigram suggest index at 1M titles, and incremental updates.
+
+Index: builds the in-memory index over `--titles` synthetic titles (the
+benchmark words plus a long tail of made-up ones, so the vocabulary is
+realistic) and reports build time, memory and the latency of prefix, typo
+and multi-word queries. Fails if p99 is over `--max-p99-ms` or if typo
+queries mostly miss the word they misspell.
+
+API: seeds `--api-videos` videos, loads the index the way the app does, and
+checks over ASGI that a misspelled query finds its titles and that a created,
+renamed and deleted video shows up in, moves in and leaves the suggestions
+within SUGGEST_REFRESH_INTERVAL.
+
+Run from the backend directory:
+
+    python -m benchmarks.bench_suggest --titles 1000000
+"""
+import argparse
+import asyncio
+import os
+import random
+import resource
+import statistics
+import sys
+import tempfile
+import time
+
+import httpx
+
+from benchmarks.seed import WORDS
+from benchmarks.suite import PASSWORD, seed_database
+
+SYLLABLES = ["ka", "lo", "mi", "ne", "ru", "sa", "to", "vi", "zen", "qua", "tor", "bel", "dor", "fin", "gra", "hex"]
+
+
+def made_up_words(count: int, rng: random.Random) -> list:
+    words = set()
+    while len(words) < count:
+        words.add("".join(rng.choice(SYLLABLES) for _ in range(rng.randint(2, 4))))
+    return sorted(words)
+
+
+def misspell(word: str, rng: random.Random) -> str:
+    i = rng.randrange(1, len(word) - 1)
+    edit = rng.choice(("drop", "swap", "replace"))
+    if edit == "drop":
+        return word[:i] + word[i + 1:]
+    if edit == "swap":
+        return word[:i] + word[i + 1] + word[i] + word[i + 2:]
+    return word[:i] + rng.choice("aeiou") + word[i + 1:]
+
+
+def bench_index(args) -> bool:
+    from app.suggest import SuggestIndex
+
+    rng = random.Random(42)
+    tail = made_up_words(args.vocabulary, rng)
+    titles = [
+        " ".join([*(rng.choice(WORDS) for _ in range(3)), rng.choice(tail)]).title()
+        for _ in range(args.titles)
+    ]
+    rss_before = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    index = SuggestIndex()
+    start = time.perf_counter()
+    index.index_many(enumerate(titles, 1))
+    build = time.perf_counter() - start
+    # ru_maxrss is in KiB on Linux; the titles themselves were already allocated
+    memory = (resource.getrusage(resource.RUSAGE_SELF).ru_maxrss - rss_before) / 1024
+    stats = index.stats()
+    print(f"index: {stats['videos']} titles, {stats['terms']} terms, {stats['postings']} postings, "
+          f"built in {build:.1f} s, +{memory:.0f} MB RSS")
+
+    queries = {"prefix": [], "typo": [], "multi-word": [], "tail prefix": []}
+    for _ in range(args.queries):
+        word = rng.choice(WORDS)
+        queries["prefix"].append((word[:rng.randint(1, len(word))], None))
+        typo_word = rng.choice([w for w in WORDS if len(w) >= 5])
+        queries["typo"].append((misspell(typo_word, rng), typo_word))
+        queries["multi-word"].append((f"{rng.choice(WORDS)} {misspell(rng.choice(WORDS[:20]), rng)[:4]}", None))
+        tail_word = rng.choice(tail)
+        queries["tail prefix"].append((tail_word[:max(3, len(tail_word) - 2)], None))
+
+    ok = True
+    for kind, batch in queries.items():
+        latencies, hits, empty = [], 0, 0
+        for query, expected in batch:
+            start = time.perf_counter()
+            items = index.suggest(query, args.limit)
+            latencies.append((time.perf_counter() - start) * 1000)
+            empty += not items
+            if expected and items and expected in items[0][1].lower():
+                hits += 1
+        latencies.sort()
+        p99 = latencies[int(len(latencies) * 0.99)]
+        line = (f"{kind:>12}: p50 {statistics.median(latencies):5.2f} ms  p99 {p99:5.2f} ms  "
+                f"max {latencies[-1]:5.2f} ms  empty {empty}/{len(batch)}")
+        if kind == "typo":
+            line += f"  top hit has the intended word {hits}/{len(batch)}"
+            if hits < 0.9 * len(batch):
+                line += "  TOO FEW"
+                ok = False
+        if p99 > args.max_p99_ms:
+            line += f"  OVER {args.max_p99_ms} ms"
+            ok = False
+        print(line)
+    return ok
+
+
+async def bench_api(args) -> bool:
+    from app.changes import change_feed
+    from app.database import dispose_engines
+    from app.hashing import hashing_executor
+    from app.main import app
+    from app.suggest import suggest_index
+    from benchmarks.seed import user_email
+
+    problems = []
+    start = time.perf_counter()
+    # The lifespan does this; ASGITransport does not run it
+    suggest_index.start()
+    while not suggest_index.complete:
+        await asyncio.sleep(0.05)
+    print(f"api: loaded {suggest_index.size} videos from the database in {time.perf_counter() - start:.1f} s")
+
+    async def suggestions(client, q: str) -> list:
+        response = await client.get("/videos/suggest", params={"q": q})
+        response.raise_for_status()
+        return response.json()["items"]
+
+    async def wait_for(client, q: str, check) -> float:
+        start = time.perf_counter()
+        deadline = start + suggest_index.refresh_interval * 3
+        while time.perf_counter() < deadline:
+            if check(await suggestions(client, q)):
+                return time.perf_counter() - start
+            await asyncio.sleep(0.02)
+        return float("nan")
+
+    transport = httpx.ASGITransport(app=app)
+    async with httpx.AsyncClient(transport=transport, base_url="http://bench") as client:
+        items = await suggestions(client, "pythn tutorail")
+        if not items or not all("python" in item["title"].lower() for item in items):
+            problems.append("'pythn tutorail' did not suggest python titles")
+        login = await client.post("/api/login", json={"email": user_email(1), "password": PASSWORD})
+        client.headers["Authorization"] = f"Bearer {login.json()['access_token']}"
+        created = await client.post("/videos/", json={
+            "title": "Zymurgy Masterclass", "description": "brewing", "youtube_url": "https://youtu.be/zymurgy0001",
+            "uploaded_by": 1,
+        })
+        video_id = created.json()["id"]
+        steps = (
+            ("create", lambda: None, "zymurg", lambda items: any(item["id"] == video_id for item in items)),
+            ("rename", lambda: client.put(f"/videos/{video_id}", json={"title": "Oenology Masterclass"}),
+             "oenolgy", lambda items: any(item["id"] == video_id for item in items)),
+            ("delete", lambda: client.delete(f"/videos/{video_id}"),
+             "oenology", lambda items: all(item["id"] != video_id for item in items)),
+        )
+        for name, write, q, check in steps:
+            pending = write()
+            if pending is not None:
+                (await pending).raise_for_status()
+            seconds = await wait_for(client, q, check)
+            if seconds != seconds:
+                problems.append(f"{name} not reflected within {suggest_index.refresh_interval * 3:.1f} s")
+            else:
+                print(f"api: {name} visible in suggestions after {seconds * 1000:.0f} ms")
+
+    await suggest_index.stop()
+    await change_feed.stop()
+    hashing_executor.shutdown()
+    await dispose_engines()
+    print(f"api: {'; '.join(problems) or 'incremental updates ok'}")
+    return not problems
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--titles", type=int, default=1_000_000)
+    parser.add_argument("--vocabulary", type=int, default=50_000, help="made-up words in the titles' long tail")
+    parser.add_argument("--queries", type=int, default=500, help="queries per kind")
+    parser.add_argument("--limit", type=int, default=10)
+    parser.add_argument("--max-p99-ms", type=float, default=5.0)
+    parser.add_argument("--api-videos", type=int, default=20_000)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        database_url = f"sqlite:///{os.path.join(tmp, 'suggest.db')}"
+        # Read at import by app.config
+        os.environ.update(DATABASE_URL=database_url, METRICS_ENABLED="0", JOBS_ENABLED="0",
+                          YOUTUBE_ENRICHER="stub", SUGGEST_REFRESH_INTERVAL="0.2")
+        ok = bench_index(args)
+        seed_database(database_url, 10, args.api_videos)
+        ok = asyncio.run(bench_api(args)) and ok
+    return 0 if ok else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,97 @@
+"""Update/delete write path: ORM load-mutate-refresh vs. one statement with RETURNING.
+
+Both variants run against the same async session setup as the API, on a
+freshly seeded scratch database each, and report writes/s and SQL
+statements per write.
+
+Run from the backend directory:
+
+    python -m benchmarks.bench_writes --rows 20000 --writes 5000
+"""
+import argparse
+import asyncio
+import os
+import tempfile
+import time
+
+from sqlalchemy import create_engine, delete, event, update
+from sqlalchemy.ext.asyncio import async_sessionmaker, create_async_engine
+from sqlalchemy.orm import sessionmaker
+
+from app.models import Base, Video
+from benchmarks.seed import seed_catalog
+
+
+async def orm_update(db, video_id, i):
+    video = await db.get(Video, video_id)
+    video.title = f"Updated {i}"
+    await db.commit()
+    await db.refresh(video)
+    return video
+
+
+async def returning_update(db, video_id, i):
+    stmt = update(Video).where(Video.id == video_id).values(title=f"Updated {i}").returning(*Video.__table__.c)
+    row = (await db.execute(stmt.execution_options(synchronize_session=False))).first()
+    await db.commit()
+    return row
+
+
+async def orm_delete(db, video_id, i):
+    video = await db.get(Video, video_id)
+    await db.delete(video)
+    await db.commit()
+
+
+async def returning_delete(db, video_id, i):
+    stmt = delete(Video).where(Video.id == video_id).returning(Video.id)
+    await db.scalar(stmt.execution_options(synchronize_session=False))
+    await db.commit()
+
+
+async def measure(url: str, write, writes: int) -> dict:
+    engine = create_async_engine(url)
+    statements = 0
+
+    def count(*args):
+        nonlocal statements
+        statements += 1
+
+    event.listen(engine.sync_engine, "before_cursor_execute", count)
+    Session = async_sessionmaker(engine, autoflush=False, expire_on_commit=False)
+    start = time.perf_counter()
+    for i in range(writes):
+        # One session per write, as with the get_db dependency
+        async with Session() as db:
+            await write(db, 1 + i, i)
+    elapsed = time.perf_counter() - start
+    await engine.dispose()
+    return {"writes_per_s": writes / elapsed, "statements_per_write": statements / writes}
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--rows", type=int, default=20_000)
+    parser.add_argument("--writes", type=int, default=5000)
+    args = parser.parse_args()
+
+    variants = [
+        ("update", "orm", orm_update), ("update", "returning", returning_update),
+        ("delete", "orm", orm_delete), ("delete", "returning", returning_delete),
+    ]
+    with tempfile.TemporaryDirectory() as tmp:
+        for operation, name, write in variants:
+            path = os.path.join(tmp, f"{operation}-{name}.db")
+            engine = create_engine(f"sqlite:///{path}")
+            Base.metadata.create_all(bind=engine)
+            with sessionmaker(bind=engine)() as session:
+                seed_catalog(session, args.rows)
+            engine.dispose()
+
+            result = asyncio.run(measure(f"sqlite+aiosqlite:///{path}", write, args.writes))
+            print(f"{operation:>6} {name:>9}: {result['writes_per_s']:8.1f} writes/s  "
+                  f"{result['statements_per_write']:.1f} statements/write")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,96 @@
+"""Query-plan check: fails if a hot query scans a whole table or sorts in a temp B-tree.
+
+Builds the statements the endpoints actually issue, runs EXPLAIN QUERY PLAN
+for each against a seeded, ANALYZEd scratch database, prints the plans and
+exits non-zero on the first regression. Offset paging of GET /videos is a
+rowid-order scan bounded by LIMIT + OFFSET and is deliberately not listed;
+its keyset form is. ALLOWED_STEPS lists the sorts a query needs by design.
+
+Run from the backend directory:
+
+    python -m benchmarks.check_query_plans
+"""
+import os
+import re
+import sys
+import tempfile
+
+from sqlalchemy import create_engine, delete, or_, select, update
+from sqlalchemy.dialects import sqlite
+from sqlalchemy.orm import sessionmaker
+
+from app.models import Base, IdempotencyKey, User, Video
+from app.pagination import encode_cursor, keyset_query
+from app.responses import VIDEO_COLUMNS
+from app.search import apply_search
+from benchmarks.seed import seed_catalog
+
+FULL_SCAN = re.compile(r"^SCAN (?!videos_fts\b)")
+
+ALLOWED_STEPS = {
+    # Ranking sorts every match by (rank, id); FTS5 would sort them by rank anyway
+    "search videos": {"USE TEMP B-TREE FOR ORDER BY"},
+}
+
+HOT_QUERIES = {
+    "get video by id": select(Video).where(Video.id == 42),
+    "list videos, keyset page": keyset_query(select(*VIDEO_COLUMNS), Video.id, encode_cursor(500), 20),
+    "search videos": apply_search(select(*VIDEO_COLUMNS), "python tutorial").limit(20),
+    "user videos, offset page": (
+        select(*VIDEO_COLUMNS).where(Video.uploaded_by == 3).order_by(Video.id).offset(40).limit(20)
+    ),
+    "user videos, keyset page": keyset_query(
+        select(*VIDEO_COLUMNS).where(Video.uploaded_by == 3).order_by(Video.id), Video.id, encode_cursor(500), 20,
+    ),
+    "user exists": select(User.id).where(User.id == 3),
+    "user by email (login, auth)": select(User).where(User.email == "user3@example.com"),
+    "video by youtube_url (bulk import)": select(Video.id).where(Video.youtube_url == "https://youtu.be/x"),
+    "duplicate video on create": select(*Video.__table__.c).where(
+        or_(Video.youtube_url == "https://youtu.be/x", Video.youtube_id == "xxxxxxxxxxx")
+    ),
+    "idempotency key replay": select(IdempotencyKey.request_hash, IdempotencyKey.response).where(
+        IdempotencyKey.user_id == 3, IdempotencyKey.key == "k", IdempotencyKey.created_at >= 0,
+    ),
+    "update video": update(Video).where(Video.id == 42).values(title="t").returning(*Video.__table__.c),
+    "delete video": delete(Video).where(Video.id == 42).returning(Video.id),
+    "delete user's videos": delete(Video).where(Video.uploaded_by == 3),
+}
+
+
+def explain(connection, statement) -> list:
+    compiled = statement.compile(dialect=sqlite.dialect())
+    params = tuple(compiled.params[name] for name in compiled.positiontup)
+    rows = connection.exec_driver_sql(f"EXPLAIN QUERY PLAN {compiled}", params).all()
+    return [row[-1] for row in rows]
+
+
+def main() -> int:
+    failures = []
+    with tempfile.TemporaryDirectory() as tmp:
+        engine = create_engine(f"sqlite:///{os.path.join(tmp, 'plans.db')}")
+        Base.metadata.create_all(bind=engine)
+        with sessionmaker(bind=engine)() as session:
+            seed_catalog(session, 20_000, users=50)
+        with engine.connect() as connection:
+            connection.exec_driver_sql("ANALYZE")
+            for name, statement in HOT_QUERIES.items():
+                plan = explain(connection, statement)
+                bad = [
+                    step for step in plan
+                    if (FULL_SCAN.match(step) or "TEMP B-TREE" in step) and step not in ALLOWED_STEPS.get(name, ())
+                ]
+                print(f"{'FAIL' if bad else 'ok  '}  {name}")
+                for step in plan:
+                    print(f"        {step}")
+                if bad:
+                    failures.append(name)
+        engine.dispose()
+
+    if failures:
+        print(f"\n{len(failures)} hot queries fall back to a full scan or sort: {', '.join(failures)}")
+        return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,48 @@
+"""Synthetic catalog data shared by the benchmarks."""
+import random
+
+from app.models import User, Video
+
+WORDS = [
+    "python", "javascript", "react", "fastapi", "sql", "databases", "algebra",
+    "calculus", "physics", "chemistry", "biology", "history", "music", "guitar",
+    "drawing", "painting", "cooking", "baking", "finance", "statistics",
+    "machine", "learning", "networks", "security", "linux", "docker", "cloud",
+    "intro", "advanced", "beginner", "tutorial", "lecture", "workshop", "course",
+]
+BATCH_SIZE = 10_000
+
+
+def user_email(i: int) -> str:
+    return f"user{i}@example.com"
+
+
+def seed_catalog(session, size: int, title_suffix=None, seed: int = 0, users: int = 1,
+                 password_hash: str = "x") -> None:
+    """Inserts `users` owners and `size` videos with random titles and descriptions.
+
+    Users get ids 1..users and the emails from `user_email`; videos are spread
+    across them round-robin. `title_suffix(i)` may return extra text to append
+    to the i-th title.
+    """
+    rng = random.Random(seed or size)
+    session.execute(User.__table__.insert(), [
+        dict(id=i, name=f"User {i}", email=user_email(i), password=password_hash)
+        for i in range(1, users + 1)
+    ])
+    batch = []
+    for i in range(size):
+        title = " ".join(rng.choice(WORDS) for _ in range(4)).title()
+        suffix = title_suffix(i) if title_suffix else None
+        if suffix:
+            title = f"{title} {suffix}"
+        description = " ".join(rng.choice(WORDS) for _ in range(12))
+        batch.append(dict(title=title, description=description,
+                          youtube_url=f"https://youtu.be/{i:011d}", youtube_id=f"{i:011d}",
+                          uploaded_by=1 + i % users))
+        if len(batch) == BATCH_SIZE:
+            session.execute(Video.__table__.insert(), batch)
+            batch.clear()
+    if batch:
+        session.execute(Video.__table__.insert(), batch)
+    session.commit()
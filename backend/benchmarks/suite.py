@@ -0,0 +1,297 @@
+"""API benchmark suite: seeds a scratch database and drives every hot endpoint.
+
+Each scenario runs `--concurrency` client tasks for `--duration` seconds,
+either in-process through httpx's ASGI transport or over HTTP against a
+uvicorn subprocess. Results (throughput, p50/p95/p99 latency, status codes)
+are printed and optionally written as JSON; pass `--baseline` with an
+earlier JSON report to see the change per scenario.
+
+Run from the backend directory:
+
+    python -m benchmarks --transport asgi --users 100 --videos 10000 \\
+        --concurrency 32 --duration 5 --output results.json
+    python -m benchmarks --transport uvicorn --baseline results.json
+"""
+import argparse
+import asyncio
+import contextlib
+import itertools
+import json
+import os
+import platform
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+from collections import Counter
+
+import httpx
+
+BACKEND_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+PASSWORD = "benchmark-password"
+SEARCH_TERMS = ["python", "calc", "react tutorial", "machine learning", "dock", "guitar"]
+
+
+class Context:
+    """State shared by the scenarios of one run."""
+
+    def __init__(self, users: int, videos: int):
+        self.users = users
+        self.videos = videos
+        self.run_id = f"{os.getpid()}-{int(time.time())}"
+        self.counter = itertools.count()
+        self.headers = {}
+
+
+async def scenario_list(client, ctx, i):
+    return await client.get("/videos/", params={"limit": 20, "offset": (i * 20) % ctx.videos})
+
+
+async def scenario_search(client, ctx, i):
+    return await client.get("/videos/", params={"search": SEARCH_TERMS[i % len(SEARCH_TERMS)], "limit": 20})
+
+
+async def scenario_get(client, ctx, i):
+    return await client.get(f"/videos/{1 + (i * 7919) % ctx.videos}")
+
+
+async def scenario_create(client, ctx, i):
+    n = next(ctx.counter)
+    return await client.post("/videos/", headers=ctx.headers, json={
+        "title": f"Benchmark video {n}",
+        "description": "Created by the benchmark suite",
+        "youtube_url": f"https://youtu.be/bench-{ctx.run_id}-{n}",
+        "uploaded_by": 1,
+    })
+
+
+async def scenario_update(client, ctx, i):
+    # A video of user 1, who is logged in: seeded video n belongs to user 1 + n % users
+    n = (i * 104729) % max(1, ctx.videos // ctx.users) * ctx.users
+    return await client.put(f"/videos/{1 + n}", headers=ctx.headers, json={"title": f"Updated title {i}"})
+
+
+async def scenario_register(client, ctx, i):
+    n = next(ctx.counter)
+    return await client.post("/api/register", json={
+        "name": "Benchmark user", "email": f"bench-{ctx.run_id}-{n}@example.com", "password": PASSWORD,
+    })
+
+
+async def scenario_login(client, ctx, i):
+    from benchmarks.seed import user_email
+
+    return await client.post("/api/login", json={"email": user_email(1 + i % ctx.users), "password": PASSWORD})
+
+
+SCENARIOS = {
+    "list": scenario_list,
+    "search": scenario_search,
+    "get": scenario_get,
+    "create": scenario_create,
+    "update": scenario_update,
+    "register": scenario_register,
+    "login": scenario_login,
+}
+
+
+def seed_database(database_url: str, users: int, videos: int) -> None:
+    from passlib.context import CryptContext
+    from sqlalchemy import create_engine
+    from sqlalchemy.orm import sessionmaker
+
+    from app.models import Base
+    from benchmarks.seed import seed_catalog
+
+    # Hash once: every seeded user shares the same password
+    password_hash = CryptContext(schemes=["bcrypt"]).hash(PASSWORD)
+    engine = create_engine(database_url)
+    Base.metadata.create_all(bind=engine)
+    with sessionmaker(bind=engine)() as session:
+        seed_catalog(session, videos, users=users, password_hash=password_hash)
+    engine.dispose()
+
+
+async def run_scenario(client, ctx, scenario, concurrency: int, duration: float) -> dict:
+    latencies = []
+    statuses = Counter()
+    sequence = itertools.count()
+    deadline = time.perf_counter() + duration
+
+    async def worker():
+        while time.perf_counter() < deadline:
+            i = next(sequence)
+            start = time.perf_counter()
+            try:
+                response = await scenario(client, ctx, i)
+                statuses[str(response.status_code)] += 1
+            except httpx.HTTPError as e:
+                statuses[type(e).__name__] += 1
+            latencies.append((time.perf_counter() - start) * 1000)
+
+    started = time.perf_counter()
+    await asyncio.gather(*(worker() for _ in range(concurrency)))
+    elapsed = time.perf_counter() - started
+
+    if len(latencies) < 2:
+        latencies = latencies * 2 or [0.0, 0.0]
+    cuts = statistics.quantiles(latencies, n=100)
+    errors = sum(count for status, count in statuses.items() if not status.startswith(("2", "3")))
+    return {
+        "requests": sum(statuses.values()),
+        "errors": errors,
+        "rps": sum(statuses.values()) / elapsed,
+        "p50_ms": cuts[49],
+        "p95_ms": cuts[94],
+        "p99_ms": cuts[98],
+        "statuses": dict(statuses),
+    }
+
+
+async def run_all(client, ctx, scenarios, concurrency: int, duration: float) -> dict:
+    from benchmarks.seed import user_email
+
+    login = await client.post("/api/login", json={"email": user_email(1), "password": PASSWORD})
+    login.raise_for_status()
+    ctx.headers = {"Authorization": f"Bearer {login.json()['access_token']}"}
+
+    results = {}
+    for name in scenarios:
+        results[name] = await run_scenario(client, ctx, SCENARIOS[name], concurrency, duration)
+        print_result(name, results[name])
+    return results
+
+
+@contextlib.asynccontextmanager
+async def asgi_client(concurrency: int):
+    from app.database import dispose_engines
+    from app.hashing import hashing_executor
+    from app.main import app
+
+    transport = httpx.ASGITransport(app=app)
+    try:
+        async with httpx.AsyncClient(transport=transport, base_url="http://bench", timeout=60) as client:
+            yield client
+    finally:
+        hashing_executor.shutdown()
+        await dispose_engines()
+
+
+@contextlib.contextmanager
+def uvicorn_server(database_url: str, port: int, app: str = "app.main:app", workers: int = 1):
+    """Runs the app in a uvicorn subprocess and yields its base URL."""
+    env = dict(os.environ, DATABASE_URL=database_url)
+    server = subprocess.Popen(
+        [sys.executable, "-m", "uvicorn", app, "--port", str(port), "--workers", str(workers),
+         "--log-level", "warning"],
+        cwd=BACKEND_DIR, env=env,
+    )
+    base_url = f"http://127.0.0.1:{port}"
+    try:
+        deadline = time.time() + 30
+        while True:
+            try:
+                httpx.get(base_url + "/", timeout=1)
+                break
+            except httpx.HTTPError:
+                if time.time() > deadline or server.poll() is not None:
+                    raise RuntimeError(f"uvicorn did not start on port {port}")
+                time.sleep(0.2)
+        yield base_url
+    finally:
+        server.terminate()
+        server.wait()
+
+
+@contextlib.asynccontextmanager
+async def http_client(base_url: str, concurrency: int):
+    limits = httpx.Limits(max_connections=concurrency, max_keepalive_connections=concurrency)
+    async with httpx.AsyncClient(base_url=base_url, limits=limits, timeout=60) as client:
+        yield client
+
+
+def print_result(name: str, result: dict, baseline: dict = None) -> None:
+    line = (f"{name:>9}: {result['rps']:9.1f} req/s  p50 {result['p50_ms']:8.2f}  "
+            f"p95 {result['p95_ms']:8.2f}  p99 {result['p99_ms']:8.2f} ms  errors {result['errors']}")
+    if baseline:
+        rps_change = (result["rps"] / baseline["rps"] - 1) * 100 if baseline["rps"] else 0.0
+        p95_change = (result["p95_ms"] / baseline["p95_ms"] - 1) * 100 if baseline["p95_ms"] else 0.0
+        line += f"  | vs baseline: rps {rps_change:+6.1f}%  p95 {p95_change:+6.1f}%"
+    print(line)
+
+
+def compare(results: dict, baseline: dict, max_regression: float) -> bool:
+    """Prints the comparison and returns False if any scenario regressed too far."""
+    print("\nComparison with baseline:")
+    ok = True
+    for name, result in results.items():
+        previous = baseline.get("scenarios", {}).get(name)
+        print_result(name, result, previous)
+        if previous and previous["rps"] and max_regression is not None:
+            if result["rps"] < previous["rps"] * (1 - max_regression / 100):
+                ok = False
+    return ok
+
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(prog="python -m benchmarks", description=__doc__.splitlines()[0])
+    parser.add_argument("--transport", choices=["asgi", "uvicorn"], default="asgi")
+    parser.add_argument("--users", type=int, default=100)
+    parser.add_argument("--videos", type=int, default=10_000)
+    parser.add_argument("--concurrency", type=int, default=32)
+    parser.add_argument("--duration", type=float, default=5.0, help="seconds per scenario")
+    parser.add_argument("--scenarios", nargs="+", choices=list(SCENARIOS), default=list(SCENARIOS))
+    parser.add_argument("--port", type=int, default=8766)
+    parser.add_argument("--workers", type=int, default=1, help="uvicorn workers (uvicorn transport)")
+    parser.add_argument("--output", help="write the JSON report to this file")
+    parser.add_argument("--baseline", help="JSON report to compare against")
+    parser.add_argument("--max-regression", type=float, default=None,
+                        help="exit non-zero if any scenario loses more than this percent of req/s")
+    return parser.parse_args(argv)
+
+
+def main(argv=None) -> int:
+    args = parse_args(argv)
+    with tempfile.TemporaryDirectory() as tmp:
+        database_url = f"sqlite:///{os.path.join(tmp, 'bench.db')}"
+        # Must be set before the app is imported (ASGI transport)
+        os.environ["DATABASE_URL"] = database_url
+        # Every client shares one IP; the login limiter would turn the scenario into 429s
+        os.environ.setdefault("RATE_LIMIT_ENABLED", "0")
+        sys.path.insert(0, BACKEND_DIR)
+        seed_database(database_url, args.users, args.videos)
+        ctx = Context(args.users, args.videos)
+
+        async def run():
+            if args.transport == "asgi":
+                async with asgi_client(args.concurrency) as client:
+                    return await run_all(client, ctx, args.scenarios, args.concurrency, args.duration)
+            with uvicorn_server(database_url, args.port, workers=args.workers) as base_url:
+                async with http_client(base_url, args.concurrency) as client:
+                    return await run_all(client, ctx, args.scenarios, args.concurrency, args.duration)
+
+        results = asyncio.run(run())
+
+    report = {
+        "meta": {
+            "transport": args.transport,
+            "users": args.users,
+            "videos": args.videos,
+            "concurrency": args.concurrency,
+            "duration_s": args.duration,
+            "workers": args.workers,
+            "python": platform.python_version(),
+            "cpus": os.cpu_count(),
+            "timestamp": time.strftime("%Y-%m-%dT%H:%M:%S%z"),
+        },
+        "scenarios": results,
+    }
+    if args.output:
+        with open(args.output, "w") as f:
+            json.dump(report, f, indent=2)
+    if args.baseline:
+        with open(args.baseline) as f:
+            if not compare(results, json.load(f), args.max_regression):
+                return 1
+    return 0
@@ -1,3 +1,4 @@
+import os
 from logging.config import fileConfig
 
 from sqlalchemy import engine_from_config
@@ -19,6 +20,11 @@ if config.config_file_name is not None:
 from app.models import Base
 target_metadata = Base.metadata
 
+# Migrate the same database the app uses (DATABASE_URL overrides alembic.ini)
+from app.config import settings
+if os.getenv("DATABASE_URL"):
+    config.set_main_option("sqlalchemy.url", settings.database_url)
+
 # other values from the config, defined by the needs of env.py,
 # can be acquired:
 # my_important_option = config.get_main_option("my_important_option")
@@ -0,0 +1,52 @@
+"""Add full-text search index for videos
+
+Revision ID: 3f6b2c9e1d47
+Revises: d32012bedae7
+Create Date: 2026-10-18 09:12:31.402118
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '3f6b2c9e1d47'
+down_revision: Union[str, None] = 'd32012bedae7'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.execute(
+        "CREATE VIRTUAL TABLE IF NOT EXISTS videos_fts USING fts5("
+        "title, description, content='videos', content_rowid='id', "
+        "tokenize='unicode61 remove_diacritics 2')"
+    )
+    op.execute("INSERT INTO videos_fts(videos_fts, rank) VALUES ('rank', 'bm25(10.0, 1.0)')")
+    op.execute(
+        "CREATE TRIGGER IF NOT EXISTS videos_fts_ai AFTER INSERT ON videos BEGIN "
+        "INSERT INTO videos_fts(rowid, title, description) VALUES (new.id, new.title, new.description); "
+        "END"
+    )
+    op.execute(
+        "CREATE TRIGGER IF NOT EXISTS videos_fts_ad AFTER DELETE ON videos BEGIN "
+        "INSERT INTO videos_fts(videos_fts, rowid, title, description) VALUES ('delete', old.id, old.title, old.description); "
+        "END"
+    )
+    op.execute(
+        "CREATE TRIGGER IF NOT EXISTS videos_fts_au AFTER UPDATE OF title, description ON videos BEGIN "
+        "INSERT INTO videos_fts(videos_fts, rowid, title, description) VALUES ('delete', old.id, old.title, old.description); "
+        "INSERT INTO videos_fts(rowid, title, description) VALUES (new.id, new.title, new.description); "
+        "END"
+    )
+    # Index the rows that already exist
+    op.execute("INSERT INTO videos_fts(videos_fts) VALUES ('rebuild')")
+
+
+def downgrade() -> None:
+    op.execute("DROP TRIGGER IF EXISTS videos_fts_au")
+    op.execute("DROP TRIGGER IF EXISTS videos_fts_ad")
+    op.execute("DROP TRIGGER IF EXISTS videos_fts_ai")
+    op.execute("DROP TABLE IF EXISTS videos_fts")
@@ -0,0 +1,62 @@
+"""Add background job outbox and video metadata tables
+
+Revision ID: 5d8e1f3a9c20
+Revises: 7c41d9a2b8e5
+Create Date: 2026-10-18 14:21:40.118273
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '5d8e1f3a9c20'
+down_revision: Union[str, None] = '7c41d9a2b8e5'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.create_table('jobs',
+    sa.Column('id', sa.Integer(), nullable=False),
+    sa.Column('kind', sa.String(), nullable=False),
+    sa.Column('payload', sa.Text(), nullable=False),
+    sa.Column('idempotency_key', sa.String(), nullable=False),
+    sa.Column('status', sa.String(), nullable=False),
+    sa.Column('attempts', sa.Integer(), nullable=False),
+    sa.Column('max_attempts', sa.Integer(), nullable=False),
+    sa.Column('run_at', sa.Float(), nullable=False),
+    sa.Column('locked_until', sa.Float(), nullable=True),
+    sa.Column('last_error', sa.Text(), nullable=True),
+    sa.Column('created_at', sa.Float(), nullable=False),
+    sa.Column('finished_at', sa.Float(), nullable=True),
+    sa.PrimaryKeyConstraint('id'),
+    sa.UniqueConstraint('idempotency_key')
+    )
+    op.create_index('ix_jobs_status_run_at', 'jobs', ['status', 'run_at'], unique=False)
+    op.create_table('video_metadata',
+    sa.Column('video_id', sa.Integer(), nullable=False),
+    sa.Column('youtube_url', sa.String(), nullable=False),
+    sa.Column('youtube_id', sa.String(), nullable=True),
+    sa.Column('thumbnail_url', sa.String(), nullable=True),
+    sa.Column('title', sa.String(), nullable=True),
+    sa.Column('author_name', sa.String(), nullable=True),
+    sa.Column('duration_seconds', sa.Integer(), nullable=True),
+    sa.Column('fetched_at', sa.Float(), nullable=False),
+    sa.ForeignKeyConstraint(['video_id'], ['videos.id'], ),
+    sa.PrimaryKeyConstraint('video_id')
+    )
+    op.execute(
+        "CREATE TRIGGER IF NOT EXISTS video_metadata_ad AFTER DELETE ON videos BEGIN "
+        "DELETE FROM video_metadata WHERE video_id = old.id; "
+        "END"
+    )
+
+
+def downgrade() -> None:
+    op.execute("DROP TRIGGER IF EXISTS video_metadata_ad")
+    op.drop_table('video_metadata')
+    op.drop_index('ix_jobs_status_run_at', table_name='jobs')
+    op.drop_table('jobs')
@@ -0,0 +1,56 @@
+"""Add access-pattern indexes and restore NOT NULL on videos
+
+Revision ID: 7c41d9a2b8e5
+Revises: 3f6b2c9e1d47
+Create Date: 2026-10-18 11:02:17.553091
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '7c41d9a2b8e5'
+down_revision: Union[str, None] = '3f6b2c9e1d47'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+# SQLite drops a table's triggers with it, and batch mode recreates videos
+FTS_TRIGGERS = [
+    "CREATE TRIGGER IF NOT EXISTS videos_fts_ai AFTER INSERT ON videos BEGIN "
+    "INSERT INTO videos_fts(rowid, title, description) VALUES (new.id, new.title, new.description); "
+    "END",
+    "CREATE TRIGGER IF NOT EXISTS videos_fts_ad AFTER DELETE ON videos BEGIN "
+    "INSERT INTO videos_fts(videos_fts, rowid, title, description) VALUES ('delete', old.id, old.title, old.description); "
+    "END",
+    "CREATE TRIGGER IF NOT EXISTS videos_fts_au AFTER UPDATE OF title, description ON videos BEGIN "
+    "INSERT INTO videos_fts(videos_fts, rowid, title, description) VALUES ('delete', old.id, old.title, old.description); "
+    "INSERT INTO videos_fts(rowid, title, description) VALUES (new.id, new.title, new.description); "
+    "END",
+]
+
+
+def _recreate_videos(nullable: bool) -> None:
+    # Rows with a NULL title, URL or owner make the copy fail; fix them by hand first
+    with op.batch_alter_table('videos', recreate='always') as batch_op:
+        batch_op.alter_column('title', existing_type=sa.VARCHAR(), nullable=nullable)
+        batch_op.alter_column('youtube_url', existing_type=sa.VARCHAR(), nullable=nullable)
+        batch_op.alter_column('uploaded_by', existing_type=sa.INTEGER(), nullable=nullable)
+    for statement in FTS_TRIGGERS:
+        op.execute(statement)
+
+
+def upgrade() -> None:
+    _recreate_videos(nullable=False)
+    # Redundant with the INTEGER PRIMARY KEY (the rowid)
+    op.drop_index('ix_videos_id', table_name='videos')
+    op.create_index('ix_videos_uploaded_by_id', 'videos', ['uploaded_by', 'id'], unique=False)
+    op.execute("ANALYZE")
+
+
+def downgrade() -> None:
+    op.drop_index('ix_videos_uploaded_by_id', table_name='videos')
+    op.create_index('ix_videos_id', 'videos', ['id'], unique=False)
+    _recreate_videos(nullable=True)
@@ -0,0 +1,60 @@
+"""Add video change log for the changes feed
+
+Revision ID: 9b2f64c1e7d3
+Revises: 5d8e1f3a9c20
+Create Date: 2026-10-18 16:05:12.730415
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '9b2f64c1e7d3'
+down_revision: Union[str, None] = '5d8e1f3a9c20'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+VIDEO_JSON = (
+    "json_object('id', new.id, 'title', new.title, 'description', new.description, "
+    "'youtube_url', new.youtube_url, 'uploaded_by', new.uploaded_by)"
+)
+NOW = "(julianday('now') - 2440587.5) * 86400.0"
+
+CHANGE_TRIGGERS = [
+    "CREATE TRIGGER IF NOT EXISTS video_changes_ai AFTER INSERT ON videos BEGIN "
+    f"INSERT INTO video_changes(video_id, op, data, created_at) VALUES (new.id, 'insert', {VIDEO_JSON}, {NOW}); "
+    "END",
+    "CREATE TRIGGER IF NOT EXISTS video_changes_au AFTER UPDATE ON videos "
+    "WHEN old.title IS NOT new.title OR old.description IS NOT new.description "
+    "OR old.youtube_url IS NOT new.youtube_url OR old.uploaded_by IS NOT new.uploaded_by BEGIN "
+    f"INSERT INTO video_changes(video_id, op, data, created_at) VALUES (new.id, 'update', {VIDEO_JSON}, {NOW}); "
+    "END",
+    "CREATE TRIGGER IF NOT EXISTS video_changes_ad AFTER DELETE ON videos BEGIN "
+    f"INSERT INTO video_changes(video_id, op, data, created_at) VALUES (old.id, 'delete', NULL, {NOW}); "
+    "END",
+]
+
+
+def upgrade() -> None:
+    op.create_table('video_changes',
+    sa.Column('seq', sa.Integer(), autoincrement=True, nullable=False),
+    sa.Column('video_id', sa.Integer(), nullable=False),
+    sa.Column('op', sa.String(), nullable=False),
+    sa.Column('data', sa.Text(), nullable=True),
+    sa.Column('created_at', sa.Float(), nullable=False),
+    sa.PrimaryKeyConstraint('seq'),
+    sqlite_autoincrement=True
+    )
+    op.create_index('ix_video_changes_created_at', 'video_changes', ['created_at'], unique=False)
+    for statement in CHANGE_TRIGGERS:
+        op.execute(statement)
+
+
+def downgrade() -> None:
+    for name in ('video_changes_ai', 'video_changes_au', 'video_changes_ad'):
+        op.execute(f"DROP TRIGGER IF EXISTS {name}")
+    op.drop_index('ix_video_changes_created_at', table_name='video_changes')
+    op.drop_table('video_changes')
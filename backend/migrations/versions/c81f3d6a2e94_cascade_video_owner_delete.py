@@ -0,0 +1,42 @@
+"""Cascade user deletes to their videos
+
+Revision ID: c81f3d6a2e94
+Revises: e4a7c2d91f58
+Create Date: 2026-10-18 18:20:37.904512
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'c81f3d6a2e94'
+down_revision: Union[str, None] = 'e4a7c2d91f58'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+# Names the unnamed foreign key SQLite reflects, so batch mode can drop it
+NAMING_CONVENTION = {"fk": "fk_%(table_name)s_%(column_0_name)s_%(referred_table_name)s"}
+FK_NAME = 'fk_videos_uploaded_by_users'
+
+
+def _recreate_videos(ondelete: Union[str, None]) -> None:
+    # Rebuilding the table drops its triggers (FTS, metadata, change log, counters); put them back
+    triggers = op.get_bind().execute(
+        sa.text("SELECT sql FROM sqlite_master WHERE type = 'trigger' AND tbl_name = 'videos'")
+    ).scalars().all()
+    with op.batch_alter_table('videos', recreate='always', naming_convention=NAMING_CONVENTION) as batch_op:
+        batch_op.drop_constraint(FK_NAME, type_='foreignkey')
+        batch_op.create_foreign_key(FK_NAME, 'users', ['uploaded_by'], ['id'], ondelete=ondelete)
+    for statement in triggers:
+        op.execute(statement)
+
+
+def upgrade() -> None:
+    _recreate_videos('CASCADE')
+
+
+def downgrade() -> None:
+    _recreate_videos(None)
@@ -20,15 +20,17 @@ depends_on: Union[str, Sequence[str], None] = None
 
 def upgrade() -> None:
     # ### commands auto generated by Alembic - please adjust! ###
-    op.alter_column('videos', 'title',
-               existing_type=sa.VARCHAR(),
-               nullable=True)
-    op.alter_column('videos', 'youtube_url',
-               existing_type=sa.VARCHAR(),
-               nullable=True)
-    op.alter_column('videos', 'uploaded_by',
-               existing_type=sa.INTEGER(),
-               nullable=True)
+    # SQLite cannot ALTER COLUMN; batch mode recreates the table instead
+    with op.batch_alter_table('videos') as batch_op:
+        batch_op.alter_column('title',
+                   existing_type=sa.VARCHAR(),
+                   nullable=True)
+        batch_op.alter_column('youtube_url',
+                   existing_type=sa.VARCHAR(),
+                   nullable=True)
+        batch_op.alter_column('uploaded_by',
+                   existing_type=sa.INTEGER(),
+                   nullable=True)
     op.create_index(op.f('ix_videos_id'), 'videos', ['id'], unique=False)
     op.create_index(op.f('ix_videos_title'), 'videos', ['title'], unique=False)
     op.create_index(op.f('ix_videos_youtube_url'), 'videos', ['youtube_url'], unique=True)
@@ -40,13 +42,14 @@ def downgrade() -> None:
     op.drop_index(op.f('ix_videos_youtube_url'), table_name='videos')
     op.drop_index(op.f('ix_videos_title'), table_name='videos')
     op.drop_index(op.f('ix_videos_id'), table_name='videos')
-    op.alter_column('videos', 'uploaded_by',
-               existing_type=sa.INTEGER(),
-               nullable=False)
-    op.alter_column('videos', 'youtube_url',
-               existing_type=sa.VARCHAR(),
-               nullable=False)
-    op.alter_column('videos', 'title',
-               existing_type=sa.VARCHAR(),
-               nullable=False)
+    with op.batch_alter_table('videos') as batch_op:
+        batch_op.alter_column('uploaded_by',
+                   existing_type=sa.INTEGER(),
+                   nullable=False)
+        batch_op.alter_column('youtube_url',
+                   existing_type=sa.VARCHAR(),
+                   nullable=False)
+        batch_op.alter_column('title',
+                   existing_type=sa.VARCHAR(),
+                   nullable=False)
     # ### end Alembic commands ###
@@ -0,0 +1,80 @@
+"""Add trigger-maintained video counters
+
+Revision ID: e4a7c2d91f58
+Revises: 9b2f64c1e7d3
+Create Date: 2026-10-18 17:42:08.215093
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'e4a7c2d91f58'
+down_revision: Union[str, None] = '9b2f64c1e7d3'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+COUNT_INSERT = (
+    "INSERT INTO catalog_counters(name, value) SELECT 'uploaders', 1 WHERE NOT EXISTS "
+    "(SELECT 1 FROM uploader_video_counts WHERE user_id = new.uploaded_by) "
+    "ON CONFLICT(name) DO UPDATE SET value = value + 1; "
+    "INSERT INTO uploader_video_counts(user_id, video_count) VALUES (new.uploaded_by, 1) "
+    "ON CONFLICT(user_id) DO UPDATE SET video_count = video_count + 1; "
+)
+COUNT_DELETE = (
+    "UPDATE uploader_video_counts SET video_count = video_count - 1 WHERE user_id = old.uploaded_by; "
+    "UPDATE catalog_counters SET value = value - 1 WHERE name = 'uploaders' AND EXISTS "
+    "(SELECT 1 FROM uploader_video_counts WHERE user_id = old.uploaded_by AND video_count <= 0); "
+    "DELETE FROM uploader_video_counts WHERE user_id = old.uploaded_by AND video_count <= 0; "
+)
+
+COUNT_TRIGGERS = [
+    "CREATE TRIGGER IF NOT EXISTS video_counts_ai AFTER INSERT ON videos BEGIN "
+    f"{COUNT_INSERT}"
+    "INSERT INTO catalog_counters(name, value) VALUES ('videos', 1) "
+    "ON CONFLICT(name) DO UPDATE SET value = value + 1; "
+    "END",
+    "CREATE TRIGGER IF NOT EXISTS video_counts_ad AFTER DELETE ON videos BEGIN "
+    f"{COUNT_DELETE}"
+    "UPDATE catalog_counters SET value = value - 1 WHERE name = 'videos'; "
+    "END",
+    "CREATE TRIGGER IF NOT EXISTS video_counts_au AFTER UPDATE OF uploaded_by ON videos "
+    f"WHEN old.uploaded_by IS NOT new.uploaded_by BEGIN {COUNT_DELETE}{COUNT_INSERT}END",
+]
+
+
+def upgrade() -> None:
+    op.create_table('uploader_video_counts',
+    sa.Column('user_id', sa.Integer(), nullable=False),
+    sa.Column('video_count', sa.Integer(), nullable=False),
+    sa.PrimaryKeyConstraint('user_id')
+    )
+    op.create_index('ix_uploader_video_counts_video_count', 'uploader_video_counts', ['video_count'], unique=False)
+    op.create_table('catalog_counters',
+    sa.Column('name', sa.String(), nullable=False),
+    sa.Column('value', sa.Integer(), nullable=False),
+    sa.PrimaryKeyConstraint('name')
+    )
+    # Backfill once; the triggers keep the counts from here on
+    op.execute(
+        "INSERT INTO uploader_video_counts(user_id, video_count) "
+        "SELECT uploaded_by, count(*) FROM videos GROUP BY uploaded_by"
+    )
+    op.execute(
+        "INSERT INTO catalog_counters(name, value) VALUES "
+        "('videos', (SELECT count(*) FROM videos)), "
+        "('uploaders', (SELECT count(*) FROM uploader_video_counts))"
+    )
+    for statement in COUNT_TRIGGERS:
+        op.execute(statement)
+
+
+def downgrade() -> None:
+    for name in ('video_counts_ai', 'video_counts_ad', 'video_counts_au'):
+        op.execute(f"DROP TRIGGER IF EXISTS {name}")
+    op.drop_table('catalog_counters')
+    op.drop_index('ix_uploader_video_counts_video_count', table_name='uploader_video_counts')
+    op.drop_table('uploader_video_counts')
@@ -0,0 +1,85 @@
+"""Add normalized youtube_id to videos and an idempotency_keys table
+
+Revision ID: f2d8a4c6b913
+Revises: c81f3d6a2e94
+Create Date: 2026-10-18 22:41:09.527316
+
+"""
+import logging
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+from app.youtube import parse_youtube_id
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'f2d8a4c6b913'
+down_revision: Union[str, None] = 'c81f3d6a2e94'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+logger = logging.getLogger("alembic.runtime.migration")
+
+BACKFILL_BATCH_ROWS = 10000
+
+
+def _backfill_youtube_ids() -> None:
+    """Sets youtube_id from each URL, oldest video first.
+
+    Videos already stored under another URL form of the same YouTube video
+    keep a NULL youtube_id rather than being deleted; new writes of that
+    video resolve to the oldest row.
+    """
+    bind = op.get_bind()
+    claimed = set()
+    duplicates = 0
+    after = 0
+    while True:
+        rows = bind.execute(
+            sa.text("SELECT id, youtube_url FROM videos WHERE id > :after ORDER BY id LIMIT :limit"),
+            {"after": after, "limit": BACKFILL_BATCH_ROWS},
+        ).all()
+        if not rows:
+            break
+        updates = []
+        for video_id, url in rows:
+            youtube_id = parse_youtube_id(url)
+            if youtube_id is None:
+                continue
+            if youtube_id in claimed:
+                duplicates += 1
+                continue
+            claimed.add(youtube_id)
+            updates.append({"id": video_id, "youtube_id": youtube_id})
+        if updates:
+            bind.execute(sa.text("UPDATE videos SET youtube_id = :youtube_id WHERE id = :id"), updates)
+        after = rows[-1].id
+    if duplicates:
+        logger.info(f"{duplicates} videos duplicate an older video's YouTube id; left with youtube_id NULL")
+
+
+def upgrade() -> None:
+    # ADD COLUMN rather than a batch rebuild, so the videos triggers stay in place
+    op.add_column('videos', sa.Column('youtube_id', sa.String(), nullable=True))
+    _backfill_youtube_ids()
+    op.create_index('ix_videos_youtube_id', 'videos', ['youtube_id'], unique=True)
+    op.create_table('idempotency_keys',
+    sa.Column('user_id', sa.Integer(), nullable=False),
+    sa.Column('key', sa.String(), nullable=False),
+    sa.Column('request_hash', sa.String(), nullable=False),
+    sa.Column('response', sa.Text(), nullable=False),
+    sa.Column('created_at', sa.Float(), nullable=False),
+    sa.ForeignKeyConstraint(['user_id'], ['users.id'], ondelete='CASCADE'),
+    sa.PrimaryKeyConstraint('user_id', 'key')
+    )
+    op.create_index('ix_idempotency_keys_created_at', 'idempotency_keys', ['created_at'], unique=False)
+
+
+def downgrade() -> None:
+    op.drop_index('ix_idempotency_keys_created_at', table_name='idempotency_keys')
+    op.drop_table('idempotency_keys')
+    op.drop_index('ix_videos_youtube_id', table_name='videos')
+    # SQLite drops the column in place (3.35+), again keeping the triggers
+    op.execute("ALTER TABLE videos DROP COLUMN youtube_id")
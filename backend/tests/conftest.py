@@ -0,0 +1,73 @@
+"""Shared fixtures: a seeded scratch database and an ASGI client for the app.
+
+Settings are read from the environment when the app modules are imported, so
+the environment is set up here, before anything under `app` is imported.
+
+Run from the backend directory:
+
+    python -m pytest -q
+"""
+import os
+import shutil
+import tempfile
+
+import pytest
+
+TMP_DIR = tempfile.mkdtemp(prefix="edu-video-tests-")
+DATABASE_URL = f"sqlite:///{os.path.join(TMP_DIR, 'test.db')}"
+USERS = 5
+VIDEOS = 200
+
+os.environ.update(
+    DATABASE_URL=DATABASE_URL,
+    JOBS_ENABLED="0",
+    SUGGEST_ENABLED="0",
+    WARM_ON_STARTUP="0",
+    METRICS_ENABLED="0",
+    RATE_LIMIT_ENABLED="0",
+    YOUTUBE_ENRICHER="stub",
+    HASH_WORKERS="1",
+)
+
+import httpx  # noqa: E402
+
+from benchmarks.seed import user_email  # noqa: E402
+from benchmarks.suite import seed_database  # noqa: E402
+
+
+@pytest.fixture(scope="session")
+def anyio_backend():
+    # Session-scoped, so every async test and fixture shares one event loop and
+    # the pooled aiosqlite connections never cross loops
+    return "asyncio"
+
+
+@pytest.fixture(scope="session")
+def seeded():
+    """USERS users and VIDEOS videos; video n (0-based) belongs to user 1 + n % USERS."""
+    seed_database(DATABASE_URL, USERS, VIDEOS)
+    yield
+    shutil.rmtree(TMP_DIR, ignore_errors=True)
+
+
+@pytest.fixture(scope="session")
+async def client(seeded):
+    from app.database import dispose_engines
+    from app.hashing import hashing_executor
+    from app.main import app
+
+    async with httpx.AsyncClient(transport=httpx.ASGITransport(app=app), base_url="http://test") as client:
+        yield client
+    hashing_executor.shutdown()
+    await dispose_engines()
+
+
+def auth_headers(user_id: int) -> dict:
+    from app.auth import create_access_token
+
+    return {"Authorization": f"Bearer {create_access_token({'sub': user_email(user_id)})}"}
+
+
+def owned_by(user_id: int, count: int = 1) -> list:
+    """Ids of the first `count` seeded videos of a user."""
+    return [user_id + USERS * n for n in range(count)]
@@ -0,0 +1,38 @@
+"""A local stand-in for redis.asyncio.Redis, for the Redis cache and rate-limit backends."""
+from app.ratelimit import _TOKEN_BUCKET_SCRIPT
+
+
+class FakeRedis:
+    """The commands the app's Redis backends use, in memory. Expiry is recorded, not enforced."""
+
+    def __init__(self):
+        self.values = {}
+        self.expires = {}
+        self.buckets = {}  # key -> (tokens, ts), the hash the token bucket script keeps
+
+    async def get(self, key: str):
+        return self.values.get(key)
+
+    async def set(self, key: str, value, ex: int = None) -> None:
+        self.values[key] = value if isinstance(value, bytes) else str(value).encode()
+        self.expires[key] = ex
+
+    async def incr(self, key: str) -> int:
+        value = int(self.values.get(key, 0)) + 1
+        self.values[key] = str(value).encode()
+        return value
+
+    async def eval(self, script: str, numkeys: int, *keys_and_args):
+        # Mirrors _TOKEN_BUCKET_SCRIPT step by step; the Lua itself needs a real server
+        assert script == _TOKEN_BUCKET_SCRIPT and numkeys == 1
+        key, capacity, rate, cost, now, apply = keys_and_args
+        capacity, rate, cost, now = float(capacity), float(rate), float(cost), float(now)
+        tokens = capacity
+        if key in self.buckets:
+            stored, ts = self.buckets[key]
+            tokens = min(capacity, stored + (now - ts) * rate)
+        if tokens < cost:
+            return str((cost - tokens) / rate).encode()
+        if apply == "1":
+            self.buckets[key] = (tokens - cost, now)
+        return b"0"
@@ -0,0 +1,75 @@
+import pytest
+from starlette.requests import Request
+
+from app.cache import InMemoryCacheBackend, RedisCacheBackend, TTLCache
+from app.response_cache import ResponseCache, response_cache
+from app.routers.videos import ITEM_CACHE_SCOPE, LIST_CACHE_SCOPE
+from tests.conftest import auth_headers, owned_by
+from tests.fakes import FakeRedis
+
+
+def test_ttl_cache_evicts_least_recently_used():
+    cache = TTLCache(maxsize=2, ttl=60)
+    cache.set("a", 1)
+    cache.set("b", 2)
+    cache.get("a")
+    cache.set("c", 3)
+    assert (cache.get("a"), cache.get("b"), cache.get("c")) == (1, None, 3)
+
+
+def test_ttl_cache_expires_entries():
+    cache = TTLCache(ttl=60)
+    cache.set("a", 1, ttl=0)
+    assert cache.get("a", "gone") == "gone" and len(cache) == 0
+
+
+def make_request(path: str = "/videos/", query: bytes = b"limit=10", etag: str = None) -> Request:
+    headers = [(b"if-none-match", etag.encode())] if etag else []
+    return Request({"type": "http", "method": "GET", "path": path, "query_string": query, "headers": headers})
+
+
+@pytest.fixture(params=["memory", "redis"])
+def cache(request):
+    backend = InMemoryCacheBackend() if request.param == "memory" else RedisCacheBackend(FakeRedis())
+    return ResponseCache(backend, ttl=60)
+
+
+@pytest.mark.anyio
+async def test_responses_are_cached_until_their_scope_is_invalidated(cache):
+    builds = []
+
+    async def build():
+        builds.append(1)
+        return b'{"n":%d}' % len(builds)
+
+    first = await cache.respond(make_request(), "scope", build)
+    again = await cache.respond(make_request(), "scope", build)
+    assert first.body == again.body == b'{"n":1}'
+    await cache.invalidate("scope")
+    assert (await cache.respond(make_request(), "scope", build)).body == b'{"n":2}'
+    # Other scopes and other query strings have their own entries
+    await cache.invalidate("other")
+    assert (await cache.respond(make_request(), "scope", build)).body == b'{"n":2}'
+    assert (await cache.respond(make_request(query=b"limit=20"), "scope", build)).body == b'{"n":3}'
+
+
+@pytest.mark.anyio
+async def test_matching_etag_gets_304(cache):
+    async def build():
+        return b"[]"
+
+    etag = (await cache.respond(make_request(), "scope", build)).headers["etag"]
+    response = await cache.respond(make_request(etag=etag), "scope", build)
+    assert response.status_code == 304 and response.body == b""
+
+
+@pytest.mark.anyio
+async def test_video_writes_refresh_cached_items_without_a_counter_per_video(client):
+    video_ids = owned_by(4, 3)
+    for video_id in video_ids:
+        await client.get(f"/videos/{video_id}")
+    for video_id in video_ids:
+        response = await client.put(f"/videos/{video_id}", json={"title": f"Title {video_id}"}, headers=auth_headers(4))
+        assert response.status_code == 200
+        assert (await client.get(f"/videos/{video_id}")).json()["title"] == f"Title {video_id}"
+    assert set(response_cache.backend._counters) <= {f"gen:{LIST_CACHE_SCOPE}", f"gen:{ITEM_CACHE_SCOPE}"}
@@ -0,0 +1,21 @@
+from dataclasses import replace
+
+import pytest
+
+from app.config import Settings, settings
+from app.main import create_app
+
+
+def test_hash_workers_are_split_across_server_workers(monkeypatch):
+    monkeypatch.delenv("HASH_WORKERS", raising=False)
+    monkeypatch.setenv("SERVER_WORKERS", "4")
+    config = Settings.from_env()
+    assert config.server_workers == 4
+    assert config.hash_workers == max(1, Settings().hash_workers // 4)
+    monkeypatch.setenv("HASH_WORKERS", "3")
+    assert Settings.from_env().hash_workers == 3
+
+
+def test_create_app_rejects_settings_it_cannot_apply():
+    with pytest.raises(ValueError, match="server_workers"):
+        create_app(replace(settings, server_workers=settings.server_workers + 1))
@@ -0,0 +1,57 @@
+import asyncio
+
+import pytest
+
+from app.dataloader import DataLoader
+
+pytestmark = pytest.mark.anyio
+
+
+def make_loader(max_batch_size: int = 500, fail: bool = False):
+    calls = []
+
+    async def fetch(keys):
+        calls.append(list(keys))
+        if fail:
+            raise RuntimeError("database is gone")
+        return {key: key * 10 for key in keys if key > 0}
+
+    return DataLoader(fetch, max_batch_size=max_batch_size), calls
+
+
+async def test_concurrent_loads_share_one_batch():
+    loader, calls = make_loader()
+    assert await asyncio.gather(loader.load(1), loader.load(2), loader.load(-3)) == [10, 20, None]
+    assert calls == [[1, 2, -3]]
+
+
+async def test_results_are_memoized():
+    loader, calls = make_loader()
+    assert await loader.load_many([1, 2]) == [10, 20]
+    assert await loader.load_many([2, 1, 3]) == [20, 10, 30]
+    assert calls == [[1, 2], [3]] and loader.batches == 2
+
+
+async def test_large_batches_are_split():
+    loader, calls = make_loader(max_batch_size=2)
+    assert await loader.load_many([1, 2, 3, 4, 5]) == [10, 20, 30, 40, 50]
+    assert calls == [[1, 2], [3, 4], [5]]
+
+
+async def test_failures_propagate_and_are_not_memoized():
+    loader, calls = make_loader(fail=True)
+    with pytest.raises(RuntimeError):
+        await loader.load_many([1, 2])
+    with pytest.raises(RuntimeError):
+        await loader.load(1)
+    assert calls == [[1, 2], [1]]
+
+
+async def test_batch_tasks_are_kept_until_done():
+    loader, _ = make_loader()
+    pending = loader.load(1)
+    await asyncio.sleep(0)
+    assert len(loader._tasks) == 1
+    assert await pending == 10
+    await asyncio.sleep(0)
+    assert not loader._tasks
@@ -0,0 +1,42 @@
+import pytest
+
+from app.idempotency import REPLAYED_HEADER
+from tests.conftest import auth_headers
+
+pytestmark = pytest.mark.anyio
+
+
+def new_video(youtube_id: str, title: str = "Idempotent upload") -> dict:
+    return {"title": title, "description": "d", "youtube_url": f"https://youtu.be/{youtube_id}", "uploaded_by": 2}
+
+
+async def test_retry_with_the_same_key_replays_the_first_response(client):
+    headers = {**auth_headers(2), "Idempotency-Key": "retry-1"}
+    first = await client.post("/videos/", json=new_video("idemp000001"), headers=headers)
+    again = await client.post("/videos/", json=new_video("idemp000001"), headers=headers)
+    assert first.status_code == again.status_code == 200
+    assert again.content == first.content and again.headers[REPLAYED_HEADER] == "true"
+    assert REPLAYED_HEADER not in first.headers
+
+
+async def test_same_key_with_another_body_is_rejected(client):
+    headers = {**auth_headers(2), "Idempotency-Key": "retry-2"}
+    assert (await client.post("/videos/", json=new_video("idemp000002"), headers=headers)).status_code == 200
+    response = await client.post("/videos/", json=new_video("idemp000002", title="Changed"), headers=headers)
+    assert response.status_code == 422
+
+
+async def test_keys_are_per_user(client):
+    await client.post("/videos/", json=new_video("idemp000003"), headers={**auth_headers(2), "Idempotency-Key": "k"})
+    other = {**new_video("idemp000004"), "uploaded_by": 3}
+    response = await client.post("/videos/", json=other, headers={**auth_headers(3), "Idempotency-Key": "k"})
+    assert response.status_code == 200 and REPLAYED_HEADER not in response.headers
+    assert response.json()["youtube_url"] == "https://youtu.be/idemp000004"
+
+
+async def test_other_url_forms_of_one_video_return_the_existing_row(client):
+    created = (await client.post("/videos/", json=new_video("idemp000005"), headers=auth_headers(2))).json()
+    for url in ("https://www.youtube.com/watch?v=idemp000005&t=10", "https://m.youtube.com/watch?v=idemp000005"):
+        duplicate = {**new_video("idemp000005"), "youtube_url": url}
+        response = await client.post("/videos/", json=duplicate, headers=auth_headers(2))
+        assert response.json()["id"] == created["id"]
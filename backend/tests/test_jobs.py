@@ -0,0 +1,83 @@
+import pytest
+from sqlalchemy import delete, select
+
+from app import database
+from app.jobs import JobQueue
+from app.models import Job
+
+pytestmark = pytest.mark.anyio
+
+
+@pytest.fixture(autouse=True)
+async def empty_queue(client):
+    # Uploads in other tests leave video.enrich jobs behind
+    async with database.AsyncSessionLocal() as session:
+        await session.execute(delete(Job))
+        await session.commit()
+
+
+async def enqueue(queue: JobQueue, kind: str, payloads, **options) -> None:
+    async with database.AsyncSessionLocal() as session:
+        await queue.enqueue_many(session, kind, payloads, **options)
+        await session.commit()
+
+
+async def job_rows(kind: str):
+    async with database.AsyncSessionLocal() as session:
+        return (await session.execute(select(Job.status, Job.attempts, Job.last_error).where(Job.kind == kind))).all()
+
+
+async def test_jobs_run_once_per_key():
+    queue = JobQueue()
+    seen = []
+
+    @queue.handler("test.record")
+    async def record(session, payload):
+        seen.append(payload["n"])
+
+    await enqueue(queue, "test.record", [("a", {"n": 1}), ("b", {"n": 2})])
+    # Same key again: left alone, even with a different payload
+    await enqueue(queue, "test.record", [("a", {"n": 3})])
+    assert await queue.run_pending() == 2
+    assert sorted(seen) == [1, 2]
+    assert [row.status for row in await job_rows("test.record")] == ["done", "done"]
+    assert await queue.run_pending() == 0
+
+
+async def test_rearm_reschedules_a_finished_job():
+    queue = JobQueue()
+    seen = []
+
+    @queue.handler("test.rearm")
+    async def record(session, payload):
+        seen.append(payload["n"])
+
+    await enqueue(queue, "test.rearm", [("k", {"n": 1})])
+    await queue.run_pending()
+    await enqueue(queue, "test.rearm", [("k", {"n": 2})], rearm=True)
+    await queue.run_pending()
+    assert seen == [1, 1]
+
+
+async def test_failures_retry_then_fail():
+    queue = JobQueue(max_attempts=3, backoff_base=0)
+    attempts = []
+
+    @queue.handler("test.flaky")
+    async def flaky(session, payload):
+        attempts.append(1)
+        raise ValueError("upstream is down")
+
+    await enqueue(queue, "test.flaky", [(None, {})])
+    await queue.run_pending()
+    assert len(attempts) == 3 and (queue.retried, queue.failed) == (2, 1)
+    [row] = await job_rows("test.flaky")
+    assert (row.status, row.attempts, row.last_error) == ("failed", 3, "ValueError: upstream is down")
+
+
+async def test_unknown_kind_fails_instead_of_looping():
+    queue = JobQueue(max_attempts=1)
+    await enqueue(queue, "test.unhandled", [(None, {})])
+    await queue.run_pending()
+    [row] = await job_rows("test.unhandled")
+    assert row.status == "failed" and "No handler" in row.last_error
@@ -0,0 +1,47 @@
+import pytest
+from fastapi import HTTPException
+
+from app.pagination import MAX_ID, decode_cursor, encode_cursor, split_page
+
+
+def test_cursor_round_trip():
+    assert decode_cursor(encode_cursor(42)) == 42
+    assert decode_cursor(encode_cursor(MAX_ID)) == MAX_ID
+    assert decode_cursor("") is None
+
+
+@pytest.mark.parametrize("cursor", ["!!", "e30", encode_cursor("42"), encode_cursor(MAX_ID + 1)])
+def test_bad_cursor_is_rejected(cursor):
+    with pytest.raises(HTTPException) as error:
+        decode_cursor(cursor)
+    assert error.value.status_code == 400
+
+
+def test_split_page():
+    class Row:
+        def __init__(self, id):
+            self.id = id
+
+    rows = [Row(i) for i in range(1, 5)]
+    assert split_page(rows, 4) == (rows, None)
+    page, next_cursor = split_page(rows, 3)
+    assert page == rows[:3] and decode_cursor(next_cursor) == 3
+
+
+@pytest.mark.anyio
+async def test_keyset_pages_cover_every_video_once(client):
+    ids, cursor = [], ""
+    while cursor is not None:
+        page = (await client.get("/videos/", params={"cursor": cursor, "limit": 30})).json()
+        ids += [video["id"] for video in page["items"]]
+        cursor = page["next_cursor"]
+    total = (await client.get("/videos/", params={"include_total": True, "limit": 1})).json()["total"]
+    assert ids == sorted(set(ids)) and len(ids) == total
+
+
+@pytest.mark.anyio
+@pytest.mark.parametrize("path", ["/videos/", "/users/", "/users/1/videos"])
+@pytest.mark.parametrize("limit", [0, -1, 1001])
+async def test_out_of_range_limit_is_rejected(client, path, limit):
+    response = await client.get(path, params={"cursor": "", "limit": limit})
+    assert response.status_code == 422
@@ -0,0 +1,5 @@
+from benchmarks import check_query_plans
+
+
+def test_hot_queries_use_indexes(capsys):
+    assert check_query_plans.main() == 0, capsys.readouterr().out
@@ -0,0 +1,67 @@
+import pytest
+from fastapi import HTTPException
+
+from app import ratelimit
+from app.ratelimit import (
+    InMemoryRateLimitBackend, LoginRateLimiter, RedisRateLimitBackend, TokenBucketStore,
+)
+from tests.fakes import FakeRedis
+
+
+def test_bucket_refuses_once_empty_and_reports_the_wait():
+    store = TokenBucketStore()
+    assert [store.take("k", 2, 1.0) for _ in range(2)] == [0.0, 0.0]
+    assert store.peek("k", 2, 1.0) > 0
+    assert 0 < store.take("k", 2, 1.0) <= 1.0
+
+
+def test_full_buckets_are_evicted():
+    store = TokenBucketStore()
+    store.take("idle", 1, 1e9)
+    store.take("busy", 10, 1e-6)
+    # "idle" refilled within a nanosecond, so it carries no information
+    assert len(store) == 1
+
+
+def test_store_is_bounded():
+    store = TokenBucketStore(maxsize=3)
+    for i in range(10):
+        store.take(f"k{i}", 10, 1e-6)
+    assert len(store) == 3
+
+
+@pytest.fixture(params=["memory", "redis"])
+def limiter(request, monkeypatch):
+    monkeypatch.setattr(ratelimit, "LOGIN_IP_BURST", 3)
+    monkeypatch.setattr(ratelimit, "LOGIN_EMAIL_FAILURES", 2)
+    backend = InMemoryRateLimitBackend() if request.param == "memory" else RedisRateLimitBackend(FakeRedis())
+    return LoginRateLimiter(backend, enabled=True)
+
+
+@pytest.mark.anyio
+async def test_ip_burst_is_limited(limiter):
+    for _ in range(3):
+        await limiter.check("10.0.0.1", "a@example.com")
+    with pytest.raises(HTTPException) as error:
+        await limiter.check("10.0.0.1", "b@example.com")
+    assert error.value.status_code == 429 and int(error.value.headers["Retry-After"]) >= 1
+    # Other clients keep their own bucket
+    await limiter.check("10.0.0.2", "a@example.com")
+    assert limiter.rejected == 1
+
+
+@pytest.mark.anyio
+async def test_failed_logins_throttle_the_email_from_any_ip(limiter):
+    for _ in range(2):
+        await limiter.record_failure("Victim@example.com")
+    with pytest.raises(HTTPException):
+        await limiter.check("10.0.0.3", "victim@example.com")
+    await limiter.check("10.0.0.3", "other@example.com")
+
+
+@pytest.mark.anyio
+async def test_disabled_limiter_lets_everything_through():
+    limiter = LoginRateLimiter(InMemoryRateLimitBackend(), enabled=False)
+    for _ in range(100):
+        await limiter.record_failure("a@example.com")
+        await limiter.check("10.0.0.1", "a@example.com")
@@ -0,0 +1,43 @@
+import pytest
+from sqlalchemy import select
+
+from app.models import Video
+from app.search import apply_search, build_match_query
+
+pytestmark = pytest.mark.anyio
+
+
+def test_match_query_quotes_every_term():
+    assert build_match_query('Python "OR" tutor*') == '"python"* "or"* "tutor"*'
+    assert build_match_query("!!!") == ""
+
+
+def test_search_orders_by_rank_then_id():
+    query = apply_search(select(Video.id), "python")
+    assert "ORDER BY videos_fts.rank, videos.id" in str(query)
+
+
+async def test_offset_pages_follow_the_full_ranking(client):
+    everything = (await client.get("/videos/", params={"search": "python", "limit": 1000, "include_total": True})).json()
+    ranked = [video["id"] for video in everything["items"]]
+    assert everything["total"] == len(ranked) > 20
+    paged = []
+    for offset in range(0, len(ranked) + 7, 7):
+        paged += [video["id"] for video in (await client.get(
+            "/videos/", params={"search": "python", "limit": 7, "offset": offset},
+        )).json()]
+    assert paged == ranked
+
+
+async def test_keyset_pages_see_every_match(client):
+    total = (await client.get("/videos/", params={"search": "python", "include_total": True})).json()["total"]
+    ids, cursor = [], ""
+    while cursor is not None:
+        page = (await client.get("/videos/", params={"search": "python", "cursor": cursor, "limit": 9})).json()
+        ids += [video["id"] for video in page["items"]]
+        cursor = page["next_cursor"]
+    assert len(ids) == total and ids == sorted(ids)
+
+
+async def test_nothing_searchable_matches_nothing(client):
+    assert (await client.get("/videos/", params={"search": "%%"})).json() == []
@@ -0,0 +1,53 @@
+from app.suggest import SuggestIndex, tokenize, trigrams
+
+
+def build(titles) -> SuggestIndex:
+    index = SuggestIndex()
+    index.index_many(enumerate(titles, start=1))
+    return index
+
+
+def ids(results):
+    return [video_id for video_id, _, _ in results]
+
+
+def test_tokenize_and_trigrams():
+    assert tokenize("Intro to Python, python 3") == ["intro", "to", "python", "3"]
+    assert trigrams("ab") == {"  a", " ab", "ab "}
+    assert trigrams("ab", prefix=True) == {"  a", " ab"}
+
+
+def test_index_many_keeps_terms_sorted():
+    index = build(["Zebra basics", "Algebra intro", "Music theory"])
+    assert index.sorted_terms == sorted(index.terms)
+    index.index(4, "Chemistry lab")
+    assert index.sorted_terms == sorted(index.terms)
+
+
+def test_last_term_matches_as_a_prefix():
+    index = build(["Python for beginners", "Pythagoras explained", "Java basics"])
+    assert set(ids(index.suggest("pyth"))) == {1, 2}
+    assert ids(index.suggest("python beg")) == [1]
+    # A finished word ("pyth ") is no longer a prefix
+    assert ids(index.suggest("java ")) == [3]
+
+
+def test_typos_still_match():
+    index = build(["Photosynthesis explained", "Thermodynamics lecture"])
+    assert ids(index.suggest("photosinthesis")) == [1]
+    assert ids(index.suggest("thermodynamcs lec")) == [2]
+
+
+def test_retitle_and_remove():
+    index = build(["Guitar lessons", "Piano lessons"])
+    index.index(1, "Violin lessons")
+    assert ids(index.suggest("guitar")) == []
+    assert ids(index.suggest("violin")) == [1]
+    index.remove(2)
+    assert ids(index.suggest("lessons")) == [1]
+    assert index.stats()["videos"] == 1
+
+
+def test_ties_go_to_the_newest_video():
+    index = build(["Cooking basics", "Cooking basics"])
+    assert ids(index.suggest("cooking", limit=1)) == [2]
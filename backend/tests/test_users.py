@@ -0,0 +1,46 @@
+import pytest
+
+from benchmarks.seed import user_email
+from benchmarks.suite import PASSWORD
+from tests.conftest import auth_headers, owned_by
+
+pytestmark = pytest.mark.anyio
+
+
+async def test_accounts_are_only_created_through_register(client):
+    assert (await client.post("/users/", json={"name": "x", "email": "x@example.com", "password": "secret1"})).status_code == 405
+
+
+@pytest.mark.parametrize("method", ["PATCH", "DELETE"])
+async def test_changing_an_account_needs_its_owner(client, method):
+    body = {"json": {"name": "Someone else"}} if method == "PATCH" else {}
+    assert (await client.request(method, "/users/2", **body)).status_code == 401
+    assert (await client.request(method, "/users/2", headers=auth_headers(1), **body)).status_code == 403
+
+
+@pytest.mark.parametrize("password", ["", "12345"])
+async def test_short_passwords_are_rejected_not_stored(client, password):
+    response = await client.patch("/users/1", json={"password": password}, headers=auth_headers(1))
+    assert response.status_code == 422
+    login = await client.post("/api/login", json={"email": user_email(1), "password": PASSWORD})
+    assert login.status_code == 200
+
+
+async def test_new_password_is_hashed_and_usable(client):
+    response = await client.patch("/users/3", json={"password": "a-new-secret"}, headers=auth_headers(3))
+    assert response.status_code == 200 and "password" not in response.json()
+    login = await client.post("/api/login", json={"email": user_email(3), "password": "a-new-secret"})
+    assert login.status_code == 200
+    old = await client.post("/api/login", json={"email": user_email(3), "password": PASSWORD})
+    assert old.status_code == 401
+
+
+async def test_deleting_an_account_removes_its_videos(client):
+    [video_id] = owned_by(5)
+    assert (await client.get(f"/videos/{video_id}")).status_code == 200
+    assert (await client.delete("/users/5", headers=auth_headers(5))).status_code == 200
+    assert (await client.get("/users/5/videos")).status_code == 404
+    # The cached copy of the video must not outlive it
+    assert (await client.get(f"/videos/{video_id}")).status_code == 404
+    listed = (await client.get("/videos/", params={"limit": 1000})).json()
+    assert all(video["uploaded_by"] != 5 for video in listed)
@@ -0,0 +1,35 @@
+import pytest
+
+from tests.conftest import auth_headers, owned_by
+
+pytestmark = pytest.mark.anyio
+
+
+@pytest.mark.parametrize("ids", ["99999999999999999999", "1,-9223372036854775809", "1,two"])
+async def test_ids_outside_sqlite_integers_are_a_400(client, ids):
+    assert (await client.get("/videos/", params={"ids": ids})).status_code == 400
+
+
+async def test_batch_get_rejects_huge_ids(client):
+    assert (await client.post("/videos/batch-get", json={"ids": [1, 2**63]})).status_code == 400
+
+
+async def test_batch_get_keeps_order_and_reports_missing_ids(client):
+    response = await client.get("/videos/", params={"ids": "3,1,999999,3"})
+    assert response.status_code == 200
+    body = response.json()
+    assert [video["id"] for video in body["items"]] == [3, 1] and body["missing"] == [999999]
+
+
+async def test_only_the_uploader_changes_a_video(client):
+    [video_id] = owned_by(2)
+    assert (await client.put(f"/videos/{video_id}", json={"title": "t"})).status_code == 401
+    assert (await client.put(f"/videos/{video_id}", json={"title": "t"}, headers=auth_headers(1))).status_code == 403
+    assert (await client.delete(f"/videos/{video_id}", headers=auth_headers(1))).status_code == 403
+    assert (await client.put("/videos/999999", json={"title": "t"}, headers=auth_headers(1))).status_code == 404
+
+
+async def test_title_cannot_be_cleared(client):
+    [video_id] = owned_by(2)
+    response = await client.put(f"/videos/{video_id}", json={"title": None}, headers=auth_headers(2))
+    assert response.status_code == 422